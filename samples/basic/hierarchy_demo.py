@@ -497,9 +497,9 @@ def main():
             print(f"✓ Captured {width}x{height} frame ({len(data)} bytes)")
             print(f"  Format: BGRA (4 bytes per pixel)")
             
-            # Analyze some pixels
-            import struct
-            pixels = struct.unpack(f'{len(data)}B', data)
+            # Analyze some pixels; data is a uint8 memoryview over the
+            # capture, so index and slice it directly instead of unpacking
+            pixels = data
             
             # Sample center pixel
             center_x = width // 2
@@ -514,9 +514,9 @@ def main():
             print(f"  Center pixel (BGRA): ({b}, {g}, {r}, {a})")
             
             # Calculate average color
-            total_r = sum(pixels[i+2] for i in range(0, len(pixels), 4))
-            total_g = sum(pixels[i+1] for i in range(0, len(pixels), 4))
-            total_b = sum(pixels[i] for i in range(0, len(pixels), 4))
+            total_r = sum(pixels[2::4])
+            total_g = sum(pixels[1::4])
+            total_b = sum(pixels[0::4])
             
             num_pixels = width * height
             avg_r = total_r / num_pixels
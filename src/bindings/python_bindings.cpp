@@ -11,13 +11,32 @@
 #include "../rendering/Image.h"
 #include "../rendering/Font.h"
 #include "../rendering/Text.h"
+#include <chrono>
 
 namespace py = pybind11;
 using namespace CyberUI;
 
+// Capture a frame into a flat uint8 array that owns the pixel buffer, so Python
+// gets the pixels without an extra copy. Returns None on failure.
+static py::object captureToArray(Renderer& renderer, int& width, int& height) {
+    auto* pixelData = new std::vector<uint8_t>();
+    if (!renderer.captureFrame(*pixelData, width, height)) {
+        delete pixelData;
+        return py::none();
+    }
+    py::capsule owner(pixelData, [](void* p) {
+        delete static_cast<std::vector<uint8_t>*>(p);
+    });
+    return py::array_t<uint8_t>(static_cast<py::ssize_t>(pixelData->size()), pixelData->data(), owner);
+}
+
 PYBIND11_MODULE(cyber_ui_core, m) {
     m.doc() = "Cyber UI Toolkit - Graphics Primitive Rendering Layer";
 
+    // Recorded scene draw list (Renderer.compile_scene)
+    py::class_<CompiledScene, std::shared_ptr<CompiledScene>>(m, "CompiledScene")
+        .def("get_rectangle_draw_count", &CompiledScene::getRectangleDrawCount);
+
     // Renderer class
     py::class_<Renderer>(m, "Renderer")
         .def("initialize", &Renderer::initialize)
@@ -25,23 +44,76 @@ PYBIND11_MODULE(cyber_ui_core, m) {
         .def("begin_frame", &Renderer::beginFrame)
         .def("end_frame", &Renderer::endFrame)
         .def("render_object", &Renderer::renderObject)
+        .def("render_object_batch", [](Renderer& renderer, const std::vector<std::shared_ptr<Object2D>>& objects) {
+            // One call into C++ per frame instead of one per object
+            py::gil_scoped_release release;
+            for (const auto& object : objects) {
+                renderer.renderObject(object.get());
+            }
+        }, py::arg("objects"))
         .def("render_scene", &Renderer::renderScene)
+        .def("compile_scene", &Renderer::compileScene)
+        .def("render_compiled", &Renderer::renderCompiled)
+        .def("run_static", [](Renderer& renderer, std::shared_ptr<SceneRoot> scene, int maxFrames,
+                              int reportEvery, py::object progress) {
+            // Whole render loop for a scene that does not change between frames;
+            // progress(frame_count, last_frame_ms) is called every report_every frames
+            bool report = reportEvery > 0 && !progress.is_none();
+            py::gil_scoped_release release;
+            std::shared_ptr<CompiledScene> compiled = renderer.compileScene(scene);
+            int frameCount = 0;
+            while (!renderer.shouldClose() && frameCount < maxFrames) {
+                auto frameStart = std::chrono::steady_clock::now();
+                if (renderer.beginFrame()) {
+                    renderer.renderCompiled(compiled.get());
+                    renderer.endFrame();
+                }
+                renderer.pollEvents();
+                frameCount++;
+                
+                if (report && frameCount % reportEvery == 0) {
+                    double frameMs = std::chrono::duration<double, std::milli>(
+                        std::chrono::steady_clock::now() - frameStart).count();
+                    py::gil_scoped_acquire acquire;
+                    progress(frameCount, frameMs);
+                }
+            }
+            return frameCount;
+        }, py::arg("scene"), py::arg("max_frames"),
+           py::arg("report_every") = 0, py::arg("progress") = py::none())
         .def("should_close", &Renderer::shouldClose)
         .def("poll_events", &Renderer::pollEvents)
-        .def("capture_frame", [](Renderer& renderer) {
-            std::vector<uint8_t> pixelData;
+        .def("wait_events", &Renderer::waitEvents, py::arg("timeout") = 0.1)
+        .def("capture_frame", [](Renderer& renderer) -> py::tuple {
             int width, height;
-            bool success = renderer.captureFrame(pixelData, width, height);
-            if (!success) {
+            py::object pixels = captureToArray(renderer, width, height);
+            if (pixels.is_none()) {
                 return py::make_tuple(py::none(), 0, 0);
             }
-            // Return as numpy-compatible bytes
-            py::bytes data(reinterpret_cast<const char*>(pixelData.data()), pixelData.size());
-            return py::make_tuple(data, width, height);
+            // Flat uint8 memoryview over the captured buffer (no copy); works with
+            // np.frombuffer, struct.unpack and len() like the old bytes result
+            return py::make_tuple(py::memoryview(pixels), width, height);
+        })
+        .def("capture_to_numpy", [](Renderer& renderer) -> py::object {
+            // Capture straight into a (height, width, 4) uint8 array, so analysis
+            // code can skip the PNG encode/decode round trip
+            int width, height;
+            py::object pixels = captureToArray(renderer, width, height);
+            if (pixels.is_none()) {
+                return py::none();
+            }
+            return pixels.attr("reshape")(height, width, 4);
         })
         .def("save_capture", &Renderer::saveCapture)
+        .def("set_async_capture_enabled", &Renderer::setAsyncCaptureEnabled)
+        .def("is_async_capture_enabled", &Renderer::isAsyncCaptureEnabled)
+        .def("set_content_scale", &Renderer::setContentScale)
+        .def("get_content_scale", &Renderer::getContentScale)
+        .def("set_vsync_enabled", &Renderer::setVSyncEnabled)
+        .def("is_vsync_enabled", &Renderer::isVSyncEnabled)
         .def("get_fps", &Renderer::getFPS)
-        .def("get_frame_count", &Renderer::getFrameCount);
+        .def("get_frame_count", &Renderer::getFrameCount)
+        .def("reset_fps_counters", &Renderer::resetFPSCounters);
 
     // Factory functions
 #ifdef USE_METAL_BACKEND
@@ -53,6 +125,9 @@ PYBIND11_MODULE(cyber_ui_core, m) {
     m.def("create_opengl_renderer", &createOpenGLRenderer,
           "Create an OpenGL-based renderer (cross-platform)");
 #endif
+    
+    m.def("available_backends", &availableBackends,
+          "List the usable rendering backends (\"metal\", \"opengl\") without creating a renderer");
 
     // Camera class
     py::class_<Camera, std::shared_ptr<Camera>>(m, "Camera")
@@ -93,7 +168,8 @@ PYBIND11_MODULE(cyber_ui_core, m) {
         .def("remove_frame3d", &SceneRoot::removeFrame3D)
         .def("set_camera", &SceneRoot::setCamera)
         .def("get_camera", &SceneRoot::getCamera)
-        .def("clear", &SceneRoot::clear);
+        .def("clear", &SceneRoot::clear)
+        .def("mark_dirty", &SceneRoot::markDirty);
 
     // Frame3D - top-level 3D container
     py::class_<Frame3D, std::shared_ptr<Frame3D>>(m, "Frame3D")
@@ -139,6 +215,25 @@ PYBIND11_MODULE(cyber_ui_core, m) {
     // Object2D base class for all 2D objects
     py::class_<Object2D, std::shared_ptr<Object2D>>(m, "Object2D")
         .def("add_child", &Object2D::addChild)
+        .def("add_rectangles", [](Object2D& parent, py::array_t<float, py::array::c_style | py::array::forcecast> specs,
+                                  std::shared_ptr<Image> image) {
+            // Build many Rectangle children in one call; each row of the (N, 8)
+            // array is x, y, width, height, r, g, b, a. An image, if given, is
+            // shared by every rectangle
+            if (specs.ndim() != 2 || specs.shape(1) != 8) {
+                throw py::value_error("specs must have shape (N, 8): x, y, width, height, r, g, b, a");
+            }
+            auto rows = specs.unchecked<2>();
+            for (py::ssize_t i = 0; i < rows.shape(0); ++i) {
+                auto rect = std::make_shared<Rectangle>(rows(i, 2), rows(i, 3));
+                rect->setPosition(rows(i, 0), rows(i, 1));
+                rect->setColor(rows(i, 4), rows(i, 5), rows(i, 6), rows(i, 7));
+                if (image) {
+                    rect->setImage(image);
+                }
+                parent.addChild(rect);
+            }
+        }, py::arg("specs"), py::arg("image") = py::none())
         .def("remove_child", &Object2D::removeChild)
         .def("get_parent", &Object2D::getParent, py::return_value_policy::reference)
         .def("set_position", &Object2D::setPosition)
@@ -155,7 +250,19 @@ PYBIND11_MODULE(cyber_ui_core, m) {
 
     // Frame2D - 2D container with clipping
     py::class_<Frame2D, Object2D, std::shared_ptr<Frame2D>>(m, "Frame2D")
-        .def(py::init<float, float>())
+        .def(py::init([](float width, float height, std::array<float, 2> position,
+                         const std::string& name, bool clippingEnabled) {
+                 // Configure in one call instead of a set_* call per property
+                 auto frame = std::make_shared<Frame2D>(width, height);
+                 frame->setPosition(position[0], position[1]);
+                 frame->setName(name);
+                 frame->setClippingEnabled(clippingEnabled);
+                 return frame;
+             }),
+             py::arg("width"), py::arg("height"), py::kw_only(),
+             py::arg("position") = std::array<float, 2>{0.0f, 0.0f},
+             py::arg("name") = "",
+             py::arg("clipping_enabled") = true)
         .def("set_size", &Frame2D::setSize)
         .def("get_size", [](const Frame2D& frame) {
             float w, h;
@@ -202,6 +309,42 @@ PYBIND11_MODULE(cyber_ui_core, m) {
             float w, h;
             rect.getSize(w, h);
             return py::make_tuple(w, h);
+        })
+        .def("snapshot", [](const Rectangle& rect) {
+            // All properties in one call instead of one getter round trip each
+            float x, y, w, h, r, g, b, a;
+            rect.getPosition(x, y);
+            rect.getSize(w, h);
+            rect.getColor(r, g, b, a);
+            py::dict state;
+            state["name"] = rect.getName();
+            state["position"] = py::make_tuple(x, y);
+            state["size"] = py::make_tuple(w, h);
+            state["color"] = py::make_tuple(r, g, b, a);
+            state["visible"] = rect.isVisible();
+            return state;
+        });
+
+    // BorderedRectangle class
+    py::class_<BorderedRectangle, Rectangle, std::shared_ptr<BorderedRectangle>>(m, "BorderedRectangle")
+        .def(py::init([](float width, float height, float borderWidth,
+                         std::array<float, 4> fillColor, std::array<float, 4> borderColor) {
+                 auto rect = std::make_shared<BorderedRectangle>(width, height, borderWidth);
+                 rect->setColor(fillColor[0], fillColor[1], fillColor[2], fillColor[3]);
+                 rect->setBorderColor(borderColor[0], borderColor[1], borderColor[2], borderColor[3]);
+                 return rect;
+             }),
+             py::arg("width"), py::arg("height"), py::arg("border_width"),
+             py::arg("fill_color") = std::array<float, 4>{1.0f, 1.0f, 1.0f, 1.0f},
+             py::arg("border_color") = std::array<float, 4>{1.0f, 1.0f, 1.0f, 1.0f})
+        .def("set_border_width", &BorderedRectangle::setBorderWidth)
+        .def("get_border_width", &BorderedRectangle::getBorderWidth)
+        .def("set_border_color", &BorderedRectangle::setBorderColor,
+             py::arg("r"), py::arg("g"), py::arg("b"), py::arg("a") = 1.0f)
+        .def("get_border_color", [](const BorderedRectangle& rect) {
+            float r, g, b, a;
+            rect.getBorderColor(r, g, b, a);
+            return py::make_tuple(r, g, b, a);
         });
 
     // Font class
@@ -10,6 +10,7 @@ SceneRoot::SceneRoot()
 void SceneRoot::addFrame3D(std::shared_ptr<Frame3D> frame) {
     if (frame) {
         frames_.push_back(frame);
+        markDirty();
     }
 }
 
@@ -17,6 +18,7 @@ void SceneRoot::removeFrame3D(std::shared_ptr<Frame3D> frame) {
     auto it = std::find(frames_.begin(), frames_.end(), frame);
     if (it != frames_.end()) {
         frames_.erase(it);
+        markDirty();
     }
 }
 
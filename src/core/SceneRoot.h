@@ -4,6 +4,7 @@
 #include "Camera.h"
 #include <vector>
 #include <memory>
+#include <cstdint>
 
 namespace CyberUI {
 
@@ -19,15 +20,21 @@ public:
     const std::vector<std::shared_ptr<Frame3D>>& getFrames() const { return frames_; }
 
     // Camera management
-    void setCamera(std::shared_ptr<Camera> camera) { camera_ = camera; }
+    void setCamera(std::shared_ptr<Camera> camera) { camera_ = camera; markDirty(); }
     std::shared_ptr<Camera> getCamera() const { return camera_; }
 
     // Clear all frames
-    void clear() { frames_.clear(); }
+    void clear() { frames_.clear(); markDirty(); }
+
+    // Version for compiled scenes (Renderer::compileScene). Adding/removing frames
+    // bumps it; call markDirty() after changing objects or the camera in place.
+    void markDirty() { ++version_; }
+    uint64_t getVersion() const { return version_; }
 
 private:
     std::vector<std::shared_ptr<Frame3D>> frames_;
     std::shared_ptr<Camera> camera_;
+    uint64_t version_ = 0;
 };
 
 } // namespace CyberUI
@@ -9,28 +9,42 @@ namespace CyberUI {
 
 class Frame3D;
 class Image;
+class MetalCompiledScene;
 
 class MetalRenderer : public Renderer {
 public:
     MetalRenderer();
     ~MetalRenderer() override;
     
+    // True if a Metal device is present (no window or command queue is created)
+    static bool isSupported();
+    
     bool initialize(int width, int height, const char* title) override;
     void shutdown() override;
     bool beginFrame() override;
     void endFrame() override;
     void renderObject(Object2D* object) override;
     void renderScene(SceneRoot* scene) override;
+    std::shared_ptr<CompiledScene> compileScene(std::shared_ptr<SceneRoot> scene) override;
+    void renderCompiled(CompiledScene* compiled) override;
     bool shouldClose() override;
     void pollEvents() override;
+    void waitEvents(double timeoutSeconds) override;
     
     // Capture functionality
     bool captureFrame(std::vector<uint8_t>& pixelData, int& width, int& height) override;
     bool saveCapture(const char* filename) override;
+    void setAsyncCaptureEnabled(bool enabled) override;
+    bool isAsyncCaptureEnabled() const override;
+    void setContentScale(float scale) override;
+    float getContentScale() const override;
+    void setVSyncEnabled(bool enabled) override;
+    bool isVSyncEnabled() const override;
     
     // FPS measurement
     double getFPS() const override;
     int getFrameCount() const override;
+    void resetFPSCounters() override;
 
 private:
     void setupShaders();
@@ -38,22 +52,32 @@ private:
     void renderText(class Text* text, const float* mvpMatrix);
     void renderFrame3D(Frame3D* frame, const float* viewProjMatrix);
     void renderObject2D(Object2D* object, const float* mvpMatrix);
+    void renderFrame2DChildren(class Frame2D* frame2d, const float* frame2dMVP);
+    void drawRectangleVertices(const struct Vertex* vertices, int vertexCount, Image* image,
+                               const float* mvpMatrix);
+    
+    // Compiled scenes: record the draw list and upload its vertices
+    void recordScene(MetalCompiledScene& compiled);
     
     void* getOrCreateTexture(Image* image);
     void* getOrCreateRenderTarget(Frame3D* frame);
     void renderFrame3DToTexture(Frame3D* frame);
+    // Off-screen pass of renderFrame3DToTexture(), also used by renderCompiled():
+    // begin redirects encoding into the frame's render target (false on failure)
+    bool beginFrame3DPass(Frame3D* frame);
+    void endFrame3DPass();
     void renderTexturedQuad(void* texture, float width, float height, const float* mvpMatrix);
     
     // Scissor rect management for clipping
     void pushScissorRect(float x, float y, float width, float height, const float* mvpMatrix);
     void popScissorRect();
     void transformPointToScreen(float x, float y, const float* mvpMatrix, float& screenX, float& screenY);
+    // True if the (0, 0, width, height) rect under mvpMatrix misses the active scissor rect
+    bool isOutsideScissor(float width, float height, const float* mvpMatrix);
     
-    void multiplyMatrices(const float* a, const float* b, float* result);
-    void createTransformMatrix(float x, float y, float z, 
-                              float pitch, float yaw, float roll,
-                              float sx, float sy, float sz,
-                              float* matrix);
+    // Async capture staging ring
+    void encodeCaptureStagingCopy(void* commandBuffer, void* texture);
+    void releaseCaptureStaging();
     
     void* device_;
     void* commandQueue_;
@@ -85,10 +109,34 @@ private:
     };
     std::vector<ScissorRect> scissorStack_;
     
+    // Staging ring for async capture (drawable copied at the end of each frame)
+    static const int kCaptureStagingCount = 3;
+    struct CaptureStagingSlot {
+        void* buffer;         // id<MTLBuffer> (shared storage) holding BGRA pixels
+        void* commandBuffer;  // id<MTLCommandBuffer> that writes this slot
+        int width, height;
+    };
+    CaptureStagingSlot captureStaging_[kCaptureStagingCount];
+    int captureStagingNext_;    // Slot written by the next endFrame()
+    int captureStagingLatest_;  // Slot holding the most recent frame (-1 if none)
+    bool asyncCaptureEnabled_;
+    
+    // Requested drawable scale (0 = native, see Renderer::setContentScale)
+    float contentScale_;
+    
+    // Display sync and the beginFrame() 60 FPS limiter (see Renderer::setVSyncEnabled)
+    bool vsyncEnabled_;
+    
     // Current render target dimensions (for scissor rect calculation)
     int currentRenderTargetWidth_;
     int currentRenderTargetHeight_;
     
+    // Main pass state saved while an off-screen Frame3D pass is encoding
+    void* savedEncoder_;
+    void* savedCommandBuffer_;
+    int savedRenderTargetWidth_;
+    int savedRenderTargetHeight_;
+    
     // FPS tracking
     int frameCount_;           // Frames since last FPS update (for FPS calculation)
     int totalFrameCount_;      // Total frames rendered (never reset)
@@ -1,4 +1,5 @@
 #import "MetalRenderer.h"
+#import "RecordedScene.h"
 #import "Shape2D.h"
 #import "Image.h"
 #import "Text.h"
@@ -10,16 +11,45 @@
 #import <MetalKit/MetalKit.h>
 #import <Cocoa/Cocoa.h>
 #import <cmath>
+#import <algorithm>
 #import <iostream>
 
 namespace CyberUI {
 
-// Vertex structure for rectangles
-struct Vertex {
-    float position[2];
-    float color[4];
-    float texCoord[2];
-};
+// Shared white 1x1 texture for non-textured rectangles
+static id<MTLTexture> getWhiteTexture(id<MTLDevice> device) {
+    static void* whiteTexture = nullptr;
+    if (!whiteTexture) {
+        MTLTextureDescriptor* texDesc = [MTLTextureDescriptor 
+            texture2DDescriptorWithPixelFormat:MTLPixelFormatRGBA8Unorm
+            width:1
+            height:1
+            mipmapped:NO];
+        texDesc.usage = MTLTextureUsageShaderRead;
+        texDesc.storageMode = MTLStorageModeShared;
+        
+        id<MTLTexture> tex = [device newTextureWithDescriptor:texDesc];
+        uint8_t whitePixel[4] = {255, 255, 255, 255};
+        MTLRegion region = MTLRegionMake2D(0, 0, 1, 1);
+        [tex replaceRegion:region mipmapLevel:0 withBytes:whitePixel bytesPerRow:4];
+        whiteTexture = (__bridge_retained void*)tex;
+    }
+    return (__bridge id<MTLTexture>)whiteTexture;
+}
+
+// Shared linear/clamp sampler for replaying compiled scenes
+static id<MTLSamplerState> getLinearClampSampler(id<MTLDevice> device) {
+    static void* sampler = nullptr;
+    if (!sampler) {
+        MTLSamplerDescriptor* samplerDesc = [[MTLSamplerDescriptor alloc] init];
+        samplerDesc.minFilter = MTLSamplerMinMagFilterLinear;
+        samplerDesc.magFilter = MTLSamplerMinMagFilterLinear;
+        samplerDesc.sAddressMode = MTLSamplerAddressModeClampToEdge;
+        samplerDesc.tAddressMode = MTLSamplerAddressModeClampToEdge;
+        sampler = (__bridge_retained void*)[device newSamplerStateWithDescriptor:samplerDesc];
+    }
+    return (__bridge id<MTLSamplerState>)sampler;
+}
 
 MetalRenderer::MetalRenderer() 
     : device_(nullptr), commandQueue_(nullptr), pipelineState_(nullptr),
@@ -28,7 +58,9 @@ MetalRenderer::MetalRenderer()
       framePacingSemaphore_(nullptr),
       initialized_(false), shouldClose_(false), windowWidth_(800), windowHeight_(600),
       newTexturesCreatedThisFrame_(false),
+      captureStaging_(), captureStagingNext_(0), captureStagingLatest_(-1), asyncCaptureEnabled_(false), contentScale_(0.0f), vsyncEnabled_(true),
       currentRenderTargetWidth_(0), currentRenderTargetHeight_(0),
+      savedEncoder_(nullptr), savedCommandBuffer_(nullptr), savedRenderTargetWidth_(0), savedRenderTargetHeight_(0),
       frameCount_(0), totalFrameCount_(0), startTime_(0.0), lastFPSUpdateTime_(0.0), currentFPS_(0.0), lastFrameTime_(0.0) {
 }
 
@@ -36,6 +68,12 @@ MetalRenderer::~MetalRenderer() {
     shutdown();
 }
 
+bool MetalRenderer::isSupported() {
+    @autoreleasepool {
+        return MTLCreateSystemDefaultDevice() != nil;
+    }
+}
+
 bool MetalRenderer::initialize(int width, int height, const char* title) {
     windowWidth_ = width;
     windowHeight_ = height;
@@ -79,19 +117,35 @@ bool MetalRenderer::initialize(int width, int height, const char* title) {
         [metalView setClearColor:MTLClearColorMake(0.1, 0.1, 0.1, 1.0)];
         [metalView setClearDepth:1.0];
         
+        // Depth is cleared every frame and never read back, so on Apple GPUs it
+        // can live in tile memory only (no backing texture, no load/store traffic)
+        if (@available(macOS 13.0, *)) {
+            if ([device supportsFamily:MTLGPUFamilyApple1]) {
+                [metalView setDepthStencilStorageMode:MTLStorageModeMemoryless];
+            }
+        }
+        
+        // Async capture blits from the drawable, which requires a non-framebuffer-only layer
+        [metalView setFramebufferOnly:!asyncCaptureEnabled_];
+        
         // Enable V-Sync to limit FPS to display refresh rate (typically 60 FPS)
         [metalView setPreferredFramesPerSecond:60];
         
         // Enable display sync on the underlying CAMetalLayer
         // This is critical for V-Sync to work properly
         CAMetalLayer* metalLayer = (CAMetalLayer*)metalView.layer;
-        metalLayer.displaySyncEnabled = YES;
+        metalLayer.displaySyncEnabled = vsyncEnabled_;
         
         metalView_ = (__bridge_retained void*)metalView;
         
         [window setContentView:metalView];
         [window makeKeyAndOrderFront:nil];
         
+        // Apply a content scale requested before initialize()
+        if (contentScale_ > 0.0f) {
+            setContentScale(contentScale_);
+        }
+        
         // Setup shaders
         setupShaders();
         
@@ -255,6 +309,8 @@ void MetalRenderer::shutdown() {
             }
             textTextureCache_.clear();
             
+            releaseCaptureStaging();
+            
             if (depthStencilStateEnabled_) {
                 (void)(__bridge_transfer id<MTLDepthStencilState>)depthStencilStateEnabled_;
                 depthStencilStateEnabled_ = nullptr;
@@ -296,12 +352,12 @@ void MetalRenderer::shutdown() {
 bool MetalRenderer::beginFrame() {
     if (!initialized_) return false;
     
-    // Frame rate limiting: wait to maintain 60 FPS
+    // Frame rate limiting: wait to maintain 60 FPS (skipped with V-Sync off)
     const double targetFrameTime = 1.0 / 60.0;  // 16.67ms for 60 FPS
     double currentTime = CACurrentMediaTime();
     double elapsed = currentTime - lastFrameTime_;
     
-    if (elapsed < targetFrameTime) {
+    if (vsyncEnabled_ && elapsed < targetFrameTime) {
         // Sleep for the remaining time to hit 60 FPS
         double sleepTime = targetFrameTime - elapsed;
         usleep((useconds_t)(sleepTime * 1000000.0));  // usleep takes microseconds
@@ -330,7 +386,11 @@ bool MetalRenderer::beginFrame() {
         
         if (!passDesc) return false;
         
-        id<MTLRenderCommandEncoder> renderEncoder = [commandBuffer 
+        // Depth only matters within the pass: clear on load, discard on store
+        passDesc.depthAttachment.loadAction = MTLLoadActionClear;
+        passDesc.depthAttachment.storeAction = MTLStoreActionDontCare;
+        
+        id<MTLRenderCommandEncoder> renderEncoder = [commandBuffer
             renderCommandEncoderWithDescriptor:passDesc];
         renderEncoder_ = (__bridge_retained void*)renderEncoder;
         
@@ -380,6 +440,11 @@ void MetalRenderer::endFrame() {
         id<MTLCommandBuffer> commandBuffer = (__bridge_transfer id<MTLCommandBuffer>)commandBuffer_;
         id<CAMetalDrawable> drawable = [view currentDrawable];
         
+        // Queue the readback for async capture in this frame's command buffer
+        if (asyncCaptureEnabled_ && drawable) {
+            encodeCaptureStagingCopy((__bridge void*)commandBuffer, (__bridge void*)drawable.texture);
+        }
+        
         // Add completion handler to signal semaphore
         dispatch_semaphore_t semaphore = (__bridge dispatch_semaphore_t)framePacingSemaphore_;
         [commandBuffer addCompletedHandler:^(id<MTLCommandBuffer> buffer) {
@@ -457,21 +522,27 @@ void MetalRenderer::pollEvents() {
     }
 }
 
+void MetalRenderer::waitEvents(double timeoutSeconds) {
+    @autoreleasepool {
+        // Sleep in the run loop until the first event (or the timeout); leave it queued
+        [NSApp nextEventMatchingMask:NSEventMaskAny
+                           untilDate:[NSDate dateWithTimeIntervalSinceNow:timeoutSeconds]
+                              inMode:NSDefaultRunLoopMode
+                             dequeue:NO];
+    }
+    
+    // Handle everything that is now pending
+    pollEvents();
+}
+
 void MetalRenderer::renderScene(SceneRoot* scene) {
     if (!scene) return;
     
     auto camera = scene->getCamera();
     if (!camera) return;
     
-    // Get view and projection matrices
-    float viewMatrix[16];
-    float projMatrix[16];
-    camera->getViewMatrix(viewMatrix);
-    camera->getProjectionMatrix(projMatrix);
-    
-    // Combine view and projection
     float viewProjMatrix[16];
-    multiplyMatrices(projMatrix, viewMatrix, viewProjMatrix);
+    viewProjectionMatrix(*camera, viewProjMatrix);
     
     // Render all Frame3D objects
     for (const auto& frame : scene->getFrames()) {
@@ -490,22 +561,9 @@ void MetalRenderer::renderFrame3D(Frame3D* frame, const float* viewProjMatrix) {
         // Then render the texture as a quad with 3D transforms
         void* texture = frame->getRenderTargetTexture();
         if (texture) {
-            // Get Frame3D transform
-            float pos[3], rot[3], scale[3];
-            frame->getPosition(pos[0], pos[1], pos[2]);
-            frame->getRotation(rot[0], rot[1], rot[2]);
-            frame->getScale(scale[0], scale[1], scale[2]);
-            
-            // Create model matrix for this Frame3D
-            float modelMatrix[16];
-            createTransformMatrix(pos[0], pos[1], pos[2], 
-                                 rot[0], rot[1], rot[2],
-                                 scale[0], scale[1], scale[2],
-                                 modelMatrix);
-            
-            // Combine with view-projection
+            // Frame3D transform combined with view-projection
             float mvpMatrix[16];
-            multiplyMatrices(viewProjMatrix, modelMatrix, mvpMatrix);
+            frame3DMatrix(*frame, viewProjMatrix, mvpMatrix);
             
             // Get render target size
             int rtWidth, rtHeight;
@@ -516,22 +574,9 @@ void MetalRenderer::renderFrame3D(Frame3D* frame, const float* viewProjMatrix) {
         }
     } else {
         // Direct rendering (old path)
-        // Get Frame3D transform
-        float pos[3], rot[3], scale[3];
-        frame->getPosition(pos[0], pos[1], pos[2]);
-        frame->getRotation(rot[0], rot[1], rot[2]);
-        frame->getScale(scale[0], scale[1], scale[2]);
-        
-        // Create model matrix for this Frame3D
-        float modelMatrix[16];
-        createTransformMatrix(pos[0], pos[1], pos[2], 
-                             rot[0], rot[1], rot[2],
-                             scale[0], scale[1], scale[2],
-                             modelMatrix);
-        
-        // Combine with view-projection
+        // Frame3D transform combined with view-projection
         float mvpMatrix[16];
-        multiplyMatrices(viewProjMatrix, modelMatrix, mvpMatrix);
+        frame3DMatrix(*frame, viewProjMatrix, mvpMatrix);
         
         // Render all 2D children with this MVP matrix
         for (const auto& child : frame->getChildren()) {
@@ -543,20 +588,9 @@ void MetalRenderer::renderFrame3D(Frame3D* frame, const float* viewProjMatrix) {
 void MetalRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
     if (!object || !object->isVisible()) return;
     
-    // Get 2D position and create translation matrix
-    float x, y;
-    object->getPosition(x, y);
-    
-    float translationMatrix[16] = {
-        1, 0, 0, 0,
-        0, 1, 0, 0,
-        0, 0, 1, 0,
-        x, y, 0, 1
-    };
-    
-    // Combine with parent MVP
+    // Parent MVP * translation to the object's position
     float objectMVP[16];
-    multiplyMatrices(mvpMatrix, translationMatrix, objectMVP);
+    object2DMatrix(*object, mvpMatrix, objectMVP);
     
     // Check if it's a Frame2D (needs to be checked before Rectangle since Frame2D inherits from Object2D)
     Frame2D* frame2d = dynamic_cast<Frame2D*>(object);
@@ -566,18 +600,9 @@ void MetalRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
         
         // Frame2D position is already top-left origin (Object2D coordinate system)
         // We only need to set up the coordinate system for children:
-        // - Y-axis flip (Y+ down for 2D UI)
-        // - Origin at (0, 0) = Frame2D's top-left corner
-        float offsetMatrix[16] = {
-            1, 0, 0, 0,
-            0, -1, 0, 0,  // Flip Y-axis: Y+ down for 2D UI
-            0, 0, 1, 0,
-            0, height, 0, 1  // Move origin to top-left with Y-flip
-        };
-        
-        // Combine with Frame2D's MVP
+        // Y+ down, origin at (0, 0) = Frame2D's top-left corner
         float frame2dMVP[16];
-        multiplyMatrices(objectMVP, offsetMatrix, frame2dMVP);
+        frame2DContentMatrix(*frame2d, objectMVP, frame2dMVP);
         
         // Handle clipping for Frame2D
         bool hasClipping = frame2d->isClippingEnabled();
@@ -587,11 +612,16 @@ void MetalRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
             pushScissorRect(0, 0, width, height, frame2dMVP);
         }
         
+        // An empty clip (e.g. the parent clip excludes this frame) hides every
+        // child, so skip the traversal
+        bool clippedAway = hasClipping &&
+            (scissorStack_.back().width == 0 || scissorStack_.back().height == 0);
+        
         // Render Frame2D children with top-left origin coordinate system
         // Child at (0, 0) will be at Frame2D's top-left corner
         // Child at (width, height) will be at Frame2D's bottom-right corner
-        for (const auto& child : frame2d->getChildren()) {
-            renderObject2D(child.get(), frame2dMVP);
+        if (!clippedAway) {
+            renderFrame2DChildren(frame2d, frame2dMVP);
         }
         
         if (hasClipping) {
@@ -604,6 +634,12 @@ void MetalRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
     // Check if it's a Rectangle
     Rectangle* rect = dynamic_cast<Rectangle*>(object);
     if (rect) {
+        // A childless rectangle entirely outside the active clip draws nothing
+        float rectWidth, rectHeight;
+        rect->getSize(rectWidth, rectHeight);
+        if (rect->getChildren().empty() && isOutsideScissor(rectWidth, rectHeight, objectMVP)) {
+            return;
+        }
         renderRectangle(rect, objectMVP);
     }
     
@@ -619,30 +655,205 @@ void MetalRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
     }
 }
 
-void MetalRenderer::renderRectangle(Rectangle* rect, const float* mvpMatrix) {
-    @autoreleasepool {
-        float width, height;
+void MetalRenderer::renderFrame2DChildren(Frame2D* frame2d, const float* frame2dMVP) {
+    // Runs of sibling rectangles without children that share a texture are drawn
+    // together: their positions are baked into the vertices so they all use the
+    // Frame2D's MVP, as in RecordedScene::record()
+    std::vector<Vertex> batch;
+    std::shared_ptr<Image> batchImage;
+    
+    auto flush = [&]() {
+        if (!batch.empty()) {
+            drawRectangleVertices(batch.data(), static_cast<int>(batch.size()), batchImage.get(), frame2dMVP);
+            batch.clear();
+        }
+    };
+    
+    for (const auto& child : frame2d->getChildren()) {
+        Rectangle* rect = dynamic_cast<Rectangle*>(child.get());
+        if (!rect || !rect->getChildren().empty()) {
+            // Keep draw order: everything batched so far goes first
+            flush();
+            renderObject2D(child.get(), frame2dMVP);
+            continue;
+        }
+        if (!rect->isVisible()) continue;
+        
+        float x, y, width, height;
+        rect->getPosition(x, y);
         rect->getSize(width, height);
         
-        float r, g, b, a;
-        rect->getColor(r, g, b, a);
+        float rectMVP[16];
+        object2DMatrix(*rect, frame2dMVP, rectMVP);
+        if (isOutsideScissor(width, height, rectMVP)) continue;
         
-        // Create vertices with top-left origin (position refers to top-left corner)
-        // This matches the Object2D coordinate system: "Origin at top-left of parent"
-        Vertex vertices[] = {
-            {{0.0f, 0.0f}, {r, g, b, a}, {0.0f, 1.0f}},      // Top-left (flip V)
-            {{width, 0.0f}, {r, g, b, a}, {1.0f, 1.0f}},     // Top-right (flip V)
-            {{0.0f, height}, {r, g, b, a}, {0.0f, 0.0f}},    // Bottom-left (flip V)
-            {{width, 0.0f}, {r, g, b, a}, {1.0f, 1.0f}},     // Top-right (flip V)
-            {{width, height}, {r, g, b, a}, {1.0f, 0.0f}},   // Bottom-right (flip V)
-            {{0.0f, height}, {r, g, b, a}, {0.0f, 0.0f}},    // Bottom-left (flip V)
-        };
+        std::shared_ptr<Image> image = rect->hasImage() ? rect->getImage() : nullptr;
+        if (image != batchImage) {
+            flush();
+            batchImage = image;
+        }
         
+        Vertex vertices[kMaxRectangleVertices];
+        int vertexCount = buildRectangleVertices(rect, vertices);
+        for (int i = 0; i < vertexCount; i++) {
+            vertices[i].position[0] += x;
+            vertices[i].position[1] += y;
+        }
+        batch.insert(batch.end(), vertices, vertices + vertexCount);
+    }
+    
+    flush();
+}
+
+// Recorded draw list plus the GPU copy of its vertices; replayed by renderCompiled()
+class MetalCompiledScene : public RecordedScene {
+public:
+    ~MetalCompiledScene() override {
+        if (vertexBuffer) {
+            CFRelease(vertexBuffer);
+        }
+    }
+    
+    void* vertexBuffer = nullptr;  // id<MTLBuffer> holding every rectangle's vertices
+};
+
+std::shared_ptr<CompiledScene> MetalRenderer::compileScene(std::shared_ptr<SceneRoot> scene) {
+    if (!scene || !device_) return nullptr;
+    
+    auto compiled = std::make_shared<MetalCompiledScene>();
+    compiled->scene = scene;
+    recordScene(*compiled);
+    return compiled;
+}
+
+void MetalRenderer::recordScene(MetalCompiledScene& compiled) {
+    compiled.record();
+    
+    // Upload all rectangle vertices once; replay only binds this buffer
+    @autoreleasepool {
+        if (compiled.vertexBuffer) {
+            CFRelease(compiled.vertexBuffer);
+            compiled.vertexBuffer = nullptr;
+        }
+        if (!compiled.vertices.empty()) {
+            id<MTLDevice> device = (__bridge id<MTLDevice>)device_;
+            id<MTLBuffer> buffer = [device
+                newBufferWithBytes:compiled.vertices.data()
+                length:sizeof(Vertex) * compiled.vertices.size()
+                options:MTLResourceStorageModeShared];
+            compiled.vertexBuffer = (__bridge_retained void*)buffer;
+        }
+    }
+}
+
+void MetalRenderer::renderCompiled(CompiledScene* compiled) {
+    auto* recorded = dynamic_cast<MetalCompiledScene*>(compiled);
+    if (!recorded || !recorded->scene || !renderEncoder_) return;
+    
+    // Re-record if the scene changed since it was compiled
+    if (recorded->isStale()) {
+        recordScene(*recorded);
+    }
+    
+    @autoreleasepool {
+        id<MTLDevice> device = (__bridge id<MTLDevice>)device_;
+        id<MTLBuffer> vertexBuffer = (__bridge id<MTLBuffer>)recorded->vertexBuffer;
+        id<MTLSamplerState> sampler = getLinearClampSampler(device);
+        
+        // Text and textured quads bind their own vertex buffers, and each
+        // off-screen pass has its own encoder
+        bool vertexBufferBound = false;
+        
+        // Off-screen pass being replayed (index of its BeginFrame3D)
+        bool passOpen = false;
+        size_t passBegin = 0;
+        
+        auto& ops = recorded->ops;
+        for (size_t i = 0; i < ops.size(); i++) {
+            const auto& op = ops[i];
+            id<MTLRenderCommandEncoder> renderEncoder = (__bridge id<MTLRenderCommandEncoder>)renderEncoder_;
+            switch (op.type) {
+                case MetalCompiledScene::OpType::DrawRectangle: {
+                    if (!vertexBufferBound) {
+                        [renderEncoder setVertexBuffer:vertexBuffer offset:0 atIndex:0];
+                        vertexBufferBound = true;
+                    }
+                    [renderEncoder setVertexBytes:op.mvp length:sizeof(op.mvp) atIndex:1];
+                    
+                    id<MTLTexture> texture = nil;
+                    if (op.image && op.image->isLoaded()) {
+                        texture = (__bridge id<MTLTexture>)getOrCreateTexture(op.image.get());
+                    }
+                    if (!texture) {
+                        texture = getWhiteTexture(device);
+                    }
+                    [renderEncoder setFragmentTexture:texture atIndex:0];
+                    [renderEncoder setFragmentSamplerState:sampler atIndex:0];
+                    
+                    [renderEncoder drawPrimitives:MTLPrimitiveTypeTriangle
+                                      vertexStart:op.vertexStart
+                                      vertexCount:op.vertexCount];
+                    break;
+                }
+                case MetalCompiledScene::OpType::DrawText:
+                    renderText(static_cast<Text*>(op.text.get()), op.mvp);
+                    vertexBufferBound = false;
+                    break;
+                case MetalCompiledScene::OpType::PushScissor:
+                    pushScissorRect(0, 0, op.clipWidth, op.clipHeight, op.mvp);
+                    break;
+                case MetalCompiledScene::OpType::PopScissor:
+                    popScissorRect();
+                    break;
+                case MetalCompiledScene::OpType::BeginFrame3D:
+                    // A target still holding this recording's output is not redrawn
+                    if (op.renderedTarget && op.renderedTarget == op.frame->getRenderTargetTexture()) {
+                        while (ops[i + 1].type != MetalCompiledScene::OpType::EndFrame3D) i++;
+                    } else if (beginFrame3DPass(op.frame.get())) {
+                        passOpen = true;
+                        passBegin = i;
+                    } else {
+                        // No render target: skip the frame's ops and its quad
+                        while (ops[i].type != MetalCompiledScene::OpType::EndFrame3D) i++;
+                    }
+                    vertexBufferBound = false;
+                    break;
+                case MetalCompiledScene::OpType::EndFrame3D: {
+                    if (passOpen) {
+                        endFrame3DPass();
+                        ops[passBegin].renderedTarget = op.frame->getRenderTargetTexture();
+                        passOpen = false;
+                    }
+                    
+                    int rtWidth, rtHeight;
+                    op.frame->getRenderTargetSize(rtWidth, rtHeight);
+                    renderTexturedQuad(op.frame->getRenderTargetTexture(), rtWidth, rtHeight, op.mvp);
+                    vertexBufferBound = false;
+                    break;
+                }
+            }
+        }
+    }
+}
+
+void MetalRenderer::renderRectangle(Rectangle* rect, const float* mvpMatrix) {
+    // Create vertices with top-left origin (position refers to top-left corner)
+    // This matches the Object2D coordinate system: "Origin at top-left of parent"
+    Vertex vertices[kMaxRectangleVertices];
+    int vertexCount = buildRectangleVertices(rect, vertices);
+    
+    std::shared_ptr<Image> image = rect->hasImage() ? rect->getImage() : nullptr;
+    drawRectangleVertices(vertices, vertexCount, image.get(), mvpMatrix);
+}
+
+void MetalRenderer::drawRectangleVertices(const Vertex* vertices, int vertexCount, Image* image,
+                                          const float* mvpMatrix) {
+    @autoreleasepool {
         // Create vertex buffer
         id<MTLDevice> device = (__bridge id<MTLDevice>)device_;
         id<MTLBuffer> vertexBuffer = [device 
             newBufferWithBytes:vertices 
-            length:sizeof(vertices) 
+            length:sizeof(Vertex) * vertexCount 
             options:MTLResourceStorageModeShared];
         
         // Create uniform buffer with MVP matrix
@@ -657,45 +868,21 @@ void MetalRenderer::renderRectangle(Rectangle* rect, const float* mvpMatrix) {
         
         // Handle texture with caching
         id<MTLTexture> texture = nil;
-        if (rect->hasImage()) {
-            auto image = rect->getImage();
-            if (image && image->isLoaded()) {
-                texture = (__bridge id<MTLTexture>)getOrCreateTexture(image.get());
-            }
+        if (image && image->isLoaded()) {
+            texture = (__bridge id<MTLTexture>)getOrCreateTexture(image);
         }
         
         if (!texture) {
             // Use white 1x1 texture for non-textured rectangles
-            static void* whiteTexture = nullptr;
-            if (!whiteTexture) {
-                MTLTextureDescriptor* texDesc = [MTLTextureDescriptor 
-                    texture2DDescriptorWithPixelFormat:MTLPixelFormatRGBA8Unorm
-                    width:1
-                    height:1
-                    mipmapped:NO];
-                texDesc.usage = MTLTextureUsageShaderRead;
-                texDesc.storageMode = MTLStorageModeShared;
-                
-                id<MTLTexture> tex = [device newTextureWithDescriptor:texDesc];
-                uint8_t whitePixel[4] = {255, 255, 255, 255};
-                MTLRegion region = MTLRegionMake2D(0, 0, 1, 1);
-                [tex replaceRegion:region mipmapLevel:0 withBytes:whitePixel bytesPerRow:4];
-                whiteTexture = (__bridge_retained void*)tex;
-            }
-            texture = (__bridge id<MTLTexture>)whiteTexture;
+            texture = getWhiteTexture(device);
         }
         
-        MTLSamplerDescriptor* samplerDesc = [[MTLSamplerDescriptor alloc] init];
-        samplerDesc.minFilter = MTLSamplerMinMagFilterLinear;
-        samplerDesc.magFilter = MTLSamplerMinMagFilterLinear;
-        samplerDesc.sAddressMode = MTLSamplerAddressModeClampToEdge;
-        samplerDesc.tAddressMode = MTLSamplerAddressModeClampToEdge;
-        id<MTLSamplerState> sampler = [device newSamplerStateWithDescriptor:samplerDesc];
+        id<MTLSamplerState> sampler = getLinearClampSampler(device);
         
         [renderEncoder setFragmentTexture:texture atIndex:0];
         [renderEncoder setFragmentSamplerState:sampler atIndex:0];
         
-        [renderEncoder drawPrimitives:MTLPrimitiveTypeTriangle vertexStart:0 vertexCount:6];
+        [renderEncoder drawPrimitives:MTLPrimitiveTypeTriangle vertexStart:0 vertexCount:vertexCount];
     }
 }
 
@@ -922,14 +1109,28 @@ void* MetalRenderer::getOrCreateRenderTarget(Frame3D* frame) {
 }
 
 void MetalRenderer::renderFrame3DToTexture(Frame3D* frame) {
-    if (!frame) return;
+    if (!frame || !beginFrame3DPass(frame)) return;
+    
+    // Orthographic projection for 2D rendering
+    // This matches the main rendering coordinate system
+    float orthoMatrix[16];
+    offscreenProjectionMatrix(currentRenderTargetWidth_, currentRenderTargetHeight_, orthoMatrix);
+    
+    // Render all children to texture
+    for (const auto& child : frame->getChildren()) {
+        renderObject2D(child.get(), orthoMatrix);
+    }
     
+    endFrame3DPass();
+}
+
+bool MetalRenderer::beginFrame3DPass(Frame3D* frame) {
     @autoreleasepool {
         id<MTLCommandQueue> commandQueue = (__bridge id<MTLCommandQueue>)commandQueue_;
         
         // Get or create render target
         void* renderTarget = getOrCreateRenderTarget(frame);
-        if (!renderTarget) return;
+        if (!renderTarget) return false;
         
         id<MTLTexture> targetTexture = (__bridge id<MTLTexture>)renderTarget;
         
@@ -953,34 +1154,28 @@ void MetalRenderer::renderFrame3DToTexture(Frame3D* frame) {
         [offscreenEncoder setDepthStencilState:depthStateDisabled];
         
         // Store current encoder, command buffer, and render target dimensions
-        void* savedEncoder = renderEncoder_;
-        void* savedCommandBuffer = commandBuffer_;
-        int savedRenderTargetWidth = currentRenderTargetWidth_;
-        int savedRenderTargetHeight = currentRenderTargetHeight_;
+        savedEncoder_ = renderEncoder_;
+        savedCommandBuffer_ = commandBuffer_;
+        savedRenderTargetWidth_ = currentRenderTargetWidth_;
+        savedRenderTargetHeight_ = currentRenderTargetHeight_;
         
         // Get render target size
         int rtWidth, rtHeight;
         frame->getRenderTargetSize(rtWidth, rtHeight);
         
-        // Use off-screen encoder and dimensions temporarily
+        // Use off-screen encoder and dimensions until endFrame3DPass()
         renderEncoder_ = (__bridge_retained void*)offscreenEncoder;
         commandBuffer_ = (__bridge_retained void*)offscreenCommandBuffer;
         currentRenderTargetWidth_ = rtWidth;
         currentRenderTargetHeight_ = rtHeight;
-        
-        // Create orthographic projection for 2D rendering
-        // This matches the main rendering coordinate system
-        float orthoMatrix[16] = {
-            2.0f / rtWidth, 0, 0, 0,
-            0, -2.0f / rtHeight, 0, 0,  // Negative Y for standard coordinate system
-            0, 0, -1, 0,
-            -1, 1, 0, 1
-        };
-        
-        // Render all children to texture
-        for (const auto& child : frame->getChildren()) {
-            renderObject2D(child.get(), orthoMatrix);
-        }
+        return true;
+    }
+}
+
+void MetalRenderer::endFrame3DPass() {
+    @autoreleasepool {
+        id<MTLRenderCommandEncoder> offscreenEncoder = (__bridge id<MTLRenderCommandEncoder>)renderEncoder_;
+        id<MTLCommandBuffer> offscreenCommandBuffer = (__bridge id<MTLCommandBuffer>)commandBuffer_;
         
         // End encoding and commit
         [offscreenEncoder endEncoding];
@@ -988,16 +1183,14 @@ void MetalRenderer::renderFrame3DToTexture(Frame3D* frame) {
         [offscreenCommandBuffer waitUntilCompleted];
         
         // Restore original encoder, command buffer, and render target dimensions
-        if (renderEncoder_) {
-            CFRelease(renderEncoder_);
-        }
-        if (commandBuffer_) {
-            CFRelease(commandBuffer_);
-        }
-        renderEncoder_ = savedEncoder;
-        commandBuffer_ = savedCommandBuffer;
-        currentRenderTargetWidth_ = savedRenderTargetWidth;
-        currentRenderTargetHeight_ = savedRenderTargetHeight;
+        CFRelease(renderEncoder_);
+        CFRelease(commandBuffer_);
+        renderEncoder_ = savedEncoder_;
+        commandBuffer_ = savedCommandBuffer_;
+        currentRenderTargetWidth_ = savedRenderTargetWidth_;
+        currentRenderTargetHeight_ = savedRenderTargetHeight_;
+        savedEncoder_ = nullptr;
+        savedCommandBuffer_ = nullptr;
     }
 }
 
@@ -1037,55 +1230,31 @@ void MetalRenderer::renderTexturedQuad(void* texture, float width, float height,
     }
 }
 
-void MetalRenderer::multiplyMatrices(const float* a, const float* b, float* result) {
-    for (int row = 0; row < 4; row++) {
-        for (int col = 0; col < 4; col++) {
-            result[row + col * 4] = 0;
-            for (int k = 0; k < 4; k++) {
-                result[row + col * 4] += a[row + k * 4] * b[k + col * 4];
-            }
-        }
-    }
-}
-
-void MetalRenderer::createTransformMatrix(float x, float y, float z,
-                                         float pitch, float yaw, float roll,
-                                         float scaleX, float scaleY, float scaleZ,
-                                         float* matrix) {
-    float cp = std::cos(pitch);
-    float sp = std::sin(pitch);
-    float cy = std::cos(yaw);
-    float sy = std::sin(yaw);
-    float cr = std::cos(roll);
-    float sr = std::sin(roll);
-    
-    // Combined rotation and scale matrix (column-major)
-    matrix[0] = scaleX * (cy * cr);
-    matrix[1] = scaleX * (cy * sr);
-    matrix[2] = scaleX * (-sy);
-    matrix[3] = 0;
-    
-    matrix[4] = scaleY * (sp * sy * cr - cp * sr);
-    matrix[5] = scaleY * (sp * sy * sr + cp * cr);
-    matrix[6] = scaleY * (sp * cy);
-    matrix[7] = 0;
-    
-    matrix[8] = scaleZ * (cp * sy * cr + sp * sr);
-    matrix[9] = scaleZ * (cp * sy * sr - sp * cr);
-    matrix[10] = scaleZ * (cp * cy);
-    matrix[11] = 0;
-    
-    matrix[12] = x;
-    matrix[13] = y;
-    matrix[14] = z;
-    matrix[15] = 1;
-}
-
 bool MetalRenderer::captureFrame(std::vector<uint8_t>& pixelData, int& width, int& height) {
     if (!initialized_) {
         return false;
     }
     
+    // Async capture: the last frame already copied itself into a staging buffer
+    if (asyncCaptureEnabled_ && captureStagingLatest_ >= 0) {
+        @autoreleasepool {
+            CaptureStagingSlot& slot = captureStaging_[captureStagingLatest_];
+            
+            // Returns immediately if the GPU has already finished that frame
+            id<MTLCommandBuffer> commandBuffer = (__bridge id<MTLCommandBuffer>)slot.commandBuffer;
+            [commandBuffer waitUntilCompleted];
+            
+            width = slot.width;
+            height = slot.height;
+            size_t totalBytes = static_cast<size_t>(width) * height * 4;
+            pixelData.resize(totalBytes);
+            
+            id<MTLBuffer> buffer = (__bridge id<MTLBuffer>)slot.buffer;
+            memcpy(pixelData.data(), [buffer contents], totalBytes);
+            return true;
+        }
+    }
+    
     @autoreleasepool {
         MTKView* metalView = (__bridge MTKView*)metalView_;
         id<MTLTexture> drawable = metalView.currentDrawable.texture;
@@ -1106,31 +1275,13 @@ bool MetalRenderer::captureFrame(std::vector<uint8_t>& pixelData, int& width, in
         id<MTLDevice> device = (__bridge id<MTLDevice>)device_;
         id<MTLCommandQueue> commandQueue = (__bridge id<MTLCommandQueue>)commandQueue_;
         
-        id<MTLCommandBuffer> commandBuffer = [commandQueue commandBuffer];
-        id<MTLBlitCommandEncoder> blitEncoder = [commandBuffer blitCommandEncoder];
-        
-        [blitEncoder copyFromTexture:drawable
-                         sourceSlice:0
-                         sourceLevel:0
-                        sourceOrigin:MTLOriginMake(0, 0, 0)
-                          sourceSize:MTLSizeMake(width, height, 1)
-                            toBuffer:[device newBufferWithLength:totalBytes 
-                                                         options:MTLResourceStorageModeShared]
-                   destinationOffset:0
-              destinationBytesPerRow:bytesPerRow
-            destinationBytesPerImage:totalBytes];
-        
-        [blitEncoder endEncoding];
-        [commandBuffer commit];
-        [commandBuffer waitUntilCompleted];
-        
-        // Get the buffer we just created
         id<MTLBuffer> buffer = [device newBufferWithLength:totalBytes 
                                                     options:MTLResourceStorageModeShared];
         
-        // Copy again with proper buffer
-        commandBuffer = [commandQueue commandBuffer];
-        blitEncoder = [commandBuffer blitCommandEncoder];
+        // The blit is queued after the frame's command buffer, so a single
+        // waitUntilCompleted covers both the render and the readback
+        id<MTLCommandBuffer> commandBuffer = [commandQueue commandBuffer];
+        id<MTLBlitCommandEncoder> blitEncoder = [commandBuffer blitCommandEncoder];
         
         [blitEncoder copyFromTexture:drawable
                          sourceSlice:0
@@ -1226,6 +1377,134 @@ bool MetalRenderer::saveCapture(const char* filename) {
     }
 }
 
+void MetalRenderer::setAsyncCaptureEnabled(bool enabled) {
+    asyncCaptureEnabled_ = enabled;
+    
+    if (metalView_) {
+        MTKView* view = (__bridge MTKView*)metalView_;
+        [view setFramebufferOnly:!enabled];
+    }
+    
+    if (!enabled) {
+        releaseCaptureStaging();
+    }
+}
+
+bool MetalRenderer::isAsyncCaptureEnabled() const {
+    return asyncCaptureEnabled_;
+}
+
+void MetalRenderer::setContentScale(float scale) {
+    contentScale_ = scale > 0.0f ? scale : 0.0f;
+    
+    if (metalView_) {
+        MTKView* view = (__bridge MTKView*)metalView_;
+        CGSize size = view.bounds.size;
+        if (contentScale_ > 0.0f) {
+            // Fixed drawable size; it no longer follows window resizes
+            [view setAutoResizeDrawable:NO];
+            [view setDrawableSize:CGSizeMake(size.width * contentScale_, size.height * contentScale_)];
+        } else {
+            CGFloat backingScale = view.window ? [view.window backingScaleFactor] : 1.0;
+            [view setAutoResizeDrawable:YES];
+            [view setDrawableSize:CGSizeMake(size.width * backingScale, size.height * backingScale)];
+        }
+    }
+}
+
+float MetalRenderer::getContentScale() const {
+    return contentScale_;
+}
+
+void MetalRenderer::setVSyncEnabled(bool enabled) {
+    vsyncEnabled_ = enabled;
+    
+    if (metalView_) {
+        MTKView* view = (__bridge MTKView*)metalView_;
+        CAMetalLayer* metalLayer = (CAMetalLayer*)view.layer;
+        metalLayer.displaySyncEnabled = enabled;
+    }
+}
+
+bool MetalRenderer::isVSyncEnabled() const {
+    return vsyncEnabled_;
+}
+
+void MetalRenderer::encodeCaptureStagingCopy(void* commandBufferPtr, void* texturePtr) {
+    if (!commandBufferPtr || !texturePtr) return;
+    
+    @autoreleasepool {
+        id<MTLCommandBuffer> commandBuffer = (__bridge id<MTLCommandBuffer>)commandBufferPtr;
+        id<MTLTexture> texture = (__bridge id<MTLTexture>)texturePtr;
+        
+        int width = (int)texture.width;
+        int height = (int)texture.height;
+        size_t bytesPerRow = width * 4;
+        size_t totalBytes = bytesPerRow * height;
+        
+        CaptureStagingSlot& slot = captureStaging_[captureStagingNext_];
+        
+        // The slot was last written kCaptureStagingCount frames ago; this only
+        // blocks if that frame is somehow still in flight
+        if (slot.commandBuffer) {
+            id<MTLCommandBuffer> previous = (__bridge_transfer id<MTLCommandBuffer>)slot.commandBuffer;
+            [previous waitUntilCompleted];
+            slot.commandBuffer = nullptr;
+        }
+        
+        // (Re)allocate the staging buffer when the drawable size changes
+        id<MTLBuffer> buffer = slot.buffer ? (__bridge id<MTLBuffer>)slot.buffer : nil;
+        if (!buffer || buffer.length < totalBytes) {
+            if (slot.buffer) {
+                (void)(__bridge_transfer id<MTLBuffer>)slot.buffer;
+            }
+            id<MTLDevice> device = (__bridge id<MTLDevice>)device_;
+            buffer = [device newBufferWithLength:totalBytes options:MTLResourceStorageModeShared];
+            slot.buffer = (__bridge_retained void*)buffer;
+        }
+        
+        id<MTLBlitCommandEncoder> blitEncoder = [commandBuffer blitCommandEncoder];
+        [blitEncoder copyFromTexture:texture
+                         sourceSlice:0
+                         sourceLevel:0
+                        sourceOrigin:MTLOriginMake(0, 0, 0)
+                          sourceSize:MTLSizeMake(width, height, 1)
+                            toBuffer:buffer
+                   destinationOffset:0
+              destinationBytesPerRow:bytesPerRow
+            destinationBytesPerImage:totalBytes];
+        [blitEncoder endEncoding];
+        
+        slot.commandBuffer = (__bridge_retained void*)commandBuffer;
+        slot.width = width;
+        slot.height = height;
+        
+        captureStagingLatest_ = captureStagingNext_;
+        captureStagingNext_ = (captureStagingNext_ + 1) % kCaptureStagingCount;
+    }
+}
+
+void MetalRenderer::releaseCaptureStaging() {
+    @autoreleasepool {
+        for (int i = 0; i < kCaptureStagingCount; i++) {
+            CaptureStagingSlot& slot = captureStaging_[i];
+            if (slot.commandBuffer) {
+                id<MTLCommandBuffer> commandBuffer = (__bridge_transfer id<MTLCommandBuffer>)slot.commandBuffer;
+                [commandBuffer waitUntilCompleted];
+                slot.commandBuffer = nullptr;
+            }
+            if (slot.buffer) {
+                (void)(__bridge_transfer id<MTLBuffer>)slot.buffer;
+                slot.buffer = nullptr;
+            }
+            slot.width = 0;
+            slot.height = 0;
+        }
+        captureStagingNext_ = 0;
+        captureStagingLatest_ = -1;
+    }
+}
+
 void MetalRenderer::pushScissorRect(float x, float y, float width, float height, const float* mvpMatrix) {
     @autoreleasepool {
         // Transform the four corners of the clipping rectangle to screen space
@@ -1329,6 +1608,26 @@ void MetalRenderer::popScissorRect() {
     }
 }
 
+bool MetalRenderer::isOutsideScissor(float width, float height, const float* mvpMatrix) {
+    if (scissorStack_.empty()) return false;
+    
+    // Screen-space bounding box of (0, 0, width, height)
+    float minX = 0.0f, maxX = 0.0f, minY = 0.0f, maxY = 0.0f;
+    const float corners[4][2] = {{0, 0}, {width, 0}, {0, height}, {width, height}};
+    for (int i = 0; i < 4; i++) {
+        float screenX, screenY;
+        transformPointToScreen(corners[i][0], corners[i][1], mvpMatrix, screenX, screenY);
+        minX = (i == 0) ? screenX : std::min(minX, screenX);
+        maxX = (i == 0) ? screenX : std::max(maxX, screenX);
+        minY = (i == 0) ? screenY : std::min(minY, screenY);
+        maxY = (i == 0) ? screenY : std::max(maxY, screenY);
+    }
+    
+    const ScissorRect& clip = scissorStack_.back();
+    return maxX <= clip.x || minX >= clip.x + clip.width ||
+           maxY <= clip.y || minY >= clip.y + clip.height;
+}
+
 void MetalRenderer::transformPointToScreen(float x, float y, const float* mvpMatrix, float& screenX, float& screenY) {
     // Transform point by MVP matrix
     float clipX = mvpMatrix[0] * x + mvpMatrix[4] * y + mvpMatrix[12];
@@ -1358,4 +1657,12 @@ int MetalRenderer::getFrameCount() const {
     return totalFrameCount_;
 }
 
+void MetalRenderer::resetFPSCounters() {
+    startTime_ = CACurrentMediaTime();
+    lastFPSUpdateTime_ = startTime_;
+    frameCount_ = 0;
+    totalFrameCount_ = 0;
+    currentFPS_ = 0.0;
+}
+
 } // namespace CyberUI
@@ -1,4 +1,5 @@
 #include "OpenGLRenderer.h"
+#include "RecordedScene.h"
 #include "Shape2D.h"
 #include "Image.h"
 #include "Text.h"
@@ -15,18 +16,15 @@
 #endif
 
 #include <GLFW/glfw3.h>
+#include <algorithm>
 #include <cmath>
 #include <cstring>
 #include <iostream>
 
 namespace CyberUI {
 
-// Vertex structure for rectangles
-struct Vertex {
-    float position[2];
-    float color[4];
-    float texCoord[2];
-};
+// Initialized renderers sharing GLFW; it is terminated when the last one shuts down
+static int liveGlfwRenderers = 0;
 
 // Shader sources
 static const char* vertexShaderSource = R"(
@@ -63,11 +61,39 @@ void main() {
 }
 )";
 
+// Set up the Vertex attribute layout for a VAO backed by vbo
+static void configureVertexArray(unsigned int vao, unsigned int vbo) {
+    glBindVertexArray(vao);
+    glBindBuffer(GL_ARRAY_BUFFER, vbo);
+    
+    // Position attribute
+    glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, sizeof(Vertex), (void*)0);
+    glEnableVertexAttribArray(0);
+    
+    // Color attribute
+    glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, sizeof(Vertex), (void*)(2 * sizeof(float)));
+    glEnableVertexAttribArray(1);
+    
+    // TexCoord attribute
+    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, sizeof(Vertex), (void*)(6 * sizeof(float)));
+    glEnableVertexAttribArray(2);
+    
+    glBindVertexArray(0);
+}
+
 OpenGLRenderer::OpenGLRenderer() 
     : window_(nullptr), shaderProgram_(0), vao_(0), vbo_(0),
+      compiledVao_(0), compiledVbo_(0), compiledUploadId_(0),
       initialized_(false), shouldClose_(false), windowWidth_(800), windowHeight_(600),
       newTexturesCreatedThisFrame_(false),
       currentRenderTargetWidth_(0), currentRenderTargetHeight_(0),
+      offscreenFbo_(0), savedRenderTargetWidth_(0), savedRenderTargetHeight_(0),
+      asyncCaptureEnabled_(false),
+      captureStaging_(),
+      captureStagingNext_(0),
+      captureStagingLatest_(-1),
+      contentScale_(0.0f),
+      vsyncEnabled_(true),
       whiteTexture_(0),
       frameCount_(0), totalFrameCount_(0), startTime_(0.0), lastFPSUpdateTime_(0.0), currentFPS_(0.0) {
 }
@@ -95,21 +121,26 @@ bool OpenGLRenderer::initialize(int width, int height, const char* title) {
     
 #ifdef __APPLE__
     glfwWindowHint(GLFW_OPENGL_FORWARD_COMPAT, GL_TRUE);
+    // A content scale of 1 asks for a non-Retina framebuffer (window size in pixels)
+    glfwWindowHint(GLFW_COCOA_RETINA_FRAMEBUFFER, contentScale_ == 1.0f ? GLFW_FALSE : GLFW_TRUE);
 #endif
     
     // Create window
     GLFWwindow* window = glfwCreateWindow(width, height, title, nullptr, nullptr);
     if (!window) {
         std::cerr << "Failed to create GLFW window" << std::endl;
-        glfwTerminate();
+        if (liveGlfwRenderers == 0) {
+            glfwTerminate();
+        }
         return false;
     }
     window_ = window;
+    liveGlfwRenderers++;
     
     glfwMakeContextCurrent(window);
     
     // Enable V-Sync to limit FPS to display refresh rate (typically 60 FPS)
-    glfwSwapInterval(1);
+    glfwSwapInterval(vsyncEnabled_ ? 1 : 0);
     
 #ifndef __APPLE__
     // Initialize GLEW (not needed on macOS)
@@ -138,22 +169,12 @@ bool OpenGLRenderer::initialize(int width, int height, const char* title) {
     glGenVertexArrays(1, &vao_);
     glGenBuffers(1, &vbo_);
     
-    glBindVertexArray(vao_);
-    glBindBuffer(GL_ARRAY_BUFFER, vbo_);
-    
-    // Position attribute
-    glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, sizeof(Vertex), (void*)0);
-    glEnableVertexAttribArray(0);
-    
-    // Color attribute
-    glVertexAttribPointer(1, 4, GL_FLOAT, GL_FALSE, sizeof(Vertex), (void*)(2 * sizeof(float)));
-    glEnableVertexAttribArray(1);
-    
-    // TexCoord attribute
-    glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, sizeof(Vertex), (void*)(6 * sizeof(float)));
-    glEnableVertexAttribArray(2);
+    configureVertexArray(vao_, vbo_);
     
-    glBindVertexArray(0);
+    // Separate VAO/VBO for compiled scenes so their vertices stay resident
+    glGenVertexArrays(1, &compiledVao_);
+    glGenBuffers(1, &compiledVbo_);
+    configureVertexArray(compiledVao_, compiledVbo_);
     
     // Create white texture for non-textured rectangles
     glGenTextures(1, &whiteTexture_);
@@ -218,6 +239,9 @@ void OpenGLRenderer::setupShaders() {
 
 void OpenGLRenderer::shutdown() {
     if (initialized_) {
+        // GL objects below belong to this renderer's context
+        makeContextCurrent();
+        
         // Print final FPS statistics
         double totalTime = glfwGetTime() - startTime_;
         double avgFPS = totalTime > 0 ? totalFrameCount_ / totalTime : 0.0;
@@ -228,6 +252,8 @@ void OpenGLRenderer::shutdown() {
         std::cout << "Average FPS: " << avgFPS << std::endl;
         std::cout << "==================================\n" << std::endl;
         
+        releaseCaptureStaging();
+        
         // Clean up texture cache
         for (auto& pair : textureCache_) {
             glDeleteTextures(1, &pair.second);
@@ -254,6 +280,17 @@ void OpenGLRenderer::shutdown() {
             vbo_ = 0;
         }
         
+        if (compiledVbo_) {
+            glDeleteBuffers(1, &compiledVbo_);
+            compiledVbo_ = 0;
+        }
+        
+        if (compiledVao_) {
+            glDeleteVertexArrays(1, &compiledVao_);
+            compiledVao_ = 0;
+        }
+        compiledUploadId_ = 0;
+        
         if (vao_) {
             glDeleteVertexArrays(1, &vao_);
             vao_ = 0;
@@ -267,9 +304,13 @@ void OpenGLRenderer::shutdown() {
         if (window_) {
             glfwDestroyWindow(static_cast<GLFWwindow*>(window_));
             window_ = nullptr;
+            liveGlfwRenderers--;
         }
         
-        glfwTerminate();
+        // Other renderers in this process may still have windows open
+        if (liveGlfwRenderers == 0) {
+            glfwTerminate();
+        }
         initialized_ = false;
     }
 }
@@ -277,14 +318,15 @@ void OpenGLRenderer::shutdown() {
 bool OpenGLRenderer::beginFrame() {
     if (!initialized_) return false;
     
+    GLFWwindow* window = static_cast<GLFWwindow*>(window_);
+    makeContextCurrent();
+    
     // Reset texture creation flag for this frame
     newTexturesCreatedThisFrame_ = false;
     
     // Clear scissor stack for new frame
     scissorStack_.clear();
     
-    GLFWwindow* window = static_cast<GLFWwindow*>(window_);
-    
     // Get framebuffer size (accounts for Retina scaling)
     int fbWidth, fbHeight;
     glfwGetFramebufferSize(window, &fbWidth, &fbHeight);
@@ -322,6 +364,13 @@ bool OpenGLRenderer::beginFrame() {
 
 void OpenGLRenderer::endFrame() {
     GLFWwindow* window = static_cast<GLFWwindow*>(window_);
+    makeContextCurrent();
+    
+    // Queue the back buffer readback before it is swapped away
+    if (asyncCaptureEnabled_) {
+        encodeCaptureStagingCopy();
+    }
+    
     glfwSwapBuffers(window);
     
     // Only wait for GPU if new textures were created this frame
@@ -345,6 +394,7 @@ void OpenGLRenderer::endFrame() {
 
 void OpenGLRenderer::renderObject(Object2D* object) {
     if (!object || !object->isVisible()) return;
+    makeContextCurrent();
     
     // Use window size (logical coordinates) for the ortho matrix
     // Object positions and sizes are in logical coordinates, not framebuffer coordinates
@@ -383,21 +433,24 @@ void OpenGLRenderer::pollEvents() {
     }
 }
 
+void OpenGLRenderer::waitEvents(double timeoutSeconds) {
+    glfwWaitEventsTimeout(timeoutSeconds);
+    
+    GLFWwindow* window = static_cast<GLFWwindow*>(window_);
+    if (glfwGetKey(window, GLFW_KEY_ESCAPE) == GLFW_PRESS) {
+        shouldClose_ = true;
+    }
+}
+
 void OpenGLRenderer::renderScene(SceneRoot* scene) {
     if (!scene) return;
+    makeContextCurrent();
     
     auto camera = scene->getCamera();
     if (!camera) return;
     
-    // Get view and projection matrices
-    float viewMatrix[16];
-    float projMatrix[16];
-    camera->getViewMatrix(viewMatrix);
-    camera->getProjectionMatrix(projMatrix);
-    
-    // Combine view and projection
     float viewProjMatrix[16];
-    multiplyMatrices(projMatrix, viewMatrix, viewProjMatrix);
+    viewProjectionMatrix(*camera, viewProjMatrix);
     
     // Render all Frame3D objects
     for (const auto& frame : scene->getFrames()) {
@@ -418,22 +471,9 @@ void OpenGLRenderer::renderFrame3D(Frame3D* frame, const float* viewProjMatrix)
         unsigned int texture = texturePtr ? static_cast<unsigned int>(reinterpret_cast<uintptr_t>(texturePtr)) : 0;
         
         if (texture) {
-            // Get Frame3D transform
-            float pos[3], rot[3], scale[3];
-            frame->getPosition(pos[0], pos[1], pos[2]);
-            frame->getRotation(rot[0], rot[1], rot[2]);
-            frame->getScale(scale[0], scale[1], scale[2]);
-            
-            // Create model matrix
-            float modelMatrix[16];
-            createTransformMatrix(pos[0], pos[1], pos[2], 
-                                 rot[0], rot[1], rot[2],
-                                 scale[0], scale[1], scale[2],
-                                 modelMatrix);
-            
-            // Combine with view-projection
+            // Frame3D transform combined with view-projection
             float mvpMatrix[16];
-            multiplyMatrices(viewProjMatrix, modelMatrix, mvpMatrix);
+            frame3DMatrix(*frame, viewProjMatrix, mvpMatrix);
             
             // Get render target size
             int rtWidth, rtHeight;
@@ -444,22 +484,9 @@ void OpenGLRenderer::renderFrame3D(Frame3D* frame, const float* viewProjMatrix)
                              static_cast<float>(rtHeight), mvpMatrix);
         }
     } else {
-        // Direct rendering
-        float pos[3], rot[3], scale[3];
-        frame->getPosition(pos[0], pos[1], pos[2]);
-        frame->getRotation(rot[0], rot[1], rot[2]);
-        frame->getScale(scale[0], scale[1], scale[2]);
-        
-        // Create model matrix
-        float modelMatrix[16];
-        createTransformMatrix(pos[0], pos[1], pos[2], 
-                             rot[0], rot[1], rot[2],
-                             scale[0], scale[1], scale[2],
-                             modelMatrix);
-        
-        // Combine with view-projection
+        // Direct rendering: Frame3D transform combined with view-projection
         float mvpMatrix[16];
-        multiplyMatrices(viewProjMatrix, modelMatrix, mvpMatrix);
+        frame3DMatrix(*frame, viewProjMatrix, mvpMatrix);
         
         // Render all 2D children
         for (const auto& child : frame->getChildren()) {
@@ -471,22 +498,9 @@ void OpenGLRenderer::renderFrame3D(Frame3D* frame, const float* viewProjMatrix)
 void OpenGLRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
     if (!object || !object->isVisible()) return;
     
-    // Get 2D position and create translation matrix
-    float x, y;
-    object->getPosition(x, y);
-    
-    // Translation matrix in pixel space (applied before projection)
-    // Using COLUMN-MAJOR format (OpenGL standard)
-    float translationMatrix[16] = {
-        1, 0, 0, 0,    // Column 0
-        0, 1, 0, 0,    // Column 1
-        0, 0, 1, 0,    // Column 2
-        x, y, 0, 1     // Column 3 (translation)
-    };
-    
-    // Combine: MVP * Translation (right-to-left: first translate, then project)
+    // Parent MVP * translation to the object's position
     float objectMVP[16];
-    multiplyMatrices(mvpMatrix, translationMatrix, objectMVP);
+    object2DMatrix(*object, mvpMatrix, objectMVP);
     
     // Check if it's a Frame2D
     Frame2D* frame2d = dynamic_cast<Frame2D*>(object);
@@ -495,16 +509,8 @@ void OpenGLRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
         frame2d->getSize(width, height);
         
         // Frame2D coordinate system: Y-axis flip, origin at top-left
-        float offsetMatrix[16] = {
-            1, 0, 0, 0,
-            0, -1, 0, 0,
-            0, 0, 1, 0,
-            0, height, 0, 1
-        };
-        
-        // Combine with Frame2D's MVP
         float frame2dMVP[16];
-        multiplyMatrices(objectMVP, offsetMatrix, frame2dMVP);
+        frame2DContentMatrix(*frame2d, objectMVP, frame2dMVP);
         
         // Handle clipping
         bool hasClipping = frame2d->isClippingEnabled();
@@ -513,9 +519,15 @@ void OpenGLRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
             pushScissorRect(0, 0, width, height, frame2dMVP);
         }
         
+        // An empty clip hides every child, so skip the traversal
+        bool clippedAway = hasClipping &&
+            (scissorStack_.back().width <= 0 || scissorStack_.back().height <= 0);
+        
         // Render children
-        for (const auto& child : frame2d->getChildren()) {
-            renderObject2D(child.get(), frame2dMVP);
+        if (!clippedAway) {
+            for (const auto& child : frame2d->getChildren()) {
+                renderObject2D(child.get(), frame2dMVP);
+            }
         }
         
         if (hasClipping) {
@@ -528,6 +540,12 @@ void OpenGLRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
     // Check if it's a Rectangle
     Rectangle* rect = dynamic_cast<Rectangle*>(object);
     if (rect) {
+        // A childless rectangle entirely outside the active clip draws nothing
+        float rectWidth, rectHeight;
+        rect->getSize(rectWidth, rectHeight);
+        if (rect->getChildren().empty() && isOutsideScissor(rectWidth, rectHeight, objectMVP)) {
+            return;
+        }
         renderRectangle(rect, objectMVP);
     }
     
@@ -543,27 +561,134 @@ void OpenGLRenderer::renderObject2D(Object2D* object, const float* mvpMatrix) {
     }
 }
 
-void OpenGLRenderer::renderRectangle(Rectangle* rect, const float* mvpMatrix) {
-    float width, height;
-    rect->getSize(width, height);
+// Recorded draw list plus the vertex upload bookkeeping for the shared compiled VBO
+class OpenGLCompiledScene : public RecordedScene {
+public:
+    uint64_t uploadId = 0;  // Identifies this recording's vertex data (see compiledUploadId_)
+};
+
+std::shared_ptr<CompiledScene> OpenGLRenderer::compileScene(std::shared_ptr<SceneRoot> scene) {
+    if (!scene || !initialized_) return nullptr;
     
-    float r, g, b, a;
-    rect->getColor(r, g, b, a);
+    auto compiled = std::make_shared<OpenGLCompiledScene>();
+    compiled->scene = scene;
+    recordScene(*compiled);
+    return compiled;
+}
+
+void OpenGLRenderer::recordScene(OpenGLCompiledScene& compiled) {
+    compiled.record();
+    
+    // Vertices are uploaded on the first replay of this recording
+    static uint64_t nextUploadId = 0;
+    compiled.uploadId = ++nextUploadId;
+}
+
+void OpenGLRenderer::renderCompiled(CompiledScene* compiled) {
+    auto* recorded = dynamic_cast<OpenGLCompiledScene*>(compiled);
+    if (!recorded || !recorded->scene || !initialized_) return;
+    makeContextCurrent();
+    
+    // Re-record if the scene changed since it was compiled
+    if (recorded->isStale()) {
+        recordScene(*recorded);
+    }
+    
+    // Upload the recorded vertices only when a different recording was replayed last
+    glBindVertexArray(compiledVao_);
+    glBindBuffer(GL_ARRAY_BUFFER, compiledVbo_);
+    if (compiledUploadId_ != recorded->uploadId) {
+        glBufferData(GL_ARRAY_BUFFER, sizeof(Vertex) * recorded->vertices.size(),
+                     recorded->vertices.data(), GL_STATIC_DRAW);
+        compiledUploadId_ = recorded->uploadId;
+    }
+    
+    int mvpLoc = glGetUniformLocation(shaderProgram_, "uMVPMatrix");
+    glActiveTexture(GL_TEXTURE0);
+    glUniform1i(glGetUniformLocation(shaderProgram_, "uTexture"), 0);
     
+    // Text and textured quads bind the shared VAO
+    bool vertexArrayBound = true;
+    
+    // Off-screen pass being replayed (index of its BeginFrame3D)
+    bool passOpen = false;
+    size_t passBegin = 0;
+    
+    auto& ops = recorded->ops;
+    for (size_t i = 0; i < ops.size(); i++) {
+        const auto& op = ops[i];
+        switch (op.type) {
+            case OpenGLCompiledScene::OpType::DrawRectangle: {
+                if (!vertexArrayBound) {
+                    glBindVertexArray(compiledVao_);
+                    vertexArrayBound = true;
+                }
+                glUniformMatrix4fv(mvpLoc, 1, GL_FALSE, op.mvp);
+                
+                unsigned int texture = whiteTexture_;
+                if (op.image && op.image->isLoaded()) {
+                    texture = getOrCreateTexture(op.image.get());
+                }
+                glBindTexture(GL_TEXTURE_2D, texture);
+                
+                glDrawArrays(GL_TRIANGLES, op.vertexStart, op.vertexCount);
+                break;
+            }
+            case OpenGLCompiledScene::OpType::DrawText:
+                renderText(static_cast<Text*>(op.text.get()), op.mvp);
+                vertexArrayBound = false;
+                break;
+            case OpenGLCompiledScene::OpType::PushScissor:
+                pushScissorRect(0, 0, op.clipWidth, op.clipHeight, op.mvp);
+                break;
+            case OpenGLCompiledScene::OpType::PopScissor:
+                popScissorRect();
+                break;
+            case OpenGLCompiledScene::OpType::BeginFrame3D:
+                // A target still holding this recording's output is not redrawn
+                if (op.renderedTarget && op.renderedTarget == op.frame->getRenderTargetTexture()) {
+                    while (ops[i + 1].type != OpenGLCompiledScene::OpType::EndFrame3D) i++;
+                } else if (beginFrame3DPass(op.frame.get())) {
+                    passOpen = true;
+                    passBegin = i;
+                } else {
+                    // No render target: skip the frame's ops and its quad
+                    while (ops[i].type != OpenGLCompiledScene::OpType::EndFrame3D) i++;
+                }
+                break;
+            case OpenGLCompiledScene::OpType::EndFrame3D: {
+                if (passOpen) {
+                    endFrame3DPass();
+                    ops[passBegin].renderedTarget = op.frame->getRenderTargetTexture();
+                    passOpen = false;
+                }
+                
+                int rtWidth, rtHeight;
+                op.frame->getRenderTargetSize(rtWidth, rtHeight);
+                unsigned int texture = static_cast<unsigned int>(
+                    reinterpret_cast<uintptr_t>(op.frame->getRenderTargetTexture()));
+                renderTexturedQuad(texture, static_cast<float>(rtWidth),
+                                   static_cast<float>(rtHeight), op.mvp);
+                
+                // renderTexturedQuad() binds its own VAO
+                vertexArrayBound = false;
+                break;
+            }
+        }
+    }
+    
+    glBindVertexArray(0);
+}
+
+void OpenGLRenderer::renderRectangle(Rectangle* rect, const float* mvpMatrix) {
     // Create vertices with top-left origin
-    Vertex vertices[] = {
-        {{0.0f, 0.0f}, {r, g, b, a}, {0.0f, 1.0f}},
-        {{width, 0.0f}, {r, g, b, a}, {1.0f, 1.0f}},
-        {{0.0f, height}, {r, g, b, a}, {0.0f, 0.0f}},
-        {{width, 0.0f}, {r, g, b, a}, {1.0f, 1.0f}},
-        {{width, height}, {r, g, b, a}, {1.0f, 0.0f}},
-        {{0.0f, height}, {r, g, b, a}, {0.0f, 0.0f}},
-    };
+    Vertex vertices[kMaxRectangleVertices];
+    int vertexCount = buildRectangleVertices(rect, vertices);
     
     // Upload vertices
     glBindVertexArray(vao_);
     glBindBuffer(GL_ARRAY_BUFFER, vbo_);
-    glBufferData(GL_ARRAY_BUFFER, sizeof(vertices), vertices, GL_DYNAMIC_DRAW);
+    glBufferData(GL_ARRAY_BUFFER, sizeof(Vertex) * vertexCount, vertices, GL_DYNAMIC_DRAW);
     
     // Set MVP matrix uniform
     int mvpLoc = glGetUniformLocation(shaderProgram_, "uMVPMatrix");
@@ -591,7 +716,7 @@ void OpenGLRenderer::renderRectangle(Rectangle* rect, const float* mvpMatrix) {
     glUniform1i(glGetUniformLocation(shaderProgram_, "uTexture"), 0);
     
     // Draw
-    glDrawArrays(GL_TRIANGLES, 0, 6);
+    glDrawArrays(GL_TRIANGLES, 0, vertexCount);
     
     glBindVertexArray(0);
 }
@@ -720,20 +845,32 @@ unsigned int OpenGLRenderer::getOrCreateRenderTarget(Frame3D* frame) {
 }
 
 void OpenGLRenderer::renderFrame3DToTexture(Frame3D* frame) {
-    if (!frame) return;
+    if (!frame || !beginFrame3DPass(frame)) return;
+    
+    // Orthographic projection for 2D rendering
+    float orthoMatrix[16];
+    offscreenProjectionMatrix(currentRenderTargetWidth_, currentRenderTargetHeight_, orthoMatrix);
+    
+    // Render all children to texture
+    for (const auto& child : frame->getChildren()) {
+        renderObject2D(child.get(), orthoMatrix);
+    }
     
+    endFrame3DPass();
+}
+
+bool OpenGLRenderer::beginFrame3DPass(Frame3D* frame) {
     // Get or create render target
     unsigned int renderTarget = getOrCreateRenderTarget(frame);
-    if (!renderTarget) return;
+    if (!renderTarget) return false;
     
     // Get render target size
     int rtWidth, rtHeight;
     frame->getRenderTargetSize(rtWidth, rtHeight);
     
     // Create framebuffer object
-    unsigned int fbo;
-    glGenFramebuffers(1, &fbo);
-    glBindFramebuffer(GL_FRAMEBUFFER, fbo);
+    glGenFramebuffers(1, &offscreenFbo_);
+    glBindFramebuffer(GL_FRAMEBUFFER, offscreenFbo_);
     
     // Attach texture to framebuffer
     glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, renderTarget, 0);
@@ -742,13 +879,14 @@ void OpenGLRenderer::renderFrame3DToTexture(Frame3D* frame) {
     if (glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE) {
         std::cerr << "Framebuffer is not complete!" << std::endl;
         glBindFramebuffer(GL_FRAMEBUFFER, 0);
-        glDeleteFramebuffers(1, &fbo);
-        return;
+        glDeleteFramebuffers(1, &offscreenFbo_);
+        offscreenFbo_ = 0;
+        return false;
     }
     
     // Save current state
-    int savedRenderTargetWidth = currentRenderTargetWidth_;
-    int savedRenderTargetHeight = currentRenderTargetHeight_;
+    savedRenderTargetWidth_ = currentRenderTargetWidth_;
+    savedRenderTargetHeight_ = currentRenderTargetHeight_;
     
     // Set viewport for off-screen rendering
     glViewport(0, 0, rtWidth, rtHeight);
@@ -765,26 +903,14 @@ void OpenGLRenderer::renderFrame3DToTexture(Frame3D* frame) {
     // Clear to transparent
     glClearColor(0.0f, 0.0f, 0.0f, 0.0f);
     glClear(GL_COLOR_BUFFER_BIT);
-    
-    // Create orthographic projection for 2D rendering
-    float scaleX = 2.0f / rtWidth;
-    float scaleY = -2.0f / rtHeight;
-    
-    float orthoMatrix[16] = {
-        scaleX, 0, 0, 0,
-        0, scaleY, 0, 0,
-        0, 0, 1, 0,
-        -1, 1, 0, 1
-    };
-    
-    // Render all children to texture
-    for (const auto& child : frame->getChildren()) {
-        renderObject2D(child.get(), orthoMatrix);
-    }
-    
+    return true;
+}
+
+void OpenGLRenderer::endFrame3DPass() {
     // Restore framebuffer and state
     glBindFramebuffer(GL_FRAMEBUFFER, 0);
-    glDeleteFramebuffers(1, &fbo);
+    glDeleteFramebuffers(1, &offscreenFbo_);
+    offscreenFbo_ = 0;
     
     // Re-enable depth testing for main 3D rendering
     glEnable(GL_DEPTH_TEST);
@@ -798,8 +924,8 @@ void OpenGLRenderer::renderFrame3DToTexture(Frame3D* frame) {
     glScissor(0, 0, fbWidth, fbHeight);
     
     // Restore render target dimensions
-    currentRenderTargetWidth_ = savedRenderTargetWidth;
-    currentRenderTargetHeight_ = savedRenderTargetHeight;
+    currentRenderTargetWidth_ = savedRenderTargetWidth_;
+    currentRenderTargetHeight_ = savedRenderTargetHeight_;
 }
 
 void OpenGLRenderer::renderTexturedQuad(unsigned int texture, float width, float height, const float* mvpMatrix) {
@@ -861,6 +987,17 @@ void OpenGLRenderer::pushScissorRect(float x, float y, float width, float height
     scissorWidth = std::min(scissorWidth, currentRenderTargetWidth_ - scissorX);
     scissorHeight = std::min(scissorHeight, currentRenderTargetHeight_ - scissorY);
     
+    // Nested clips only show what both rects allow: intersect with the parent
+    if (!scissorStack_.empty()) {
+        const ScissorRect& parent = scissorStack_.back();
+        int scissorRight = std::min(scissorX + scissorWidth, parent.x + parent.width);
+        int scissorBottom = std::min(scissorY + scissorHeight, parent.y + parent.height);
+        scissorX = std::max(scissorX, parent.x);
+        scissorY = std::max(scissorY, parent.y);
+        scissorWidth = std::max(0, scissorRight - scissorX);
+        scissorHeight = std::max(0, scissorBottom - scissorY);
+    }
+    
     // Push to stack
     scissorStack_.push_back({scissorX, scissorY, scissorWidth, scissorHeight});
     
@@ -882,6 +1019,28 @@ void OpenGLRenderer::popScissorRect() {
     }
 }
 
+bool OpenGLRenderer::isOutsideScissor(float width, float height, const float* mvpMatrix) {
+    if (scissorStack_.empty()) return false;
+    
+    // Screen-space bounding box of all four corners of (0, 0, width, height), in
+    // the same coordinates pushScissorRect() stores; a rotated Frame3D can put
+    // any corner at the extremes
+    float minX = 0.0f, maxX = 0.0f, minY = 0.0f, maxY = 0.0f;
+    const float corners[4][2] = {{0, 0}, {width, 0}, {0, height}, {width, height}};
+    for (int i = 0; i < 4; i++) {
+        float screenX, screenY;
+        transformPointToScreen(corners[i][0], corners[i][1], mvpMatrix, screenX, screenY);
+        minX = (i == 0) ? screenX : std::min(minX, screenX);
+        maxX = (i == 0) ? screenX : std::max(maxX, screenX);
+        minY = (i == 0) ? screenY : std::min(minY, screenY);
+        maxY = (i == 0) ? screenY : std::max(maxY, screenY);
+    }
+    
+    const ScissorRect& clip = scissorStack_.back();
+    return maxX <= clip.x || minX >= clip.x + clip.width ||
+           maxY <= clip.y || minY >= clip.y + clip.height;
+}
+
 void OpenGLRenderer::transformPointToScreen(float x, float y, const float* mvpMatrix, float& screenX, float& screenY) {
     // Transform point through MVP matrix
     float clipX = mvpMatrix[0] * x + mvpMatrix[4] * y + mvpMatrix[12];
@@ -899,25 +1058,143 @@ void OpenGLRenderer::transformPointToScreen(float x, float y, const float* mvpMa
 
 bool OpenGLRenderer::captureFrame(std::vector<uint8_t>& pixelData, int& width, int& height) {
     if (!initialized_) return false;
+    makeContextCurrent();
+    
+    size_t rowBytes;
+    
+    if (asyncCaptureEnabled_ && captureStagingLatest_ >= 0) {
+        // Async path: map the PBO written at the end of the latest frame
+        CaptureStagingSlot& slot = captureStaging_[captureStagingLatest_];
+        width = slot.width;
+        height = slot.height;
+        rowBytes = static_cast<size_t>(width) * 4;
+        
+        GLsync fence = static_cast<GLsync>(slot.fence);
+        if (fence) {
+            glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, GL_TIMEOUT_IGNORED);
+        }
+        
+        // Persistently mapped slots are read in place; others are mapped per capture
+        const uint8_t* mapped = static_cast<const uint8_t*>(slot.mapped);
+        if (!mapped) {
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.pbo);
+            mapped = static_cast<const uint8_t*>(
+                glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, rowBytes * height, GL_MAP_READ_BIT));
+            if (!mapped) {
+                glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+                return false;
+            }
+        }
+        
+        // Flip while copying out (OpenGL reads bottom-to-top)
+        pixelData.resize(rowBytes * height);
+        for (int y = 0; y < height; y++) {
+            memcpy(&pixelData[y * rowBytes], mapped + (height - 1 - y) * rowBytes, rowBytes);
+        }
+        
+        if (!slot.mapped) {
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER);
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+        }
+        return true;
+    }
     
     GLFWwindow* window = static_cast<GLFWwindow*>(window_);
     glfwGetFramebufferSize(window, &width, &height);
+    rowBytes = static_cast<size_t>(width) * 4;
     
-    pixelData.resize(width * height * 4);
+    pixelData.resize(rowBytes * height);
     glReadPixels(0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, pixelData.data());
     
-    // Flip image vertically (OpenGL reads bottom-to-top)
-    std::vector<uint8_t> flipped(pixelData.size());
-    for (int y = 0; y < height; y++) {
-        memcpy(&flipped[y * width * 4], 
-               &pixelData[(height - 1 - y) * width * 4], 
-               width * 4);
+    // Flip image vertically in place (OpenGL reads bottom-to-top)
+    for (int y = 0; y < height / 2; y++) {
+        std::swap_ranges(pixelData.begin() + y * rowBytes,
+                         pixelData.begin() + (y + 1) * rowBytes,
+                         pixelData.begin() + (height - 1 - y) * rowBytes);
     }
-    pixelData = std::move(flipped);
     
     return true;
 }
 
+void OpenGLRenderer::encodeCaptureStagingCopy() {
+    GLFWwindow* window = static_cast<GLFWwindow*>(window_);
+    int width, height;
+    glfwGetFramebufferSize(window, &width, &height);
+    if (width <= 0 || height <= 0) return;
+    
+    CaptureStagingSlot& slot = captureStaging_[captureStagingNext_];
+    if (slot.pbo && (slot.width != width || slot.height != height)) {
+        // Reallocate on resize; buffer storage is immutable, so start over
+        if (slot.mapped) {
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.pbo);
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER);
+        }
+        glDeleteBuffers(1, &slot.pbo);
+        slot.pbo = 0;
+        slot.mapped = nullptr;
+    }
+    
+    if (!slot.pbo) {
+        GLsizeiptr size = static_cast<GLsizeiptr>(width) * height * 4;
+        glGenBuffers(1, &slot.pbo);
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.pbo);
+#ifndef __APPLE__
+        if (GLEW_ARB_buffer_storage) {
+            // Map once for the buffer's lifetime; captures then read it in place
+            const GLbitfield flags = GL_MAP_READ_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT;
+            glBufferStorage(GL_PIXEL_PACK_BUFFER, size, nullptr, flags);
+            slot.mapped = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, size, flags);
+        }
+#endif
+        if (!slot.mapped) {
+            glBufferData(GL_PIXEL_PACK_BUFFER, size, nullptr, GL_STREAM_READ);
+        }
+        slot.width = width;
+        slot.height = height;
+    } else {
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.pbo);
+    }
+    
+    // With a pack buffer bound glReadPixels returns immediately; the copy
+    // lands in the PBO once the GPU reaches it
+    glReadPixels(0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, nullptr);
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+    
+    if (slot.fence) {
+        glDeleteSync(static_cast<GLsync>(slot.fence));
+    }
+    slot.fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+    
+    captureStagingLatest_ = captureStagingNext_;
+    captureStagingNext_ = (captureStagingNext_ + 1) % kCaptureStagingCount;
+}
+
+void OpenGLRenderer::makeContextCurrent() {
+    GLFWwindow* window = static_cast<GLFWwindow*>(window_);
+    if (window && glfwGetCurrentContext() != window) {
+        glfwMakeContextCurrent(window);
+    }
+}
+
+void OpenGLRenderer::releaseCaptureStaging() {
+    for (auto& slot : captureStaging_) {
+        if (slot.fence) {
+            glDeleteSync(static_cast<GLsync>(slot.fence));
+        }
+        if (slot.mapped) {
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, slot.pbo);
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER);
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+        }
+        if (slot.pbo) {
+            glDeleteBuffers(1, &slot.pbo);
+        }
+        slot = CaptureStagingSlot();
+    }
+    captureStagingNext_ = 0;
+    captureStagingLatest_ = -1;
+}
+
 bool OpenGLRenderer::saveCapture(const char* filename) {
     std::vector<uint8_t> pixelData;
     int width, height;
@@ -931,50 +1208,38 @@ bool OpenGLRenderer::saveCapture(const char* filename) {
     return false;
 }
 
-void OpenGLRenderer::multiplyMatrices(const float* a, const float* b, float* result) {
-    // Column-major matrix multiplication: C = A * B
-    // result[col][row] = sum(a[k][row] * b[col][k])
-    for (int col = 0; col < 4; col++) {
-        for (int row = 0; row < 4; row++) {
-            result[col * 4 + row] = 0;
-            for (int k = 0; k < 4; k++) {
-                result[col * 4 + row] += a[k * 4 + row] * b[col * 4 + k];
-            }
-        }
+void OpenGLRenderer::setAsyncCaptureEnabled(bool enabled) {
+    asyncCaptureEnabled_ = enabled;
+    if (!enabled && initialized_) {
+        makeContextCurrent();
+        releaseCaptureStaging();
     }
 }
 
-void OpenGLRenderer::createTransformMatrix(float x, float y, float z, 
-                                          float pitch, float yaw, float roll,
-                                          float sx, float sy, float sz,
-                                          float* matrix) {
-    // Create transformation matrix (simplified)
-    float cosPitch = std::cos(pitch);
-    float sinPitch = std::sin(pitch);
-    float cosYaw = std::cos(yaw);
-    float sinYaw = std::sin(yaw);
-    float cosRoll = std::cos(roll);
-    float sinRoll = std::sin(roll);
-    
-    matrix[0] = sx * (cosYaw * cosRoll);
-    matrix[1] = sx * (cosYaw * sinRoll);
-    matrix[2] = sx * (-sinYaw);
-    matrix[3] = 0;
-    
-    matrix[4] = sy * (sinPitch * sinYaw * cosRoll - cosPitch * sinRoll);
-    matrix[5] = sy * (sinPitch * sinYaw * sinRoll + cosPitch * cosRoll);
-    matrix[6] = sy * (sinPitch * cosYaw);
-    matrix[7] = 0;
-    
-    matrix[8] = sz * (cosPitch * sinYaw * cosRoll + sinPitch * sinRoll);
-    matrix[9] = sz * (cosPitch * sinYaw * sinRoll - sinPitch * cosRoll);
-    matrix[10] = sz * (cosPitch * cosYaw);
-    matrix[11] = 0;
-    
-    matrix[12] = x;
-    matrix[13] = y;
-    matrix[14] = z;
-    matrix[15] = 1;
+bool OpenGLRenderer::isAsyncCaptureEnabled() const {
+    return asyncCaptureEnabled_;
+}
+
+void OpenGLRenderer::setContentScale(float scale) {
+    // Applied when the window is created; only native and 1x are available
+    contentScale_ = scale > 0.0f ? scale : 0.0f;
+}
+
+float OpenGLRenderer::getContentScale() const {
+    return contentScale_;
+}
+
+void OpenGLRenderer::setVSyncEnabled(bool enabled) {
+    vsyncEnabled_ = enabled;
+    if (initialized_) {
+        // The swap interval applies to the current context
+        makeContextCurrent();
+        glfwSwapInterval(enabled ? 1 : 0);
+    }
+}
+
+bool OpenGLRenderer::isVSyncEnabled() const {
+    return vsyncEnabled_;
 }
 
 double OpenGLRenderer::getFPS() const {
@@ -985,4 +1250,12 @@ int OpenGLRenderer::getFrameCount() const {
     return totalFrameCount_;
 }
 
+void OpenGLRenderer::resetFPSCounters() {
+    startTime_ = glfwGetTime();
+    lastFPSUpdateTime_ = startTime_;
+    frameCount_ = 0;
+    totalFrameCount_ = 0;
+    currentFPS_ = 0.0;
+}
+
 } // namespace CyberUI
@@ -9,6 +9,7 @@ namespace CyberUI {
 
 class Frame3D;
 class Image;
+class OpenGLCompiledScene;
 
 class OpenGLRenderer : public Renderer {
 public:
@@ -21,16 +22,26 @@ public:
     void endFrame() override;
     void renderObject(Object2D* object) override;
     void renderScene(SceneRoot* scene) override;
+    std::shared_ptr<CompiledScene> compileScene(std::shared_ptr<SceneRoot> scene) override;
+    void renderCompiled(CompiledScene* compiled) override;
     bool shouldClose() override;
     void pollEvents() override;
+    void waitEvents(double timeoutSeconds) override;
     
     // Capture functionality
     bool captureFrame(std::vector<uint8_t>& pixelData, int& width, int& height) override;
     bool saveCapture(const char* filename) override;
+    void setAsyncCaptureEnabled(bool enabled) override;
+    bool isAsyncCaptureEnabled() const override;
+    void setContentScale(float scale) override;
+    float getContentScale() const override;
+    void setVSyncEnabled(bool enabled) override;
+    bool isVSyncEnabled() const override;
     
     // FPS measurement
     double getFPS() const override;
     int getFrameCount() const override;
+    void resetFPSCounters() override;
 
 private:
     void setupShaders();
@@ -39,27 +50,44 @@ private:
     void renderFrame3D(Frame3D* frame, const float* viewProjMatrix);
     void renderObject2D(Object2D* object, const float* mvpMatrix);
     
+    // Compiled scenes: record the draw list and tag it for vertex upload
+    void recordScene(OpenGLCompiledScene& compiled);
+    
     unsigned int getOrCreateTexture(Image* image);
     unsigned int getOrCreateRenderTarget(Frame3D* frame);
     void renderFrame3DToTexture(Frame3D* frame);
+    // Off-screen pass of renderFrame3DToTexture(), also used by renderCompiled():
+    // begin redirects drawing into the frame's render target (false on failure)
+    bool beginFrame3DPass(Frame3D* frame);
+    void endFrame3DPass();
     void renderTexturedQuad(unsigned int texture, float width, float height, const float* mvpMatrix);
     
     // Scissor rect management for clipping
     void pushScissorRect(float x, float y, float width, float height, const float* mvpMatrix);
     void popScissorRect();
     void transformPointToScreen(float x, float y, const float* mvpMatrix, float& screenX, float& screenY);
+    // True if the (0, 0, width, height) rect under mvpMatrix misses the active scissor rect
+    bool isOutsideScissor(float width, float height, const float* mvpMatrix);
+    
+    // Several renderers can share a process: make this one's context current
+    // before issuing GL or swap-interval calls
+    void makeContextCurrent();
     
-    void multiplyMatrices(const float* a, const float* b, float* result);
-    void createTransformMatrix(float x, float y, float z, 
-                              float pitch, float yaw, float roll,
-                              float sx, float sy, float sz,
-                              float* matrix);
+    // Async capture staging ring
+    void encodeCaptureStagingCopy();
+    void releaseCaptureStaging();
     
     void* window_;
     unsigned int shaderProgram_;
     unsigned int vao_;
     unsigned int vbo_;
     
+    // Vertex buffer for compiled scenes; re-uploaded only when a different
+    // recording (by uploadId) is replayed
+    unsigned int compiledVao_;
+    unsigned int compiledVbo_;
+    uint64_t compiledUploadId_;
+    
     bool initialized_;
     bool shouldClose_;
     int windowWidth_;
@@ -83,6 +111,31 @@ private:
     int currentRenderTargetWidth_;
     int currentRenderTargetHeight_;
     
+    // Off-screen Frame3D pass in progress: its framebuffer and the saved dimensions
+    unsigned int offscreenFbo_;
+    int savedRenderTargetWidth_;
+    int savedRenderTargetHeight_;
+    
+    // Async capture: the back buffer is read into a pixel pack buffer (PBO)
+    // at the end of each frame and mapped later by captureFrame()
+    bool asyncCaptureEnabled_;
+    static const int kCaptureStagingCount = 3;
+    struct CaptureStagingSlot {
+        unsigned int pbo;     // GL_PIXEL_PACK_BUFFER holding RGBA pixels (bottom-up)
+        void* fence;          // GLsync signalled when the readback has landed
+        void* mapped;         // Persistent mapping (ARB_buffer_storage), else null
+        int width, height;
+    };
+    CaptureStagingSlot captureStaging_[kCaptureStagingCount];
+    int captureStagingNext_;    // Slot written by the next endFrame()
+    int captureStagingLatest_;  // Slot holding the most recent frame (-1 if none)
+    
+    // Requested framebuffer scale (0 = native, see Renderer::setContentScale)
+    float contentScale_;
+    
+    // Swap interval 1 vs 0 (see Renderer::setVSyncEnabled)
+    bool vsyncEnabled_;
+    
     // White texture for non-textured rectangles
     unsigned int whiteTexture_;
     
@@ -0,0 +1,312 @@
+#include "RecordedScene.h"
+#include "Shape2D.h"
+#include "Text.h"
+#include "../core/SceneRoot.h"
+#include "../core/Frame3D.h"
+#include "../core/Frame2D.h"
+#include "../core/Camera.h"
+
+#include <algorithm>
+#include <cmath>
+
+namespace CyberUI {
+
+// Append a quad covering (x0, y0)-(x1, y1); texcoords span the whole rectangle (flip V)
+static void appendQuad(Vertex* vertices, int& count, float x0, float y0, float x1, float y1,
+                       const float* color, float width, float height) {
+    float u0 = width > 0.0f ? x0 / width : 0.0f;
+    float u1 = width > 0.0f ? x1 / width : 0.0f;
+    float v0 = height > 0.0f ? 1.0f - y0 / height : 0.0f;
+    float v1 = height > 0.0f ? 1.0f - y1 / height : 0.0f;
+    const float corners[6][4] = {
+        {x0, y0, u0, v0},  // Top-left
+        {x1, y0, u1, v0},  // Top-right
+        {x0, y1, u0, v1},  // Bottom-left
+        {x1, y0, u1, v0},  // Top-right
+        {x1, y1, u1, v1},  // Bottom-right
+        {x0, y1, u0, v1},  // Bottom-left
+    };
+    for (const auto& c : corners) {
+        vertices[count++] = {{c[0], c[1]}, {color[0], color[1], color[2], color[3]}, {c[2], c[3]}};
+    }
+}
+
+int buildRectangleVertices(Rectangle* rect, Vertex* vertices) {
+    float width, height;
+    rect->getSize(width, height);
+    
+    float color[4];
+    rect->getColor(color[0], color[1], color[2], color[3]);
+    
+    int count = 0;
+    BorderedRectangle* bordered = dynamic_cast<BorderedRectangle*>(rect);
+    float bw = bordered ? std::fmin(bordered->getBorderWidth(), std::fmin(width, height) * 0.5f) : 0.0f;
+    if (bw <= 0.0f) {
+        appendQuad(vertices, count, 0.0f, 0.0f, width, height, color, width, height);
+        return count;
+    }
+    
+    float borderColor[4];
+    bordered->getBorderColor(borderColor[0], borderColor[1], borderColor[2], borderColor[3]);
+    
+    // Fill (inside the border)
+    if (width - bw > bw && height - bw > bw) {
+        appendQuad(vertices, count, bw, bw, width - bw, height - bw, color, width, height);
+    }
+    
+    // Top and bottom strips span the full width, left and right fit between them
+    appendQuad(vertices, count, 0.0f, 0.0f, width, bw, borderColor, width, height);
+    appendQuad(vertices, count, 0.0f, height - bw, width, height, borderColor, width, height);
+    appendQuad(vertices, count, 0.0f, bw, bw, height - bw, borderColor, width, height);
+    appendQuad(vertices, count, width - bw, bw, width, height - bw, borderColor, width, height);
+    return count;
+}
+
+void multiplyMatrices(const float* a, const float* b, float* result) {
+    // Column-major matrix multiplication: C = A * B
+    // result[col][row] = sum(a[k][row] * b[col][k])
+    for (int col = 0; col < 4; col++) {
+        for (int row = 0; row < 4; row++) {
+            result[col * 4 + row] = 0;
+            for (int k = 0; k < 4; k++) {
+                result[col * 4 + row] += a[k * 4 + row] * b[col * 4 + k];
+            }
+        }
+    }
+}
+
+void createTransformMatrix(float x, float y, float z,
+                           float pitch, float yaw, float roll,
+                           float scaleX, float scaleY, float scaleZ,
+                           float* matrix) {
+    float cp = std::cos(pitch);
+    float sp = std::sin(pitch);
+    float cy = std::cos(yaw);
+    float sy = std::sin(yaw);
+    float cr = std::cos(roll);
+    float sr = std::sin(roll);
+    
+    // Combined rotation and scale matrix (column-major)
+    matrix[0] = scaleX * (cy * cr);
+    matrix[1] = scaleX * (cy * sr);
+    matrix[2] = scaleX * (-sy);
+    matrix[3] = 0;
+    
+    matrix[4] = scaleY * (sp * sy * cr - cp * sr);
+    matrix[5] = scaleY * (sp * sy * sr + cp * cr);
+    matrix[6] = scaleY * (sp * cy);
+    matrix[7] = 0;
+    
+    matrix[8] = scaleZ * (cp * sy * cr + sp * sr);
+    matrix[9] = scaleZ * (cp * sy * sr - sp * cr);
+    matrix[10] = scaleZ * (cp * cy);
+    matrix[11] = 0;
+    
+    matrix[12] = x;
+    matrix[13] = y;
+    matrix[14] = z;
+    matrix[15] = 1;
+}
+
+void viewProjectionMatrix(const Camera& camera, float* result) {
+    float viewMatrix[16];
+    float projMatrix[16];
+    camera.getViewMatrix(viewMatrix);
+    camera.getProjectionMatrix(projMatrix);
+    multiplyMatrices(projMatrix, viewMatrix, result);
+}
+
+void frame3DMatrix(const Frame3D& frame, const float* viewProjMatrix, float* result) {
+    float pos[3], rot[3], scale[3];
+    frame.getPosition(pos[0], pos[1], pos[2]);
+    frame.getRotation(rot[0], rot[1], rot[2]);
+    frame.getScale(scale[0], scale[1], scale[2]);
+    
+    float modelMatrix[16];
+    createTransformMatrix(pos[0], pos[1], pos[2],
+                          rot[0], rot[1], rot[2],
+                          scale[0], scale[1], scale[2],
+                          modelMatrix);
+    multiplyMatrices(viewProjMatrix, modelMatrix, result);
+}
+
+void object2DMatrix(const Object2D& object, const float* parentMatrix, float* result) {
+    float x, y;
+    object.getPosition(x, y);
+    
+    float translationMatrix[16] = {
+        1, 0, 0, 0,
+        0, 1, 0, 0,
+        0, 0, 1, 0,
+        x, y, 0, 1
+    };
+    multiplyMatrices(parentMatrix, translationMatrix, result);
+}
+
+void frame2DContentMatrix(const Frame2D& frame, const float* frameMatrix, float* result) {
+    float width, height;
+    frame.getSize(width, height);
+    
+    // Flip Y (Y+ down for 2D UI) and move the origin to the top-left corner
+    float offsetMatrix[16] = {
+        1, 0, 0, 0,
+        0, -1, 0, 0,
+        0, 0, 1, 0,
+        0, height, 0, 1
+    };
+    multiplyMatrices(frameMatrix, offsetMatrix, result);
+}
+
+void offscreenProjectionMatrix(int width, int height, float* result) {
+    // Pixels to NDC with Y+ down, origin at the render target's top-left corner
+    float orthoMatrix[16] = {
+        2.0f / width, 0, 0, 0,
+        0, -2.0f / height, 0, 0,
+        0, 0, 1, 0,
+        -1, 1, 0, 1
+    };
+    std::copy(orthoMatrix, orthoMatrix + 16, result);
+}
+
+bool RecordedScene::isStale() const {
+    return !scene || version != scene->getVersion();
+}
+
+void RecordedScene::record() {
+    ops.clear();
+    vertices.clear();
+    if (!scene) return;
+    version = scene->getVersion();
+    
+    auto camera = scene->getCamera();
+    if (!camera) return;
+    
+    float viewProjMatrix[16];
+    viewProjectionMatrix(*camera, viewProjMatrix);
+    
+    for (const auto& frame : scene->getFrames()) {
+        if (!frame || !frame->isVisible()) continue;
+        
+        float mvpMatrix[16];
+        frame3DMatrix(*frame, viewProjMatrix, mvpMatrix);
+        
+        if (!frame->isOffscreenRenderingEnabled()) {
+            for (const auto& child : frame->getChildren()) {
+                recordObject2D(child, mvpMatrix);
+            }
+            continue;
+        }
+        
+        // Off-screen: children are recorded into the frame's own pass, then
+        // its render target is drawn as a quad placed by the frame transform
+        Op begin;
+        begin.type = OpType::BeginFrame3D;
+        begin.frame = frame;
+        ops.push_back(begin);
+        
+        int rtWidth, rtHeight;
+        frame->getRenderTargetSize(rtWidth, rtHeight);
+        float orthoMatrix[16];
+        offscreenProjectionMatrix(rtWidth, rtHeight, orthoMatrix);
+        
+        for (const auto& child : frame->getChildren()) {
+            recordObject2D(child, orthoMatrix);
+        }
+        
+        Op end;
+        end.type = OpType::EndFrame3D;
+        std::copy(mvpMatrix, mvpMatrix + 16, end.mvp);
+        end.frame = frame;
+        ops.push_back(end);
+    }
+}
+
+int RecordedScene::getRectangleDrawCount() const {
+    return static_cast<int>(std::count_if(ops.begin(), ops.end(), [](const Op& op) {
+        return op.type == OpType::DrawRectangle;
+    }));
+}
+
+void RecordedScene::recordObject2D(const std::shared_ptr<Object2D>& object, const float* mvpMatrix) {
+    if (!object || !object->isVisible()) return;
+    
+    float objectMVP[16];
+    object2DMatrix(*object, mvpMatrix, objectMVP);
+    
+    Frame2D* frame2d = dynamic_cast<Frame2D*>(object.get());
+    if (frame2d) {
+        float frame2dMVP[16];
+        frame2DContentMatrix(*frame2d, objectMVP, frame2dMVP);
+        
+        bool hasClipping = frame2d->isClippingEnabled();
+        if (hasClipping) {
+            Op op;
+            op.type = OpType::PushScissor;
+            std::copy(frame2dMVP, frame2dMVP + 16, op.mvp);
+            frame2d->getSize(op.clipWidth, op.clipHeight);
+            ops.push_back(op);
+        }
+        
+        for (const auto& child : frame2d->getChildren()) {
+            recordObject2D(child, frame2dMVP);
+        }
+        
+        if (hasClipping) {
+            Op op;
+            op.type = OpType::PopScissor;
+            ops.push_back(op);
+        }
+        
+        return;
+    }
+    
+    Rectangle* rect = dynamic_cast<Rectangle*>(object.get());
+    if (rect) {
+        Vertex rectVertices[kMaxRectangleVertices];
+        int vertexCount = buildRectangleVertices(rect, rectVertices);
+        
+        // Bake the position into the vertices so sibling rectangles share the
+        // parent MVP and can be merged into a single draw
+        float x, y;
+        rect->getPosition(x, y);
+        for (int i = 0; i < vertexCount; i++) {
+            rectVertices[i].position[0] += x;
+            rectVertices[i].position[1] += y;
+        }
+        
+        std::shared_ptr<Image> image = rect->hasImage() ? rect->getImage() : nullptr;
+        int vertexStart = static_cast<int>(vertices.size());
+        vertices.insert(vertices.end(), rectVertices, rectVertices + vertexCount);
+        
+        // Extend the previous draw when it uses the same matrix and texture
+        Op* last = ops.empty() ? nullptr : &ops.back();
+        if (last && last->type == OpType::DrawRectangle &&
+            last->image == image &&
+            last->vertexStart + last->vertexCount == vertexStart &&
+            std::equal(mvpMatrix, mvpMatrix + 16, last->mvp)) {
+            last->vertexCount += vertexCount;
+        } else {
+            Op op;
+            op.type = OpType::DrawRectangle;
+            std::copy(mvpMatrix, mvpMatrix + 16, op.mvp);
+            op.vertexStart = vertexStart;
+            op.vertexCount = vertexCount;
+            op.image = image;
+            ops.push_back(op);
+        }
+    }
+    
+    if (dynamic_cast<Text*>(object.get())) {
+        Op op;
+        op.type = OpType::DrawText;
+        std::copy(objectMVP, objectMVP + 16, op.mvp);
+        op.text = object;
+        ops.push_back(op);
+    }
+    
+    for (const auto& child : object->getChildren()) {
+        recordObject2D(child, objectMVP);
+    }
+}
+
+} // namespace CyberUI
@@ -0,0 +1,89 @@
+#pragma once
+
+#include "Renderer.h"
+#include <memory>
+#include <vector>
+#include <cstdint>
+
+namespace CyberUI {
+
+class Camera;
+class Frame2D;
+class Frame3D;
+class Image;
+class Object2D;
+class Rectangle;
+class SceneRoot;
+
+// Vertex layout of the rectangle pipeline in both backends
+struct Vertex {
+    float position[2];
+    float color[4];
+    float texCoord[2];
+};
+
+// Max vertices emitted for a rectangle (fill + 4 border strips, 6 vertices each)
+constexpr int kMaxRectangleVertices = 30;
+
+// Build the triangle list for a rectangle with top-left origin. A BorderedRectangle
+// emits its fill and border ring as non-overlapping quads so it stays a single draw.
+int buildRectangleVertices(Rectangle* rect, Vertex* vertices);
+
+// 4x4 column-major matrix helpers
+void multiplyMatrices(const float* a, const float* b, float* result);
+void createTransformMatrix(float x, float y, float z,
+                           float pitch, float yaw, float roll,
+                           float scaleX, float scaleY, float scaleZ,
+                           float* matrix);
+
+// Scene transforms, shared by the immediate (renderScene) and recorded
+// (compileScene) paths of every backend
+void viewProjectionMatrix(const Camera& camera, float* result);
+void frame3DMatrix(const Frame3D& frame, const float* viewProjMatrix, float* result);
+// Object2D position is its top-left corner in the parent's coordinates
+void object2DMatrix(const Object2D& object, const float* parentMatrix, float* result);
+// Coordinate system for a Frame2D's children: origin at its top-left corner, Y+ down
+void frame2DContentMatrix(const Frame2D& frame, const float* frameMatrix, float* result);
+// Projection of an off-screen Frame3D's children onto its width x height render target
+void offscreenProjectionMatrix(int width, int height, float* result);
+
+// Backend-independent part of a compiled scene: the scene flattened into a draw
+// list with every transform resolved and every rectangle's vertices collected.
+// Backends derive from it to add GPU vertex storage and replay the ops.
+class RecordedScene : public CompiledScene {
+public:
+    // An off-screen Frame3D is recorded as BeginFrame3D, its children's ops
+    // (drawn into its render target), then EndFrame3D (its textured quad)
+    enum class OpType { DrawRectangle, DrawText, PushScissor, PopScissor, BeginFrame3D, EndFrame3D };
+    
+    struct Op {
+        OpType type = OpType::DrawRectangle;
+        float mvp[16] = {};
+        int vertexStart = 0;             // DrawRectangle: range in vertices
+        int vertexCount = 0;
+        float clipWidth = 0.0f;          // PushScissor: clip rect is (0, 0, clipWidth, clipHeight)
+        float clipHeight = 0.0f;
+        std::shared_ptr<Image> image;    // DrawRectangle: texture, null for untextured
+        std::shared_ptr<Object2D> text;  // DrawText
+        std::shared_ptr<Frame3D> frame;  // BeginFrame3D / EndFrame3D (mvp places the quad)
+        void* renderedTarget = nullptr;  // BeginFrame3D: render target this recording last filled
+    };
+    
+    std::shared_ptr<SceneRoot> scene;
+    uint64_t version = 0;
+    std::vector<Op> ops;
+    std::vector<Vertex> vertices;
+    
+    // True if the scene changed since it was last recorded
+    bool isStale() const;
+    
+    // Walk the scene and rebuild ops and vertices
+    void record();
+    
+    int getRectangleDrawCount() const override;
+
+private:
+    void recordObject2D(const std::shared_ptr<Object2D>& object, const float* mvpMatrix);
+};
+
+} // namespace CyberUI
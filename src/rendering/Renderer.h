@@ -3,12 +3,23 @@
 #include <memory>
 #include <vector>
 #include <cstdint>
+#include <string>
 
 namespace CyberUI {
 
 class Object2D;
 class SceneRoot;
 
+// A scene's draw list recorded by Renderer::compileScene(). Opaque; each backend
+// keeps its own recorded ops and GPU vertex data.
+class CompiledScene {
+public:
+    virtual ~CompiledScene() = default;
+    
+    // Rectangle draw calls one replay issues (merged sibling runs count once)
+    virtual int getRectangleDrawCount() const { return 0; }
+};
+
 // Abstract renderer interface
 class Renderer {
 public:
@@ -25,20 +36,58 @@ public:
     // New: render entire scene with camera
     virtual void renderScene(SceneRoot* scene) = 0;
     
+    // Retained rendering for static scenes: compileScene() walks the scene once,
+    // uploads all rectangle vertices into one GPU buffer and records the draws with
+    // their transforms (an off-screen Frame3D's draws go to its own render target pass);
+    // renderCompiled() replays that list without walking the scene, and redraws a
+    // render target only when it no longer holds the recording's output.
+    // The recording is a snapshot: after changing the scene (or its camera) call
+    // SceneRoot::markDirty() and the next renderCompiled() records it again.
+    virtual std::shared_ptr<CompiledScene> compileScene(std::shared_ptr<SceneRoot> scene) = 0;
+    virtual void renderCompiled(CompiledScene* compiled) = 0;
+    
     virtual bool shouldClose() = 0;
     virtual void pollEvents() = 0;
+    // Block until an event arrives or timeoutSeconds pass, then handle pending events
+    // like pollEvents(). Lets static content idle instead of redrawing every frame.
+    virtual void waitEvents(double timeoutSeconds) = 0;
     
     // Capture functionality for debugging and testing
     virtual bool captureFrame(std::vector<uint8_t>& pixelData, int& width, int& height) = 0;
     virtual bool saveCapture(const char* filename) = 0;
     
+    // Async capture: when enabled, every frame is copied into a staging ring as part
+    // of its own command stream, so captureFrame() only waits if that copy is unfinished
+    virtual void setAsyncCaptureEnabled(bool enabled) = 0;
+    virtual bool isAsyncCaptureEnabled() const = 0;
+    
+    // Drawable pixels per window point; 0 (default) uses the display's native scale.
+    // 1.0 renders and captures at window size on Retina displays, e.g. for correctness
+    // tests that don't need full resolution. Set it before initialize(): OpenGL can
+    // only choose native or 1x when its window is created.
+    virtual void setContentScale(float scale) = 0;
+    virtual float getContentScale() const = 0;
+    
+    // V-Sync (on by default): endFrame() waits for the display refresh. Turning it
+    // off lets capture-only scripts render frames back to back
+    virtual void setVSyncEnabled(bool enabled) = 0;
+    virtual bool isVSyncEnabled() const = 0;
+    
     // FPS measurement
     virtual double getFPS() const = 0;
     virtual int getFrameCount() const = 0;
+    
+    // Restart FPS and frame counting from now, e.g. between measurements
+    // on a renderer that stays initialized
+    virtual void resetFPSCounters() = 0;
 };
 
 // Factory functions
 std::unique_ptr<Renderer> createMetalRenderer();
 std::unique_ptr<Renderer> createOpenGLRenderer();
 
+// Backends compiled into this build that can run on this machine ("metal", "opengl").
+// Cheap to call: does not create a window or rendering context.
+std::vector<std::string> availableBackends();
+
 } // namespace CyberUI
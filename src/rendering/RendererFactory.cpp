@@ -22,4 +22,18 @@ std::unique_ptr<Renderer> createOpenGLRenderer() {
 }
 #endif
 
+std::vector<std::string> availableBackends() {
+    std::vector<std::string> backends;
+#ifdef USE_METAL_BACKEND
+    if (MetalRenderer::isSupported()) {
+        backends.push_back("metal");
+    }
+#endif
+#ifdef USE_OPENGL_BACKEND
+    // GLFW is linked in; context creation is only checked by initialize()
+    backends.push_back("opengl");
+#endif
+    return backends;
+}
+
 } // namespace CyberUI
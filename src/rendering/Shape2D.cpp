@@ -73,4 +73,29 @@ void Rectangle::render() {
     }
 }
 
+// BorderedRectangle implementation
+BorderedRectangle::BorderedRectangle(float width, float height, float borderWidth)
+    : Rectangle(width, height), borderWidth_(borderWidth) {
+    // Default white border
+    borderColor_[0] = borderColor_[1] = borderColor_[2] = borderColor_[3] = 1.0f;
+}
+
+void BorderedRectangle::setBorderWidth(float borderWidth) {
+    borderWidth_ = borderWidth;
+}
+
+void BorderedRectangle::setBorderColor(float r, float g, float b, float a) {
+    borderColor_[0] = r;
+    borderColor_[1] = g;
+    borderColor_[2] = b;
+    borderColor_[3] = a;
+}
+
+void BorderedRectangle::getBorderColor(float& r, float& g, float& b, float& a) const {
+    r = borderColor_[0];
+    g = borderColor_[1];
+    b = borderColor_[2];
+    a = borderColor_[3];
+}
+
 } // namespace CyberUI
@@ -45,4 +45,22 @@ private:
     float height_;
 };
 
+// Rectangle with a solid border, drawn as a single mesh (fill + border ring)
+class BorderedRectangle : public Rectangle {
+public:
+    BorderedRectangle(float width, float height, float borderWidth);
+    virtual ~BorderedRectangle() = default;
+
+    void setBorderWidth(float borderWidth);
+    float getBorderWidth() const { return borderWidth_; }
+
+    // Border color (RGBA); the fill uses the Shape2D color
+    void setBorderColor(float r, float g, float b, float a = 1.0f);
+    void getBorderColor(float& r, float& g, float& b, float& a) const;
+
+private:
+    float borderWidth_;
+    float borderColor_[4];
+};
+
 } // namespace CyberUI
@@ -8,27 +8,10 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
-import os
+from image_cache import load_image_with_pillow
+from font_cache import get_font
 import numpy as np
 
-# Import the clipping demo setup (without the render loop)
-def load_image_with_pillow(filepath):
-    if not os.path.exists(filepath):
-        return None
-    try:
-        pil_img = PILImage.open(filepath)
-        if pil_img.mode != 'RGBA':
-            pil_img = pil_img.convert('RGBA')
-        img_bytes = pil_img.tobytes()
-        ui_img = ui.Image()
-        width, height = pil_img.size
-        if ui_img.load_from_data(img_bytes, width, height, 4):
-            return ui_img
-    except:
-        pass
-    return None
-
 def main():
     print("="*70)
     print("CLIPPING DEMO - SINGLE FRAME CAPTURE & VERIFICATION")
@@ -55,20 +38,13 @@ def main():
     checker_img = load_image_with_pillow(os.path.join(data_dir, "checkerboard.png"))
     icon_img = load_image_with_pillow(os.path.join(data_dir, "icon.png"))
     
-    font = ui.Font()
-    font.load_from_file("/System/Library/Fonts/Helvetica.ttc", 20.0)
-    title_font = ui.Font()
-    title_font.load_from_file("/System/Library/Fonts/Helvetica.ttc", 28.0)
-    title_font.set_bold(True)
+    title_font = get_font("/System/Library/Fonts/Helvetica.ttc", 28.0, bold=True)
     
     # Build scene exactly like clipping demo
     frame3d = ui.Frame3D(800, 600)
     scene.add_frame3d(frame3d)
     
-    clip_panel = ui.Frame2D(500.0, 600.0)
-    clip_panel.set_position(150.0, 50.0)
-    clip_panel
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(500.0, 600.0, position=(150.0, 50.0), clipping_enabled=True)
     
     # Background
     bg = ui.Rectangle(500.0, 600.0)
@@ -127,22 +103,24 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
+    # Capture straight from the drawable for analysis
+    pixels = renderer.capture_to_numpy()
+    success = False
+    
+    # Save an on-disk snapshot for inspection
     output_dir = os.path.join(script_dir, "output")
     os.makedirs(output_dir, exist_ok=True)
     output_file = os.path.join(output_dir, "clipping_demo_snapshot.png")
-    
     if renderer.save_capture(output_file):
         print(f"✓ Saved snapshot to: {output_file}\n")
-        
-        # Analyze
-        img = PILImage.open(output_file)
-        pixels = np.array(img)
+    
+    if pixels is not None:
+        height, width = pixels.shape[:2]
         
         print("="*70)
         print("IMAGE ANALYSIS")
         print("="*70)
-        print(f"Size: {img.size}")
+        print(f"Size: {(width, height)}")
         print(f"Unique colors: {len(np.unique(pixels.reshape(-1, 4), axis=0))}")
         
         bg_color = np.array([26, 26, 26])
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+PNG output for captured BGRA frames.
+
+capture_frame() returns BGRA bytes. save_bgra_png() wraps them for Pillow
+without a copy and writes with fast deflate: the PNGs are inspection
+artifacts, so encode time matters more than file size.
+"""
+
+from PIL import Image as PILImage
+
+
+def save_bgra_png(data, width, height, filename):
+    """Write a BGRA capture to a PNG file (wraps the buffer without copying)."""
+    image = PILImage.frombuffer('RGBA', (width, height), data, 'raw', 'BGRA', 0, 1)
+    image.save(filename, optimize=False, compress_level=1)
@@ -52,6 +52,21 @@ def compare_images(img1_path, img2_path, threshold=0):
         }
     
     width, height = size1
+    total_pixels = width * height
+    
+    # Fast path: byte-identical captures need no per-pixel stats
+    if threshold == 0 and data1 == data2:
+        return {
+            'identical': True,
+            'size_match': True,
+            'dimensions': size1,
+            'total_pixels': total_pixels,
+            'different_pixels': 0,
+            'diff_percentage': 0.0,
+            'max_difference': 0,
+            'avg_difference': 0.0,
+            'threshold': threshold
+        }
     
     # Convert to lists for comparison
     pixels1 = list(data1)
@@ -65,7 +80,6 @@ def compare_images(img1_path, img2_path, threshold=0):
         }
     
     # Compare pixels
-    total_pixels = width * height
     channels = len(pixels1) // total_pixels
     different_pixels = 0
     max_diff = 0
@@ -8,20 +8,24 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
+from debug_session import get_renderer, new_scene
 import numpy as np
 
 
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+
 def test_square(name, use_frame2d=False):
     """Test if a square renders as a square."""
     print(f"\n{name}")
     print("=" * 70)
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, f"Aspect Test - {name}"):
+    renderer = get_renderer(800, 700, f"Aspect Test - {name}")
+    if renderer is None:
         return None
     
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0, 0, 800)
     camera.set_perspective(1.0472, 1600.0/1400.0, 0.1, 2000.0)
@@ -32,9 +36,7 @@ def test_square(name, use_frame2d=False):
     
     if use_frame2d:
         # Test with Frame2D - use EXACT same parameters as debug_frame2d_size.py
-        frame2d = ui.Frame2D(500, 600)
-        frame2d.set_position(150, 50)  # Same as original test
-        frame2d      # Same as original test
+        frame2d = ui.Frame2D(500, 600, position=(150, 50))  # Same as original test
         
         # Fill entire Frame2D with rectangle
         rect = ui.Rectangle(500, 600)
@@ -52,24 +54,24 @@ def test_square(name, use_frame2d=False):
         frame3d.add_child(rect)
         print("  500x500 square directly in Frame3D")
     
-    # Render
-    for i in range(5):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        renderer.begin_frame()
+    # Render a single frame (static scene, nothing to warm up)
+    renderer.poll_events()
+    if not renderer.should_close() and renderer.begin_frame():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
-    os.makedirs("tests/output", exist_ok=True)
-    filename = f"tests/output/aspect_{name.replace(' ', '_')}.png"
-    renderer.save_capture(filename)
+    # Capture straight into an array (BGRA); the PNG is only written on request
+    pixels = renderer.capture_to_numpy()
+    if pixels is None:
+        print("  ✗ Capture failed")
+        return None
+    
+    if os.environ.get("CYBER_UI_SAVE_CAPTURES"):
+        filename = os.path.join(OUTPUT_DIR, f"aspect_{name.replace(' ', '_')}.png")
+        renderer.save_capture(filename)
     
     # Analyze
-    img = PILImage.open(filename)
-    pixels = np.array(img)
-    red_mask = (pixels[:, :, 0] > 200) & (pixels[:, :, 1] < 50) & (pixels[:, :, 2] < 50)
+    red_mask = (pixels[:, :, 2] > 200) & (pixels[:, :, 1] < 50) & (pixels[:, :, 0] < 50)
     
     if np.any(red_mask):
         red_rows = np.any(red_mask, axis=1)
@@ -98,11 +100,9 @@ def test_square(name, use_frame2d=False):
             else:
                 print(f"  ✗ Square is STRETCHED horizontally ({aspect_ratio:.2f}x)")
         
-        renderer.shutdown()
         return aspect_ratio
     else:
         print("  ✗ No pixels rendered")
-        renderer.shutdown()
         return None
 
 
@@ -9,79 +9,48 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from debug_session import get_renderer, new_scene, renderer_settings
+import numpy as np
 import time
 
 
-def test_color(renderer, scene, color_name, r, g, b, a, position):
-    """Test a specific color and return the captured result."""
-    # Create new frame for this test
-    frame = ui.Frame3D(800, 600)
-    frame.set_position(0, 0, 0)
-    
-    # Create rectangle with test color
-    rect = ui.Rectangle(200, 200)
-    rect.set_color(r, g, b, a)
-    rect.set_position(position, 0)
-    rect.set_name(color_name)
-    frame.add_child(rect)
-    
-    # Update scene
-    scene.clear()
-    scene.add_frame3d(frame)
-    
-    # Render a few frames
-    for i in range(5):
-        renderer.poll_events()
-        if renderer.should_close():
-            return None
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.02)
-    
-    # Capture
-    data, width, height = renderer.capture_frame()
-    if data is None:
-        return None
-    
-    # Analyze center pixels
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
-    
-    # Calculate screen position
-    center_x = width // 2 + int(position)
-    center_y = height // 2
-    sample_size = 50
-    
-    samples = []
-    for dy in range(-sample_size//2, sample_size//2):
-        for dx in range(-sample_size//2, sample_size//2):
-            px = center_x + dx
-            py = center_y + dy
-            if 0 <= px < width and 0 <= py < height:
-                offset = (py * width + px) * 4
-                b_val = pixels[offset]
-                g_val = pixels[offset + 1]
-                r_val = pixels[offset + 2]
-                a_val = pixels[offset + 3]
-                samples.append((r_val, g_val, b_val, a_val))
-    
-    if not samples:
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Window clear color is 0.1 -> 26 in 8-bit
+BACKGROUND_LEVEL = 26
+
+# Camera setup shared by the scene and the sample positions
+WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
+CAMERA_DISTANCE = 800.0
+FIELD_OF_VIEW = 1.0472  # 60 degrees
+
+# Test rectangles: RECT_SIZE squares with RECT_GAP between them, centered in the frame
+FRAME_WIDTH, FRAME_HEIGHT = 800, 600
+RECT_SIZE = 150
+RECT_GAP = 50
+SAMPLE_SIZE = 40
+
+
+def analyze_region(pixels, center_x, center_y, sample_size):
+    """Average color and red-channel variance of a square BGRA region."""
+    half = sample_size // 2
+    region = pixels[max(0, center_y - half):center_y + half,
+                    max(0, center_x - half):center_x + half]
+    if region.size == 0:
         return None
     
-    avg_r = sum(s[0] for s in samples) / len(samples)
-    avg_g = sum(s[1] for s in samples) / len(samples)
-    avg_b = sum(s[2] for s in samples) / len(samples)
-    avg_a = sum(s[3] for s in samples) / len(samples)
-    
-    min_r = min(s[0] for s in samples)
-    max_r = max(s[0] for s in samples)
+    avg_b, avg_g, avg_r, avg_a = region.reshape(-1, 4).mean(axis=0)
+    variance = int(region[..., 2].max()) - int(region[..., 2].min())
     
-    return {
-        'input': (r, g, b, a),
-        'output': (avg_r, avg_g, avg_b, avg_a),
-        'variance': max_r - min_r
-    }
+    return (avg_r, avg_g, avg_b, avg_a), variance
+
+
+def projected_x(frame_x, capture_width):
+    """Capture column of frame-local x, for the Frame3D quad at the origin facing the camera."""
+    world_x = frame_x - FRAME_WIDTH / 2
+    half_visible = CAMERA_DISTANCE * np.tan(FIELD_OF_VIEW / 2) * WINDOW_WIDTH / WINDOW_HEIGHT
+    return int(round(capture_width / 2 * (1 + world_x / half_visible)))
 
 
 def main():
@@ -89,79 +58,123 @@ def main():
     print("=" * 70)
     
     # Create renderer
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 600, "Color Debug Test"):
+    renderer = get_renderer(WINDOW_WIDTH, WINDOW_HEIGHT, "Color Debug Test")
+    if renderer is None:
         print("Failed to initialize renderer")
         return 1
     
+    return check_colors(renderer)
+
+
+def check_colors(renderer):
+    """Render each test color and report the captured values."""
     # Create scene
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = ui.Camera()
-    camera.set_position(0, 0, 5)
+    camera.set_position(0, 0, CAMERA_DISTANCE)
+    camera.set_perspective(FIELD_OF_VIEW, WINDOW_WIDTH / WINDOW_HEIGHT, 0.1, 2000.0)
     scene.set_camera(camera)
     
-    # Test cases: (name, r, g, b, a, x_position)
+    # Test cases: (name, r, g, b, a)
     tests = [
-        ("White_A1.0", 1.0, 1.0, 1.0, 1.0, 0),
-        ("White_A0.5", 1.0, 1.0, 1.0, 0.5, 0),
-        ("Gray_A1.0", 0.5, 0.5, 0.5, 1.0, 0),
+        ("White_A1.0", 1.0, 1.0, 1.0, 1.0),
+        ("White_A0.5", 1.0, 1.0, 1.0, 0.5),
+        ("Gray_A1.0", 0.5, 0.5, 0.5, 1.0),
     ]
     
+    # Place every test rectangle in one frame, apart from each other, so a
+    # single render + capture covers all cases. Each is sampled at its center;
+    # they sit on the frame's vertical center line, so only x needs projecting.
+    frame = ui.Frame3D(FRAME_WIDTH, FRAME_HEIGHT)
+    frame.set_position(0, 0, 0)
+    row_width = len(tests) * RECT_SIZE + (len(tests) - 1) * RECT_GAP
+    left = (FRAME_WIDTH - row_width) / 2
+    centers = {}
+    for i, (name, r, g, b, a) in enumerate(tests):
+        x = left + i * (RECT_SIZE + RECT_GAP)
+        centers[name] = x + RECT_SIZE / 2
+        rect = ui.Rectangle(RECT_SIZE, RECT_SIZE)
+        rect.set_color(r, g, b, a)
+        rect.set_position(x, (FRAME_HEIGHT - RECT_SIZE) / 2)
+        rect.set_name(name)
+        frame.add_child(rect)
+    scene.add_frame3d(frame)
+    
+    # Rectangle.set_color takes straight alpha and the pipeline blends with
+    # SourceAlpha/OneMinusSourceAlpha, so over the opaque background each
+    # channel should be premultiplied_src + bg * (1 - a). Premultiply once here.
+    expected = {
+        name: (tuple(c * a * 255 + BACKGROUND_LEVEL * (1 - a) for c in (r, g, b)), a)
+        for name, r, g, b, a in tests
+    }
+    
     print("\nTesting different colors and alpha values...")
     print()
     
-    results = []
-    for name, r, g, b, a, pos in tests:
-        result = test_color(renderer, scene, name, r, g, b, a, pos)
-        if result:
-            results.append((name, result))
-            
-            inp = result['input']
-            out = result['output']
-            var = result['variance']
-            
-            print(f"{name}:")
-            print(f"  Input:    ({inp[0]:.2f}, {inp[1]:.2f}, {inp[2]:.2f}, {inp[3]:.2f})")
-            print(f"  Expected: ({inp[0]*255:.0f}, {inp[1]*255:.0f}, {inp[2]*255:.0f}, {inp[3]*255:.0f})")
-            print(f"  Output:   ({out[0]:.0f}, {out[1]:.0f}, {out[2]:.0f}, {out[3]:.0f})")
-            print(f"  Variance: {var}")
+    # Render one frame; capture_frame() waits for the GPU before reading back.
+    # That frame's readback rides along with it; async capture is on only for
+    # this frame (the renderer is shared, so it is restored however this exits).
+    renderer.poll_events()
+    if renderer.should_close():
+        return 0
+    with renderer_settings(renderer, async_capture=True):
+        if not renderer.begin_frame():
+            return 0
+        renderer.render_scene(scene)
+        renderer.end_frame()
+        data, width, height = renderer.capture_frame()
+    if data is None:
+        print("Failed to capture frame")
+        return 1
+    
+    # BGRA, zero-copy view of the capture
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+    
+    for name, r, g, b, a in tests:
+        center_x = projected_x(centers[name], width)
+        result = analyze_region(pixels, center_x, height // 2, SAMPLE_SIZE)
+        if result is None:
+            continue
+        out, var = result
+        
+        print(f"{name}:")
+        print(f"  Input:    ({r:.2f}, {g:.2f}, {b:.2f}, {a:.2f})")
+        (exp_r, exp_g, exp_b), exp_a = expected[name]
+        print(f"  Expected: ({exp_r:.0f}, {exp_g:.0f}, {exp_b:.0f}) over background")
+        print(f"  Output:   ({out[0]:.0f}, {out[1]:.0f}, {out[2]:.0f}, {out[3]:.0f})")
+        print(f"  Variance: {var}")
+        
+        # Check if output matches expected
+        if abs(out[0] - exp_r) < 5:
+            print(f"  ✓ Color matches expected")
+        else:
+            print(f"  ✗ Color mismatch!")
+            # If the input were treated as already premultiplied:
+            # result = src + dst * (1 - src.a)
+            as_premult = r * 255 + BACKGROUND_LEVEL * (1 - exp_a)
+            print(f"  Premult-input blend would give: {as_premult:.0f}")
             
-            # Check if output matches expected
-            expected_r = inp[0] * 255
-            if abs(out[0] - expected_r) < 5:
-                print(f"  ✓ Color matches expected")
-            else:
-                print(f"  ✗ Color mismatch!")
-                # Calculate what the blend formula would produce
-                # If using premultiplied alpha: result = src + dst * (1 - src.a)
-                # Background is (26, 26, 26)
-                bg = 26
-                src_premult = inp[0] * inp[3] * 255
-                blended = src_premult + bg * (1 - inp[3])
-                print(f"  Premult blend would give: {blended:.0f}")
-                
-                # If using straight alpha: result = src * src.a + dst * (1 - src.a)
-                straight = inp[0] * 255 * inp[3] + bg * (1 - inp[3])
-                print(f"  Straight blend would give: {straight:.0f}")
-            print()
+            # If alpha were ignored entirely
+            print(f"  Unblended source would give: {r * 255:.0f}")
+        print()
     
     # Save a capture
-    os.makedirs("tests/output", exist_ok=True)
-    renderer.save_capture("tests/output/color_debug_test.png")
-    print("Saved: tests/output/color_debug_test.png")
+    filename = os.path.join(OUTPUT_DIR, "color_debug_test.png")
+    renderer.save_capture(filename)
+    print(f"Saved: {filename}")
     
     # Keep window open
     print("\nWindow will stay open for 3 seconds...")
-    for i in range(30):
+    # end_frame() paces frames to the display, so no sleep is needed here
+    deadline = time.monotonic() + 3.0
+    while time.monotonic() < deadline:
         renderer.poll_events()
         if renderer.should_close():
             break
         renderer.begin_frame()
         renderer.render_scene(scene)
         renderer.end_frame()
-        time.sleep(0.1)
     
-    renderer.shutdown()
     print("Test complete!")
     return 0
 
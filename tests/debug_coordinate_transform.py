@@ -8,20 +8,33 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
+from debug_session import get_renderer, new_scene, renderer_settings
+from pixel_masks import pure_color_mask
 import numpy as np
 
 
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+
 def main():
     print("Coordinate Transform Debug")
     print("=" * 70)
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Coordinate Debug"):
+    renderer = get_renderer(800, 700, "Coordinate Debug")
+    if renderer is None:
         print("Failed to initialize renderer")
         return 1
     
-    scene = ui.SceneRoot()
+    # Every frame here is captured; let the readback ride along with the frame.
+    # The renderer is shared, so the setting is restored however this returns.
+    with renderer_settings(renderer, async_capture=True):
+        return check_transforms(renderer)
+
+
+def check_transforms(renderer):
+    """Render the marker scene and report where the markers land."""
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0, 0, 800)
     camera.set_perspective(1.0472, 1600.0/1400.0, 0.1, 2000.0)
@@ -50,22 +63,17 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
-    os.makedirs("tests/output", exist_ok=True)
-    renderer.save_capture("tests/output/coord_test1.png")
+    # Capture (BGRA)
+    data, width, height = renderer.capture_frame()
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
     
     # Analyze
-    img = PILImage.open("tests/output/coord_test1.png")
-    pixels = np.array(img)
-    red_mask = (pixels[:, :, 0] > 200) & (pixels[:, :, 1] < 50) & (pixels[:, :, 2] < 50)
-    
-    if np.any(red_mask):
-        red_rows = np.any(red_mask, axis=1)
-        red_cols = np.any(red_mask, axis=0)
-        top = np.argmax(red_rows)
-        bottom = len(red_rows) - np.argmax(red_rows[::-1]) - 1
-        left = np.argmax(red_cols)
-        right = len(red_cols) - np.argmax(red_cols[::-1]) - 1
+    red_mask = pure_color_mask(pixels, 2)
+    
+    ys, xs = np.nonzero(red_mask)
+    if ys.size:
+        top, bottom = int(ys.min()), int(ys.max())
+        left, right = int(xs.min()), int(xs.max())
         
         center_x = (left + right) / 2 / 2  # Physical to logical
         center_y = (top + bottom) / 2 / 2
@@ -74,6 +82,9 @@ def main():
         print(f"  Expected center: (400, 350) logical (center of 800x700 window)")
         print()
     
+    # Save for inspection
+    renderer.save_capture(os.path.join(OUTPUT_DIR, "coord_test1.png"))
+    
     # Clear scene
     scene.clear()
     frame3d = ui.Frame3D(800, 600)
@@ -87,9 +98,7 @@ def main():
     print("  Rectangle position in Frame2D: (0, 0)")
     print("  Rectangle size: 100x100")
     
-    frame2d = ui.Frame2D(400, 400)
-    frame2d.set_position(0, 0)
-    frame2d
+    frame2d = ui.Frame2D(400, 400, position=(0, 0))
     
     rect_in_frame = ui.Rectangle(100, 100)
     rect_in_frame.set_position(0, 0)  # Top-left of Frame2D
@@ -107,21 +116,17 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
-    renderer.save_capture("tests/output/coord_test2.png")
+    # Capture (BGRA)
+    data, width, height = renderer.capture_frame()
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
     
     # Analyze
-    img = PILImage.open("tests/output/coord_test2.png")
-    pixels = np.array(img)
-    green_mask = (pixels[:, :, 0] < 50) & (pixels[:, :, 1] > 200) & (pixels[:, :, 2] < 50)
-    
-    if np.any(green_mask):
-        green_rows = np.any(green_mask, axis=1)
-        green_cols = np.any(green_mask, axis=0)
-        top = np.argmax(green_rows)
-        bottom = len(green_rows) - np.argmax(green_rows[::-1]) - 1
-        left = np.argmax(green_cols)
-        right = len(green_cols) - np.argmax(green_cols[::-1]) - 1
+    green_mask = pure_color_mask(pixels, 1)
+    
+    ys, xs = np.nonzero(green_mask)
+    if ys.size:
+        top, bottom = int(ys.min()), int(ys.max())
+        left, right = int(xs.min()), int(xs.max())
         
         center_x = (left + right) / 2 / 2  # Physical to logical
         center_y = (top + bottom) / 2 / 2
@@ -136,7 +141,9 @@ def main():
         print(f"  Rectangle center should be at (200+50, 150+50) = (250, 200)")
         print()
     
-    renderer.shutdown()
+    # Save for inspection
+    renderer.save_capture(os.path.join(OUTPUT_DIR, "coord_test2.png"))
+    
     return 0
 
 
@@ -25,10 +25,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Frame2D at center of window
-    clip_panel = ui.Frame2D(500.0, 600.0)
-    clip_panel.set_position(150.0, 50.0)
-    clip_panel
-    clip_panel.set_clipping_enabled(False)  # Disable clipping to see everything
+    clip_panel = ui.Frame2D(500.0, 600.0, position=(150.0, 50.0), clipping_enabled=False)  # Disable clipping to see everything
     
     # Background - should fill entire Frame2D
     panel_bg = ui.Rectangle(500.0, 600.0)
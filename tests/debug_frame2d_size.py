@@ -8,20 +8,25 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
+from debug_session import get_renderer, new_scene
+from pixel_masks import pure_color_mask
 import numpy as np
 
 
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+
 def main():
     print("Frame2D Size Debug")
     print("=" * 70)
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Frame2D Size Debug"):
+    renderer = get_renderer(800, 700, "Frame2D Size Debug")
+    if renderer is None:
         print("Failed to initialize renderer")
         return 1
     
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0, 0, 800)
     camera.set_perspective(1.0472, 1600.0/1400.0, 0.1, 2000.0)
@@ -32,44 +37,14 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D with specific size
-    clip_panel = ui.Frame2D(500, 600)
-    clip_panel.set_position(150, 50)  # Center at (150, 50)
-    clip_panel     # Size 500x600
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(500, 600, position=(150, 50), clipping_enabled=True)
     
-    # Fill entire Frame2D with bright red background
-    bg = ui.Rectangle(500, 600)
+    # Fill entire Frame2D with bright red background and a 4px green border
+    # at the exact Frame2D boundaries (single draw)
+    bg = ui.BorderedRectangle(500, 600, 4, (1.0, 0.0, 0.0, 1.0), (0.0, 1.0, 0.0, 1.0))
     bg.set_position(0, 0)  # Top-left corner in Frame2D coordinates
-    bg.set_color(1.0, 0.0, 0.0, 1.0)  # Bright red
     clip_panel.add_child(bg)
     
-    # Add green borders at exact Frame2D boundaries
-    border_width = 4
-    
-    # Top border
-    border_top = ui.Rectangle(500, border_width)
-    border_top.set_position(0, 0)
-    border_top.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_top)
-    
-    # Bottom border
-    border_bottom = ui.Rectangle(500, border_width)
-    border_bottom.set_position(0, 600 - border_width)
-    border_bottom.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_bottom)
-    
-    # Left border
-    border_left = ui.Rectangle(border_width, 600)
-    border_left.set_position(0, 0)
-    border_left.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_left)
-    
-    # Right border
-    border_right = ui.Rectangle(border_width, 600)
-    border_right.set_position(500 - border_width, 0)
-    border_right.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_right)
-    
     frame3d.add_child(clip_panel)
     
     print("Setup:")
@@ -93,30 +68,20 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
-    os.makedirs("tests/output", exist_ok=True)
-    filename = "tests/output/frame2d_size_debug.png"
-    renderer.save_capture(filename)
-    
+    # Capture (BGRA)
     data, width, height = renderer.capture_frame()
     print(f"Captured: {width}x{height}")
-    
-    # Load and analyze
-    img = PILImage.open(filename)
-    pixels = np.array(img)
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
     
     # Find red pixels (background)
-    red_mask = (pixels[:, :, 0] > 200) & (pixels[:, :, 1] < 50) & (pixels[:, :, 2] < 50)
+    red_mask = pure_color_mask(pixels, 2)
     
     # Find bounding box of red pixels
-    red_rows = np.any(red_mask, axis=1)
-    red_cols = np.any(red_mask, axis=0)
+    ys, xs = np.nonzero(red_mask)
     
-    if np.any(red_rows) and np.any(red_cols):
-        top = np.argmax(red_rows)
-        bottom = len(red_rows) - np.argmax(red_rows[::-1]) - 1
-        left = np.argmax(red_cols)
-        right = len(red_cols) - np.argmax(red_cols[::-1]) - 1
+    if ys.size:
+        top, bottom = int(ys.min()), int(ys.max())
+        left, right = int(xs.min()), int(xs.max())
         
         actual_width = right - left + 1
         actual_height = bottom - top + 1
@@ -156,7 +121,9 @@ def main():
     else:
         print("✗ No red pixels found - Frame2D not rendering!")
     
-    renderer.shutdown()
+    # Save for inspection
+    renderer.save_capture(os.path.join(OUTPUT_DIR, "frame2d_size_debug.png"))
+    
     return 0
 
 
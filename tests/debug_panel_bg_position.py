@@ -30,11 +30,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D at specific position
-    clip_panel = ui.Frame2D(500.0, 600.0)
-    clip_panel.set_name("ClippingPanel")
-    clip_panel.set_position(150.0, 50.0)  # This uses center-origin in Frame3D space
-    clip_panel
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(500.0, 600.0, position=(150.0, 50.0), name="ClippingPanel", clipping_enabled=True)  # This uses center-origin in Frame3D space
     
     # Background at (0, 0) - should be at Frame2D's top-left
     panel_bg = ui.Rectangle(500.0, 600.0)
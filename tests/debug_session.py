@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Shared renderer for the debug scripts and OpenGL tests.
+
+Creating a renderer pays for the device or GL context, window and shader
+compilation. Scripts get their renderer from here, so scripts run in the
+same process (see run_debug_scripts.py, run_opengl_tests.py) reuse one
+initialized renderer per backend and window size instead of each creating
+and shutting down their own.
+
+render_frame() draws one frame of a scene for scripts that run their own
+frame loop (test_capture.py, diagnose_display_noise.py).
+"""
+
+import sys
+import os
+import atexit
+import contextlib
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
+
+import cyber_ui_core as ui
+
+
+_renderers = {}
+_scenes = []
+
+
+def get_renderer(width, height, title, backend="metal"):
+    """Return the shared renderer for a backend and window size, creating it on first use."""
+    key = (backend, width, height)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        if backend == "opengl":
+            renderer = ui.create_opengl_renderer()
+        else:
+            renderer = ui.create_metal_renderer()
+        if not renderer.initialize(width, height, title):
+            return None
+        _renderers[key] = renderer
+    return renderer
+
+
+def new_scene():
+    """Create a SceneRoot that stays alive for the session.
+
+    The renderer caches textures and render targets by object address, so
+    scenes are kept alive to stop a later script's objects from reusing an
+    address (and picking up a stale cache entry).
+    """
+    scene = ui.SceneRoot()
+    _scenes.append(scene)
+    return scene
+
+
+def render_frame(renderer, scene, poll_events=True):
+    """Render a single frame. Returns False if the window was closed.
+    
+    Pass poll_events=False for back-to-back frames where the caller has
+    already pumped window events.
+    """
+    if poll_events:
+        renderer.poll_events()
+    if renderer.should_close():
+        return False
+    
+    renderer.begin_frame()
+    renderer.render_scene(scene)
+    renderer.end_frame()
+    return True
+
+
+@contextlib.contextmanager
+def renderer_settings(renderer, vsync=None, async_capture=None):
+    """Change renderer settings for the body of a with block, then restore them.
+    
+    The renderer is shared with the scripts that run after this one, so a
+    setting changed here must not outlive the script, even when it fails.
+    """
+    saved_vsync = renderer.is_vsync_enabled()
+    saved_async = renderer.is_async_capture_enabled()
+    try:
+        if vsync is not None:
+            renderer.set_vsync_enabled(vsync)
+        if async_capture is not None:
+            renderer.set_async_capture_enabled(async_capture)
+        yield renderer
+    finally:
+        renderer.set_async_capture_enabled(saved_async)
+        renderer.set_vsync_enabled(saved_vsync)
+
+
+@atexit.register
+def shutdown_all():
+    """Shut down every shared renderer."""
+    for renderer in _renderers.values():
+        renderer.shutdown()
+    _renderers.clear()
+    _scenes.clear()
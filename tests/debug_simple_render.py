@@ -9,21 +9,27 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from debug_session import get_renderer, new_scene
+import numpy as np
 import time
 
 
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+
 def main():
     print("Simple Render Debug Test")
     print("=" * 70)
     
     # Create renderer with BLACK background
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 600, "Simple Render Test"):
+    renderer = get_renderer(800, 600, "Simple Render Test")
+    if renderer is None:
         print("Failed to initialize renderer")
         return 1
     
     # Create scene
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = ui.Camera()
     camera.set_position(0, 0, 5)
     scene.set_camera(camera)
@@ -42,21 +48,11 @@ def main():
     
     print("Rendering white rectangle on black background...")
     
-    # Render several frames
-    for i in range(10):
-        renderer.poll_events()
-        if renderer.should_close():
-            renderer.shutdown()
-            return 0
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.05)
-    
-    # Capture
+    # Render one frame and capture it (capture_frame() waits for the GPU)
     print("Capturing frame...")
     renderer.poll_events()
+    if renderer.should_close():
+        return 0
     renderer.begin_frame()
     renderer.render_scene(scene)
     renderer.end_frame()
@@ -64,48 +60,29 @@ def main():
     data, width, height = renderer.capture_frame()
     if data is None:
         print("Failed to capture frame")
-        renderer.shutdown()
         return 1
     
     # Save
-    os.makedirs("tests/output", exist_ok=True)
-    filename = "tests/output/simple_render_test.png"
+    filename = os.path.join(OUTPUT_DIR, "simple_render_test.png")
     renderer.save_capture(filename)
     print(f"Saved: {filename}")
     
-    # Analyze center pixels
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
+    # Analyze center pixels (BGRA, zero-copy view of the capture)
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
     
     # Sample center 100x100 region
     center_x = width // 2
     center_y = height // 2
     sample_size = 100
+    half = sample_size // 2
     
-    samples = []
-    for dy in range(-sample_size//2, sample_size//2):
-        for dx in range(-sample_size//2, sample_size//2):
-            px = center_x + dx
-            py = center_y + dy
-            offset = (py * width + px) * 4
-            b = pixels[offset]
-            g = pixels[offset + 1]
-            r = pixels[offset + 2]
-            a = pixels[offset + 3]
-            samples.append((r, g, b, a))
+    region = pixels[center_y - half:center_y + half,
+                    center_x - half:center_x + half].reshape(-1, 4)
     
     # Statistics
-    avg_r = sum(s[0] for s in samples) / len(samples)
-    avg_g = sum(s[1] for s in samples) / len(samples)
-    avg_b = sum(s[2] for s in samples) / len(samples)
-    avg_a = sum(s[3] for s in samples) / len(samples)
-    
-    min_r = min(s[0] for s in samples)
-    max_r = max(s[0] for s in samples)
-    min_g = min(s[1] for s in samples)
-    max_g = max(s[1] for s in samples)
-    min_b = min(s[2] for s in samples)
-    max_b = max(s[2] for s in samples)
+    avg_b, avg_g, avg_r, avg_a = region.mean(axis=0)
+    min_b, min_g, min_r, _ = (int(v) for v in region.min(axis=0))
+    max_b, max_g, max_r, _ = (int(v) for v in region.max(axis=0))
     
     print("\nCenter Region Analysis (100x100 pixels):")
     print(f"  Average RGBA: ({avg_r:.2f}, {avg_g:.2f}, {avg_b:.2f}, {avg_a:.2f})")
@@ -130,16 +107,16 @@ def main():
     
     # Keep window open
     print("\nWindow will stay open for 5 seconds...")
-    for i in range(50):
+    # end_frame() paces frames to the display, so no sleep is needed here
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
         renderer.poll_events()
         if renderer.should_close():
             break
         renderer.begin_frame()
         renderer.render_scene(scene)
         renderer.end_frame()
-        time.sleep(0.1)
     
-    renderer.shutdown()
     print("Test complete!")
     return 0
 
@@ -14,7 +14,21 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from debug_session import render_frame
+import numpy as np
 import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from capture_png import save_bgra_png
+except ImportError:
+    # Pillow not installed: PNGs are written by the renderer instead
+    save_bgra_png = None
+
+
+# Names of the sampled gray bars, in region order
+REGION_NAMES = [f"Bar_{i}" for i in range(5)]
 
 
 def create_test_pattern(renderer, scene):
@@ -51,59 +65,57 @@ def create_test_pattern(renderer, scene):
     return frame
 
 
+def region_stats(blocks):
+    """Mean/variance/min/max per region for an (N, h, w, 3) stack of RGB blocks."""
+    flat = blocks.reshape(blocks.shape[0], -1, blocks.shape[-1])
+    n = flat.shape[1]
+    # Variance from exact integer sums (sum and sum of squares), instead of
+    # var()'s mean / subtract / square passes over a float64 copy
+    sums = flat.sum(axis=1, dtype=np.int64)
+    sum_sq = np.einsum('nij,nij->nj', flat, flat, dtype=np.int64)
+    mean = sums / n
+    var = (n * sum_sq - sums * sums) / (n * n)
+    return mean, var, flat.min(axis=1), flat.max(axis=1)
+
+
 def analyze_captured_pixels(data, width, height, sample_regions):
-    """Analyze pixel data in specific regions to detect noise."""
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
-    
-    results = {}
-    
-    for region_name, (x, y, w, h) in sample_regions.items():
-        # Sample pixels in this region
-        samples = []
-        for dy in range(h):
-            for dx in range(w):
-                px = x + dx
-                py = y + dy
-                if 0 <= px < width and 0 <= py < height:
-                    offset = (py * width + px) * 4
-                    b = pixels[offset]
-                    g = pixels[offset + 1]
-                    r = pixels[offset + 2]
-                    a = pixels[offset + 3]
-                    samples.append((r, g, b, a))
-        
-        if samples:
-            # Calculate statistics
-            avg_r = sum(s[0] for s in samples) / len(samples)
-            avg_g = sum(s[1] for s in samples) / len(samples)
-            avg_b = sum(s[2] for s in samples) / len(samples)
-            
-            # Calculate variance (measure of noise)
-            var_r = sum((s[0] - avg_r) ** 2 for s in samples) / len(samples)
-            var_g = sum((s[1] - avg_g) ** 2 for s in samples) / len(samples)
-            var_b = sum((s[2] - avg_b) ** 2 for s in samples) / len(samples)
-            
-            # Find min/max values
-            min_r = min(s[0] for s in samples)
-            max_r = max(s[0] for s in samples)
-            min_g = min(s[1] for s in samples)
-            max_g = max(s[1] for s in samples)
-            min_b = min(s[2] for s in samples)
-            max_b = max(s[2] for s in samples)
-            
-            results[region_name] = {
-                'avg': (avg_r, avg_g, avg_b),
-                'variance': (var_r, var_g, var_b),
-                'range': ((min_r, max_r), (min_g, max_g), (min_b, max_b)),
-                'samples': len(samples)
-            }
-    
-    return results
+    """Analyze pixel data in specific regions to detect noise.
+    
+    sample_regions is an (N, 4) int array of (x, y, w, h). Returns an (N, 4, 3)
+    array of [average, variance, min, max] per RGB channel; regions with no
+    pixels inside the image are NaN.
+    """
+    # BGRA, zero-copy view of the capture
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+    
+    regions = np.asarray(sample_regions, dtype=np.intp).reshape(-1, 4)
+    xs, ys, ws, hs = regions.T
+    stats = np.full((len(regions), 4, 3), np.nan)
+    
+    inside = (xs >= 0) & (ys >= 0) & (xs + ws <= width) & (ys + hs <= height)
+    if len(regions) and inside.all() and (ws == ws[0]).all() and (hs == hs[0]).all() and ws[0] > 0 and hs[0] > 0:
+        # Equal-sized regions fully inside the image (the usual case): gather
+        # them all as windows and reduce every region in one pass
+        windows = np.lib.stride_tricks.sliding_window_view(pixels, (hs[0], ws[0]), axis=(0, 1))
+        blocks = windows[ys, xs, 2::-1].transpose(0, 2, 3, 1)  # (N, h, w, RGB)
+        stats[:] = np.stack(region_stats(blocks), axis=1)
+    else:
+        # Sample pixels in each region (clipped to the image), as RGB
+        for i, (x, y, w, h) in enumerate(regions.tolist()):
+            block = pixels[max(0, y):max(0, y + h), max(0, x):max(0, x + w), 2::-1]
+            if block.shape[0] * block.shape[1]:
+                stats[i] = np.stack(region_stats(block[np.newaxis]), axis=1)[0]
+    
+    return stats
 
 
 def main():
     """Run display noise diagnostic."""
+    parser = argparse.ArgumentParser(description='Display noise diagnostic')
+    parser.add_argument('--png', action='store_true',
+                        help='Also save each captured frame as a PNG')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("Display Noise Diagnostic Tool")
     print("=" * 70)
@@ -129,19 +141,6 @@ def main():
     frame = create_test_pattern(renderer, scene)
     
     print("Rendering test pattern...")
-    print("Let it stabilize for a moment...")
-    
-    # Render several frames to ensure everything is loaded
-    for i in range(10):
-        renderer.poll_events()
-        if renderer.should_close():
-            renderer.shutdown()
-            return 0
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.05)
     
     # Create output directory
     output_dir = "tests/output"
@@ -149,102 +148,111 @@ def main():
     
     print("\nCapturing frames for analysis...")
     
-    # Capture multiple frames
+    # Capture multiple frames; analysis works on these in-memory buffers.
+    # With --png and Pillow available, PNG encoding runs on worker threads
+    # so it overlaps with rendering the next frame.
     captures = []
-    for i in range(5):
-        # Render a frame
+    with ThreadPoolExecutor(max_workers=2) as encoder:
+        pending = []
+        # Frames are captured back to back; pump window events once up front
         renderer.poll_events()
-        if renderer.should_close():
-            break
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        
-        # Capture it
-        data, width, height = renderer.capture_frame()
-        if data is not None:
-            captures.append((data, width, height))
+        for i in range(5):
+            # Render a single frame and capture it (no warmup needed; the
+            # capture waits for the GPU)
+            if not render_frame(renderer, scene, poll_events=False):
+                break
             
-            # Save to file
-            filename = os.path.join(output_dir, f"noise_test_{i+1}.png")
-            renderer.save_capture(filename)
-            print(f"  Captured frame {i+1}: {filename}")
+            # Capture it
+            data, width, height = renderer.capture_frame()
+            if data is not None:
+                captures.append((data, width, height))
+                print(f"  Captured frame {i+1}")
+                
+                if args.png:
+                    filename = os.path.join(output_dir, f"noise_test_{i+1}.png")
+                    if save_bgra_png is not None:
+                        pending.append(encoder.submit(save_bgra_png, data, width, height, filename))
+                    else:
+                        renderer.save_capture(filename)
+                    print(f"    Saved: {filename}")
         
-        time.sleep(0.1)
+        for future in pending:
+            future.result()
     
     if not captures:
         print("Failed to capture any frames")
         renderer.shutdown()
         return 1
     
+    # Save all frames at once as a (frames, height, width, BGRA) stack
+    frames_file = os.path.join(output_dir, "noise_frames.npz")
+    np.savez_compressed(frames_file, frames=np.stack([
+        np.frombuffer(data, dtype=np.uint8).reshape(h, w, 4) for data, w, h in captures
+    ]))
+    print(f"Saved frames: {frames_file}")
+    
     print(f"\nAnalyzing {len(captures)} captured frames...")
     
-    # Define sample regions (center of each gray bar)
+    # Define sample regions (center of each gray bar) as (x, y, w, h) rows,
+    # computed once and shared by every frame
     width = captures[0][1]
     height = captures[0][2]
     
     bar_width = 160
-    bar_height = 400
     sample_size = 50  # Sample a 50x50 region in center of each bar
     
     center_y = height // 2
     
-    sample_regions = {}
-    for i in range(5):
-        bar_x = (width // 2) - (bar_width * 5 // 2) + (bar_width * i) + (bar_width // 2)
-        sample_x = bar_x - sample_size // 2
-        sample_y = center_y - sample_size // 2
-        sample_regions[f"Bar_{i}"] = (sample_x, sample_y, sample_size, sample_size)
+    bar_xs = (width // 2) - (bar_width * 5 // 2) + bar_width * np.arange(5) + (bar_width // 2)
+    sample_regions = np.empty((len(REGION_NAMES), 4), dtype=np.int32)
+    sample_regions[:, 0] = bar_xs - sample_size // 2
+    sample_regions[:, 1] = center_y - sample_size // 2
+    sample_regions[:, 2:] = sample_size
     
-    # Analyze each capture
-    all_results = []
+    # Analyze each capture: (frame, region, [avg, var, min, max], RGB)
+    all_results = np.zeros((len(captures), len(REGION_NAMES), 4, 3))
     for i, (data, w, h) in enumerate(captures):
-        results = analyze_captured_pixels(data, w, h, sample_regions)
-        all_results.append(results)
+        all_results[i] = analyze_captured_pixels(data, w, h, sample_regions)
     
     # Print analysis
     print("\n" + "=" * 70)
     print("Pixel Analysis Results")
     print("=" * 70)
     
-    for region_name in sorted(sample_regions.keys()):
+    for region_idx, region_name in enumerate(REGION_NAMES):
         print(f"\n{region_name}:")
         print("-" * 70)
         
-        for i, results in enumerate(all_results):
-            if region_name in results:
-                r = results[region_name]
-                avg = r['avg']
-                var = r['variance']
-                rng = r['range']
-                
-                print(f"  Frame {i+1}:")
-                print(f"    Average RGB: ({avg[0]:.2f}, {avg[1]:.2f}, {avg[2]:.2f})")
-                print(f"    Variance:    ({var[0]:.4f}, {var[1]:.4f}, {var[2]:.4f})")
-                print(f"    Range R:     {rng[0][0]}-{rng[0][1]} (span: {rng[0][1]-rng[0][0]})")
-                print(f"    Range G:     {rng[1][0]}-{rng[1][1]} (span: {rng[1][1]-rng[1][0]})")
-                print(f"    Range B:     {rng[2][0]}-{rng[2][1]} (span: {rng[2][1]-rng[2][0]})")
+        for i in range(len(all_results)):
+            avg, var, lo, hi = all_results[i, region_idx]
+            if np.isnan(avg[0]):
+                continue
+            lo = lo.astype(int)
+            hi = hi.astype(int)
+            
+            print(f"  Frame {i+1}:")
+            print(f"    Average RGB: ({avg[0]:.2f}, {avg[1]:.2f}, {avg[2]:.2f})")
+            print(f"    Variance:    ({var[0]:.4f}, {var[1]:.4f}, {var[2]:.4f})")
+            print(f"    Range R:     {lo[0]}-{hi[0]} (span: {hi[0]-lo[0]})")
+            print(f"    Range G:     {lo[1]}-{hi[1]} (span: {hi[1]-lo[1]})")
+            print(f"    Range B:     {lo[2]}-{hi[2]} (span: {hi[2]-lo[2]})")
     
     # Check consistency across frames
     print("\n" + "=" * 70)
     print("Cross-Frame Consistency Check")
     print("=" * 70)
     
-    for region_name in sorted(sample_regions.keys()):
+    # Mean and variance of each region's average color across frames,
+    # computed for all regions at once: (n_regions, RGB)
+    frame_avgs = all_results[:, :, 0, :]
+    frame_means = frame_avgs.mean(axis=0)
+    frame_vars = frame_avgs.var(axis=0)
+    
+    for region_idx, region_name in enumerate(REGION_NAMES):
         print(f"\n{region_name}:")
         
-        # Collect averages across all frames
-        avgs = [all_results[i][region_name]['avg'] for i in range(len(all_results))]
-        
-        # Calculate variance across frames
-        avg_r_mean = sum(a[0] for a in avgs) / len(avgs)
-        avg_g_mean = sum(a[1] for a in avgs) / len(avgs)
-        avg_b_mean = sum(a[2] for a in avgs) / len(avgs)
-        
-        var_r = sum((a[0] - avg_r_mean) ** 2 for a in avgs) / len(avgs)
-        var_g = sum((a[1] - avg_g_mean) ** 2 for a in avgs) / len(avgs)
-        var_b = sum((a[2] - avg_b_mean) ** 2 for a in avgs) / len(avgs)
+        avg_r_mean, avg_g_mean, avg_b_mean = frame_means[region_idx]
+        var_r, var_g, var_b = frame_vars[region_idx]
         
         print(f"  Mean across frames: ({avg_r_mean:.2f}, {avg_g_mean:.2f}, {avg_b_mean:.2f})")
         print(f"  Frame-to-frame variance: ({var_r:.6f}, {var_g:.6f}, {var_b:.6f})")
@@ -273,7 +281,9 @@ def main():
     print("    - MTKView drawable presentation")
     print("    - macOS display color management")
     print()
-    print("Captured images are saved to: tests/output/noise_test_*.png")
+    print("Captured frames are saved to: tests/output/noise_frames.npz (BGRA)")
+    if args.png:
+        print("PNG copies are saved to: tests/output/noise_test_*.png")
     print("Examine these images closely - they should be perfectly clean.")
     print()
     
@@ -281,15 +291,14 @@ def main():
     print("Window will stay open for 10 seconds for visual inspection...")
     print("Compare what you see in the window vs the captured images.")
     
-    for i in range(100):
+    # The pattern is static and the last presented frame stays on screen, so
+    # just pump window events at display cadence without submitting new frames
+    deadline = time.monotonic() + 10.0
+    while time.monotonic() < deadline:
         renderer.poll_events()
         if renderer.should_close():
             break
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.1)
+        time.sleep(1 / 60)
     
     renderer.shutdown()
     print("\nDiagnostic complete!")
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Loaded-font cache for the test scripts.
+
+Loading a font reads and parses the font file. Fonts are loaded once per
+(path, size, bold) and shared, so scripts run in the same process and
+repeated requests for one font skip the load.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
+
+import cyber_ui_core as ui
+
+
+_fonts = {}
+
+
+def get_font(path, size, bold=False):
+    """Return a loaded ui.Font, reusing one already loaded with the same settings."""
+    key = (path, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = ui.Font()
+        font.load_from_file(path, size)
+        font.set_bold(bold)
+        _fonts[key] = font
+    return font
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Decoded-image cache for the test scripts.
+
+Decoding a PNG with Pillow is the main cost of building a textured test
+scene. Images are decoded once per file version (path + mtime) and kept as
+RGBA arrays, so scripts run in the same process (see run_debug_scripts.py,
+run_clipping_tests.py) and repeated loads of one file skip the decode.
+"""
+
+import sys
+import os
+import functools
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
+
+import cyber_ui_core as ui
+import numpy as np
+from PIL import Image as PILImage
+
+
+@functools.lru_cache(maxsize=64)
+def _decode_rgba(filepath, mtime):
+    with PILImage.open(filepath) as pil_img:
+        # RGBA sources are read as-is; convert() would copy the whole image
+        if pil_img.mode != 'RGBA':
+            pil_img = pil_img.convert('RGBA')
+        return np.asarray(pil_img, dtype=np.uint8)
+
+
+def decode_rgba(filepath):
+    """Return an image file as a read-only (height, width, 4) uint8 RGBA array."""
+    return _decode_rgba(filepath, os.path.getmtime(filepath))
+
+
+def load_image_with_pillow(filepath):
+    """Load an image using Pillow and return a cyber_ui Image object"""
+    if not os.path.exists(filepath):
+        print(f"Warning: Image file not found: {filepath}")
+        return None
+    
+    try:
+        pixels = decode_rgba(filepath)
+        height, width = pixels.shape[:2]
+        ui_img = ui.Image()
+        
+        # load_from_data takes any buffer, so the array is passed without a copy
+        if ui_img.load_from_data(pixels, width, height, 4):
+            return ui_img
+        return None
+    except Exception as e:
+        print(f"Error loading {filepath}: {e}")
+        return None
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Per-pixel color tests on captured BGRA frames, one uint32 word per pixel.
+
+capture_frame() returns BGRA bytes; viewed as little-endian uint32 each pixel
+is 0xAARRGGBB. rgb_range_mask() tests all three channels against their
+thresholds with a few whole-word operations (SWAR) instead of slicing out
+and comparing each channel plane separately.
+pure_color_mask() works on the (height, width, 4) byte view instead, for
+scripts that already slice the capture into channel planes.
+"""
+
+import numpy as np
+
+
+_SHIFTS = (16, 8, 0)  # R, G, B byte offsets within a word
+
+
+def bgra_words(data, width, height):
+    """View a BGRA capture as an (height, width) array of uint32 words."""
+    return np.frombuffer(data, dtype='<u4').reshape(height, width)
+
+
+def rgb_range_mask(words, min_rgb=(0, 0, 0), max_rgb=(255, 255, 255)):
+    """Mask of pixels with min_rgb <= (r, g, b) <= max_rgb per channel.
+    
+    Each byte's low 7 bits plus a per-channel bias stays below 256, so the
+    adds never carry into the neighbouring channel and bit 7 of each byte
+    holds that channel's comparison result. Bounds other than 0 / 255 must
+    be on the bright (min >= 128) or dark (max < 128) side, which covers the
+    "bright channel" and "dark channel" tests the capture checks use.
+    """
+    low7 = words & np.uint32(0x7F7F7F)
+    mask = np.ones(words.shape, dtype=bool)
+    
+    # byte >= v (v >= 128): high bit set and low7 + (256 - v) reaches bit 7
+    high = bias = 0
+    for v, shift in zip(min_rgb, _SHIFTS):
+        if v > 0:
+            if v < 128:
+                raise ValueError(f"min bound {v} must be 0 or >= 128")
+            high |= 0x80 << shift
+            bias |= (256 - v) << shift
+    if high:
+        mask &= ((low7 + np.uint32(bias)) & words & np.uint32(high)) == high
+    
+    # byte <= v (v < 128): high bit clear and low7 + (127 - v) stays below bit 7
+    high = bias = 0
+    for v, shift in zip(max_rgb, _SHIFTS):
+        if v < 255:
+            if v >= 128:
+                raise ValueError(f"max bound {v} must be 255 or < 128")
+            high |= 0x80 << shift
+            bias |= (127 - v) << shift
+    if high:
+        mask &= (((low7 + np.uint32(bias)) | words) & np.uint32(high)) == 0
+    
+    return mask
+
+
+def count_rgb_range(words, min_rgb=(0, 0, 0), max_rgb=(255, 255, 255)):
+    """Number of pixels with min_rgb <= (r, g, b) <= max_rgb per channel."""
+    return int(np.count_nonzero(rgb_range_mask(words, min_rgb, max_rgb)))
+
+
+def pure_color_mask(pixels, channel):
+    """Mask of BGRA pixels where `channel` is > 200 and the other color channels are < 50."""
+    mask = np.greater(pixels[:, :, channel], 200)
+    scratch = np.empty_like(mask)
+    for c in (0, 1, 2):
+        if c != channel:
+            np.less(pixels[:, :, c], 50, out=scratch)
+            np.logical_and(mask, scratch, out=mask)
+    return mask
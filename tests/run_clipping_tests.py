@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Run the clipping tests in one process so they share a single initialized
+renderer (see debug_session.py) instead of paying renderer setup per test.
+
+Usage:
+    python tests/run_clipping_tests.py                # run all
+    python tests/run_clipping_tests.py test_clipping_demo_simple
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from run_debug_scripts import run_scripts
+
+
+CLIPPING_TESTS = [
+    "test_clipping_comprehensive",
+    "test_clipping",
+    "test_clipping_demo_simple",
+]
+
+
+def main():
+    return run_scripts(sys.argv[1:] or CLIPPING_TESTS, "CLIPPING TEST RESULTS")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Run the debug scripts in one process so they share a single initialized
+renderer (see debug_session.py) instead of paying renderer setup per script.
+
+Usage:
+    python tests/run_debug_scripts.py                 # run all
+    python tests/run_debug_scripts.py debug_aspect_ratio debug_frame2d_size
+"""
+
+import sys
+import os
+import importlib
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+DEBUG_SCRIPTS = [
+    "debug_simple_render",
+    "debug_color_values",
+    "debug_aspect_ratio",
+    "debug_coordinate_transform",
+    "debug_frame2d_size",
+]
+
+
+def run_scripts(names, heading):
+    """Import each script module, run its main() and print a summary."""
+    results = []
+    for name in names:
+        module = importlib.import_module(name)
+        results.append((name, module.main()))
+    
+    print("\n" + "=" * 70)
+    print(heading)
+    print("=" * 70)
+    for name, code in results:
+        status = "✓" if not code else "✗"
+        print(f"  {status} {name} (exit code {code or 0})")
+    
+    return 0 if all(not code for _, code in results) else 1
+
+
+def main():
+    return run_scripts(sys.argv[1:] or DEBUG_SCRIPTS, "DEBUG SCRIPT RESULTS")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Run the OpenGL tests in one process so they share initialized renderers
+(see debug_session.py) instead of paying GL context setup per test.
+
+Usage:
+    python tests/run_opengl_tests.py                  # run all
+    python tests/run_opengl_tests.py test_opengl_capture
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from run_debug_scripts import run_scripts
+
+
+OPENGL_TESTS = [
+    "test_opengl_simple",
+    "test_opengl_capture",
+    "test_scene_minimal",
+]
+
+
+def main():
+    return run_scripts(sys.argv[1:] or OPENGL_TESTS, "OPENGL TEST RESULTS")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
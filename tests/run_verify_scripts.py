@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Run the Metal verification scripts in one process so they share initialized
+renderers (see debug_session.py) instead of paying device and pipeline setup
+per script.
+
+Usage:
+    python tests/run_verify_scripts.py                # run all
+    python tests/run_verify_scripts.py verify_frame2d_fix
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from run_debug_scripts import run_scripts
+
+
+VERIFY_SCRIPTS = [
+    "verify_clipping_visual",
+    "verify_frame2d_position",
+    "verify_frame2d_fix",
+    "verify_texture_sync",
+]
+
+
+def main():
+    return run_scripts(sys.argv[1:] or VERIFY_SCRIPTS, "VERIFY SCRIPT RESULTS")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,24 +9,15 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
-import time
+from debug_session import render_frame
 
 
-def test_basic_capture():
+def test_basic_capture(renderer, scene):
     """Test basic frame capture with simple shapes."""
     print("Testing basic frame capture...")
     
-    # Create renderer
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 600, "Capture Test - Basic"):
-        print("Failed to initialize renderer")
-        return False
-    
-    # Create scene
-    scene = ui.SceneRoot()
-    camera = ui.Camera()
-    camera.set_position(0, 0, 5)
-    scene.set_camera(camera)
+    # Start from an empty scene on the shared renderer
+    scene.clear()
     
     # Create a 3D frame with some shapes
     frame = ui.Frame3D(800, 600)
@@ -45,16 +36,8 @@ def test_basic_capture():
     
     scene.add_frame3d(frame)
     
-    # Render a few frames
-    for i in range(5):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.1)
+    # Render one frame; capture waits for the GPU, so no warmup is needed
+    render_frame(renderer, scene)
     
     # Capture the frame
     print("Capturing frame...")
@@ -65,23 +48,15 @@ def test_basic_capture():
     else:
         print("✗ Failed to capture frame")
     
-    renderer.shutdown()
     return success
 
 
-def test_capture_with_texture():
+def test_capture_with_texture(renderer, scene):
     """Test frame capture with textured shapes."""
     print("\nTesting capture with textures...")
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 600, "Capture Test - Texture"):
-        print("Failed to initialize renderer")
-        return False
-    
-    scene = ui.SceneRoot()
-    camera = ui.Camera()
-    camera.set_position(0, 0, 5)
-    scene.set_camera(camera)
+    # Start from an empty scene on the shared renderer
+    scene.clear()
     
     frame = ui.Frame3D(800, 600)
     
@@ -99,16 +74,8 @@ def test_capture_with_texture():
     
     scene.add_frame3d(frame)
     
-    # Render frames
-    for i in range(5):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.1)
+    # Render one frame; capture waits for the GPU, so no warmup is needed
+    render_frame(renderer, scene)
     
     # Capture
     print("Capturing textured frame...")
@@ -119,23 +86,15 @@ def test_capture_with_texture():
     else:
         print("✗ Failed to capture textured frame")
     
-    renderer.shutdown()
     return success
 
 
-def test_capture_raw_data():
+def test_capture_raw_data(renderer, scene):
     """Test capturing raw pixel data for analysis."""
     print("\nTesting raw pixel data capture...")
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(400, 300, "Capture Test - Raw Data"):
-        print("Failed to initialize renderer")
-        return False
-    
-    scene = ui.SceneRoot()
-    camera = ui.Camera()
-    camera.set_position(0, 0, 5)
-    scene.set_camera(camera)
+    # Start from an empty scene on the shared renderer
+    scene.clear()
     
     frame = ui.Frame3D(800, 600)
     
@@ -146,16 +105,8 @@ def test_capture_raw_data():
     
     scene.add_frame3d(frame)
     
-    # Render
-    for i in range(3):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-        time.sleep(0.1)
+    # Render one frame; capture waits for the GPU, so no warmup is needed
+    render_frame(renderer, scene)
     
     # Capture raw data
     print("Capturing raw pixel data...")
@@ -166,19 +117,12 @@ def test_capture_raw_data():
         print(f"  Format: BGRA (4 bytes per pixel)")
         print(f"  Expected size: {width * height * 4} bytes")
         
-        # Analyze some pixels
-        import struct
-        pixels = struct.unpack(f'{len(data)}B', data)
-        
-        # Sample center pixel
+        # Sample center pixel (reads just those 4 bytes)
         center_x = width // 2
         center_y = height // 2
         center_offset = (center_y * width + center_x) * 4
         
-        b = pixels[center_offset]
-        g = pixels[center_offset + 1]
-        r = pixels[center_offset + 2]
-        a = pixels[center_offset + 3]
+        b, g, r, a = data[center_offset:center_offset + 4]
         
         print(f"  Center pixel (BGRA): ({b}, {g}, {r}, {a})")
         
@@ -187,23 +131,15 @@ def test_capture_raw_data():
         print("✗ Failed to capture raw data")
         success = False
     
-    renderer.shutdown()
     return success
 
 
-def test_animated_capture():
+def test_animated_capture(renderer, scene):
     """Test capturing multiple frames from an animation."""
     print("\nTesting animated capture...")
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(600, 600, "Capture Test - Animation"):
-        print("Failed to initialize renderer")
-        return False
-    
-    scene = ui.SceneRoot()
-    camera = ui.Camera()
-    camera.set_position(0, 0, 5)
-    scene.set_camera(camera)
+    # Start from an empty scene on the shared renderer
+    scene.clear()
     
     frame = ui.Frame3D(800, 600)
     
@@ -218,20 +154,16 @@ def test_animated_capture():
     angles = [0, 45, 90, 135]
     success_count = 0
     
+    # Frames are rendered back to back; pump window events once up front
+    renderer.poll_events()
+    
     for i, angle in enumerate(angles):
         # Set rotation
         frame.set_rotation(0, 0, angle * 3.14159 / 180.0)
         
         # Render
-        for _ in range(3):
-            renderer.poll_events()
-            if renderer.should_close():
-                break
-            
-            renderer.begin_frame()
-            renderer.render_scene(scene)
-            renderer.end_frame()
-            time.sleep(0.05)
+        if not render_frame(renderer, scene, poll_events=False):
+            break
         
         # Capture
         filename = f"tests/output/capture_anim_{i:02d}_{angle:03d}deg.png"
@@ -241,7 +173,6 @@ def test_animated_capture():
         else:
             print(f"✗ Failed to capture frame {i+1}/4")
     
-    renderer.shutdown()
     return success_count == len(angles)
 
 
@@ -254,13 +185,26 @@ def main():
     # Create output directory
     os.makedirs("tests/output", exist_ok=True)
     
+    # One renderer and scene shared by all tests
+    renderer = ui.create_metal_renderer()
+    if not renderer.initialize(800, 600, "Capture Test"):
+        print("Failed to initialize renderer")
+        return 1
+    
+    scene = ui.SceneRoot()
+    camera = ui.Camera()
+    camera.set_position(0, 0, 5)
+    scene.set_camera(camera)
+    
     results = []
     
     # Run tests
-    results.append(("Basic Capture", test_basic_capture()))
-    results.append(("Texture Capture", test_capture_with_texture()))
-    results.append(("Raw Data Capture", test_capture_raw_data()))
-    results.append(("Animated Capture", test_animated_capture()))
+    results.append(("Basic Capture", test_basic_capture(renderer, scene)))
+    results.append(("Texture Capture", test_capture_with_texture(renderer, scene)))
+    results.append(("Raw Data Capture", test_capture_raw_data(renderer, scene)))
+    results.append(("Animated Capture", test_animated_capture(renderer, scene)))
+    
+    renderer.shutdown()
     
     # Summary
     print("\n" + "=" * 60)
@@ -8,72 +8,71 @@ import sys
 sys.path.insert(0, '../build')
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
+from debug_session import get_renderer, new_scene
+from image_cache import load_image_with_pillow
+from capture_png import save_bgra_png
 import numpy as np
 import os
 
-def load_image_with_pillow(filepath):
-    """Load an image using Pillow and return a cyber_ui Image object"""
-    if not os.path.exists(filepath):
-        return None
-    
-    try:
-        pil_img = PILImage.open(filepath)
-        if pil_img.mode != 'RGBA':
-            pil_img = pil_img.convert('RGBA')
-        
-        img_bytes = pil_img.tobytes()
-        ui_img = ui.Image()
-        width, height = pil_img.size
-        channels = 4
-        
-        if ui_img.load_from_data(img_bytes, width, height, channels):
-            return ui_img
-        return None
-    except:
-        return None
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "..", "samples", "data")
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+def add_rect(parent, width, height, x, y, color, image=None):
+    """Add a colored (optionally textured) rectangle to parent and return it"""
+    rect = ui.Rectangle(width, height)
+    rect.set_position(x, y)
+    rect.set_color(*color)
+    if image:
+        rect.set_image(image)
+    parent.add_child(rect)
+    return rect
 
-def analyze_clipping(pixel_data, width, height, clip_x, clip_y, clip_w, clip_h):
+# Background color and tolerance, as per-channel uint8 bounds so the
+# comparison works on the captured bytes directly instead of a widened copy
+BG_COLOR = np.array([26, 26, 26])
+BG_THRESHOLD = 30
+BG_LO = np.clip(BG_COLOR - BG_THRESHOLD, 0, 255).astype(np.uint8)
+BG_HI = np.clip(BG_COLOR + BG_THRESHOLD, 0, 255).astype(np.uint8)
+
+def non_background_mask(pixels, bg_lo, bg_hi):
+    """Mark pixels whose B, G or R channel falls outside [bg_lo, bg_hi]."""
+    bgr = pixels[:, :, :3]
+    return np.any((bgr < bg_lo) | (bgr > bg_hi), axis=2)
+
+def analyze_clipping(pixel_data, width, height, clip_x, clip_y, clip_w, clip_h, margin=10):
     """Analyze if clipping is working correctly"""
+    # capture_frame() returns a memoryview over its pixel array, so this is a
+    # view of the readback buffer, not a copy
     pixels = np.frombuffer(pixel_data, dtype=np.uint8).reshape(height, width, 4)
     
-    # Background color
-    bg_color = np.array([26, 26, 26])
-    bg_threshold = 30
+    # Classify the whole frame once; regions below are slices of the mask
+    non_bg = non_background_mask(pixels, BG_LO, BG_HI)
     
     # Inside region
-    inside = pixels[clip_y:clip_y+clip_h, clip_x:clip_x+clip_w]
-    inside_diff = np.abs(inside[:, :, :3].astype(int) - bg_color)
-    inside_non_bg = np.sum(np.any(inside_diff > bg_threshold, axis=2))
-    inside_total = inside.shape[0] * inside.shape[1]
+    inside = non_bg[clip_y:clip_y+clip_h, clip_x:clip_x+clip_w]
+    inside_non_bg = int(np.count_nonzero(inside))
+    inside_total = inside.size
     
     # Outside regions
-    margin = 10
     outside_regions = []
     
     if clip_y > margin:
-        top = pixels[0:clip_y-margin, :]
-        top_diff = np.abs(top[:, :, :3].astype(int) - bg_color)
-        top_non_bg = np.sum(np.any(top_diff > bg_threshold, axis=2))
-        outside_regions.append(('top', top_non_bg, top.shape[0] * top.shape[1]))
+        top = non_bg[0:clip_y-margin, :]
+        outside_regions.append(('top', int(np.count_nonzero(top)), top.size))
     
     if clip_y + clip_h + margin < height:
-        bottom = pixels[clip_y+clip_h+margin:, :]
-        bottom_diff = np.abs(bottom[:, :, :3].astype(int) - bg_color)
-        bottom_non_bg = np.sum(np.any(bottom_diff > bg_threshold, axis=2))
-        outside_regions.append(('bottom', bottom_non_bg, bottom.shape[0] * bottom.shape[1]))
+        bottom = non_bg[clip_y+clip_h+margin:, :]
+        outside_regions.append(('bottom', int(np.count_nonzero(bottom)), bottom.size))
     
     if clip_x > margin:
-        left = pixels[:, 0:clip_x-margin]
-        left_diff = np.abs(left[:, :, :3].astype(int) - bg_color)
-        left_non_bg = np.sum(np.any(left_diff > bg_threshold, axis=2))
-        outside_regions.append(('left', left_non_bg, left.shape[0] * left.shape[1]))
+        left = non_bg[:, 0:clip_x-margin]
+        outside_regions.append(('left', int(np.count_nonzero(left)), left.size))
     
     if clip_x + clip_w + margin < width:
-        right = pixels[:, clip_x+clip_w+margin:]
-        right_diff = np.abs(right[:, :, :3].astype(int) - bg_color)
-        right_non_bg = np.sum(np.any(right_diff > bg_threshold, axis=2))
-        outside_regions.append(('right', right_non_bg, right.shape[0] * right.shape[1]))
+        right = non_bg[:, clip_x+clip_w+margin:]
+        outside_regions.append(('right', int(np.count_nonzero(right)), right.size))
     
     total_outside_non_bg = sum(r[1] for r in outside_regions)
     total_outside_pixels = sum(r[2] for r in outside_regions)
@@ -95,23 +94,21 @@ def main():
     print()
     
     # Initialize renderer
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Clipping Test"):
+    renderer = get_renderer(800, 700, "Clipping Test")
+    if renderer is None:
         print("✗ Failed to initialize renderer")
-        return False
+        return 1
     
     print("✓ Renderer initialized (800x700)")
     
     # Create scene
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0.0, 0.0, 800.0)
     camera.set_perspective(1.0472, 800.0/700.0, 0.1, 2000.0)
     
     # Load test image
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, "..", "samples", "data")
-    gradient_img = load_image_with_pillow(os.path.join(data_dir, "gradient.png"))
+    gradient_img = load_image_with_pillow(os.path.join(DATA_DIR, "gradient.png"))
     
     # Create Frame3D
     frame3d = ui.Frame3D(800, 600)
@@ -119,10 +116,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D with clipping
-    clip_panel = ui.Frame2D(500.0, 600.0)
-    clip_panel.set_position(150.0, 50.0)
-    clip_panel
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(500.0, 600.0, position=(150.0, 50.0), clipping_enabled=True)
     
     print("✓ Frame2D created at (150, 50) with size (500x600)")
     print("✓ Clipping ENABLED")
@@ -137,44 +131,19 @@ def main():
     # These should be clipped
     
     # Red - extends top
-    rect1 = ui.Rectangle(300.0, 300.0)
-    rect1.set_position(100.0, -100.0)
-    rect1.set_color(1.0, 0.0, 0.0, 1.0)
-    if gradient_img:
-        rect1.set_image(gradient_img)
-    clip_panel.add_child(rect1)
+    add_rect(clip_panel, 300.0, 300.0, 100.0, -100.0, (1.0, 0.0, 0.0, 1.0), gradient_img)
     
     # Blue - extends bottom
-    rect2 = ui.Rectangle(300.0, 300.0)
-    rect2.set_position(100.0, 400.0)
-    rect2.set_color(0.0, 0.0, 1.0, 1.0)
-    if gradient_img:
-        rect2.set_image(gradient_img)
-    clip_panel.add_child(rect2)
+    add_rect(clip_panel, 300.0, 300.0, 100.0, 400.0, (0.0, 0.0, 1.0, 1.0), gradient_img)
     
     # Yellow - extends left
-    rect3 = ui.Rectangle(300.0, 200.0)
-    rect3.set_position(-100.0, 200.0)
-    rect3.set_color(1.0, 1.0, 0.0, 1.0)
-    if gradient_img:
-        rect3.set_image(gradient_img)
-    clip_panel.add_child(rect3)
+    add_rect(clip_panel, 300.0, 200.0, -100.0, 200.0, (1.0, 1.0, 0.0, 1.0), gradient_img)
     
     # Magenta - extends right
-    rect4 = ui.Rectangle(300.0, 200.0)
-    rect4.set_position(300.0, 200.0)
-    rect4.set_color(1.0, 0.0, 1.0, 1.0)
-    if gradient_img:
-        rect4.set_image(gradient_img)
-    clip_panel.add_child(rect4)
+    add_rect(clip_panel, 300.0, 200.0, 300.0, 200.0, (1.0, 0.0, 1.0, 1.0), gradient_img)
     
     # Green - fully inside (for reference)
-    rect5 = ui.Rectangle(200.0, 200.0)
-    rect5.set_position(150.0, 200.0)
-    rect5.set_color(0.0, 1.0, 0.0, 1.0)
-    if gradient_img:
-        rect5.set_image(gradient_img)
-    clip_panel.add_child(rect5)
+    add_rect(clip_panel, 200.0, 200.0, 150.0, 200.0, (0.0, 1.0, 0.0, 1.0), gradient_img)
     
     frame3d.add_child(clip_panel)
     
@@ -192,19 +161,20 @@ def main():
     
     if pixel_data is None:
         print("✗ Failed to capture frame")
-        renderer.shutdown()
-        return False
+        return 1
     
     scale = width / 800
     print(f"✓ Captured {width}x{height} frame (scale: {scale}x)")
     
     # Save image
-    output_dir = os.path.join(script_dir, "output")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "clipping_test_final.png")
+    output_file = os.path.join(OUTPUT_DIR, "clipping_test_final.png")
     
-    if renderer.save_capture(output_file):
+    # Reuse the captured pixels rather than reading the framebuffer back again
+    try:
+        save_bgra_png(pixel_data, width, height, output_file)
         print(f"✓ Saved to: {output_file}")
+    except Exception as e:
+        print(f"Error saving {output_file}: {e}")
     
     print()
     print("="*70)
@@ -277,9 +247,7 @@ def main():
         print("="*70)
         success = False
     
-    renderer.shutdown()
-    return success
+    return 0 if success else 1
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    sys.exit(main())
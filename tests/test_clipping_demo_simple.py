@@ -8,18 +8,69 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from debug_session import get_renderer, new_scene
+import numpy as np
+from PIL import Image as PILImage
+
+
+# Channel values where any classify_color() comparison changes outcome;
+# every value in a level classifies the same way as the level's first value
+LEVEL_CUTS = np.array([50, 100, 101, 151, 201])
+LEVEL_VALUES = np.concatenate(([0], LEVEL_CUTS))
+CHANNEL_LEVEL = np.searchsorted(LEVEL_CUTS, np.arange(256), side='right').astype(np.uint8)
+NUM_LEVELS = len(LEVEL_VALUES)
+NUM_BUCKETS = 5
+
+
+def classify_color(r, g, b):
+    """Return the bucket for a pixel (yellow, magenta, red, blue, green) or None"""
+    if r > 150 and g > 150 and b < 100:
+        return 0  # Yellow (title)
+    elif r > 200 and g < 50 and b > 200:
+        return 1  # Magenta (moving text)
+    elif r > 200 and g < 100 and b < 100:
+        return 2  # Red
+    elif r < 100 and g > 100 and b > 200:
+        return 3  # Blue
+    elif r < 50 and g > 200 and b < 50:
+        return 4  # Green (borders)
+    return None
+
+
+# Bucket for each (r, g, b) level cell; NUM_BUCKETS means unclassified
+CELL_BUCKET = np.array([
+    NUM_BUCKETS if bucket is None else bucket
+    for r, g, b in np.ndindex(NUM_LEVELS, NUM_LEVELS, NUM_LEVELS)
+    for bucket in [classify_color(LEVEL_VALUES[r], LEVEL_VALUES[g], LEVEL_VALUES[b])]
+])
+
+
+def count_color_buckets(pixels):
+    """Count BGRA pixels per classify_color() bucket in a single pass.
+    
+    Each channel is mapped to its level through a 256-entry table, pixels
+    are histogrammed by level cell, and the cell counts are folded into
+    buckets; this gives the same counts as running classify_color() on
+    every pixel.
+    """
+    cell = CHANNEL_LEVEL[pixels[:, :, 2]].astype(np.intp) * (NUM_LEVELS * NUM_LEVELS)
+    cell += CHANNEL_LEVEL[pixels[:, :, 1]] * NUM_LEVELS
+    cell += CHANNEL_LEVEL[pixels[:, :, 0]]
+    cell_counts = np.bincount(cell.ravel(), minlength=NUM_LEVELS ** 3)
+    counts = np.bincount(CELL_BUCKET, weights=cell_counts, minlength=NUM_BUCKETS + 1)
+    return [int(c) for c in counts[:NUM_BUCKETS]]
 
 
 def main():
     print("Testing Simplified Clipping Demo Setup")
     print("=" * 70)
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Clipping Demo Test"):
+    renderer = get_renderer(800, 700, "Clipping Demo Test")
+    if renderer is None:
         print("Failed to initialize renderer")
         return 1
     
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0, 0, 800)
     camera.set_perspective(1.0472, 1600.0/1400.0, 0.1, 2000.0)
@@ -38,10 +89,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D with clipping
-    clip_panel = ui.Frame2D(500, 600)
-    clip_panel.set_position(150, 50)
-    clip_panel
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(500, 600, position=(150, 50), clipping_enabled=True)
     
     # Background
     bg = ui.Rectangle(500, 600)
@@ -96,46 +144,23 @@ def main():
     print("  - Text: 'MOVING TEXT' (48pt magenta)")
     print()
     
-    # Render
-    for i in range(10):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
-    
-    # Capture
-    os.makedirs("tests/output", exist_ok=True)
-    renderer.save_capture("tests/output/clipping_demo_simple.png")
+    # Render one frame; the scene is static, so extra frames add nothing
+    renderer.poll_events()
+    renderer.begin_frame()
+    renderer.render_scene(scene)
+    renderer.end_frame()
     
+    # Capture once, and save the PNG from the same pixels
     data, width, height = renderer.capture_frame()
     print(f"Captured: {width}x{height}")
     
-    # Analyze
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
-    
-    # Count colored pixels
-    yellow_count = 0  # Title
-    magenta_count = 0  # Moving text
-    red_count = 0
-    blue_count = 0
-    green_count = 0  # Borders
-    
-    for i in range(0, len(pixels), 4):
-        r, g, b = pixels[i+2], pixels[i+1], pixels[i]
-        
-        if r > 150 and g > 150 and b < 100:
-            yellow_count += 1
-        elif r > 200 and g < 50 and b > 200:
-            magenta_count += 1
-        elif r > 200 and g < 100 and b < 100:
-            red_count += 1
-        elif r < 100 and g > 100 and b > 200:
-            blue_count += 1
-        elif r < 50 and g > 200 and b < 50:
-            green_count += 1
+    os.makedirs("tests/output", exist_ok=True)
+    PILImage.frombuffer('RGBA', (width, height), data, 'raw', 'BGRA', 0, 1).save(
+        "tests/output/clipping_demo_simple.png", optimize=False, compress_level=1)
+    
+    # Analyze (BGRA)
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+    yellow_count, magenta_count, red_count, blue_count, green_count = count_color_buckets(pixels)
     
     total = width * height
     print()
@@ -179,7 +204,6 @@ def main():
         print("✗ Green borders NOT rendering")
         success = False
     
-    renderer.shutdown()
     return 0 if success else 1
 
 
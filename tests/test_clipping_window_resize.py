@@ -12,6 +12,7 @@ import sys
 sys.path.insert(0, '../build')
 
 import cyber_ui_core as ui
+import numpy as np
 import os
 
 def main():
@@ -38,49 +39,21 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D with clipping
-    clip_panel = ui.Frame2D(600.0, 500.0)
-    clip_panel.set_position(100.0, 50.0)
-    clip_panel
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(600.0, 500.0, position=(100.0, 50.0), clipping_enabled=True)
     
-    # Background
-    bg = ui.Rectangle(600.0, 500.0)
-    bg.set_position(0.0, 0.0)
-    bg.set_color(0.1, 0.1, 0.15, 1.0)
-    clip_panel.add_child(bg)
-    
-    # Borders - these should ALWAYS be visible
+    # Background, borders and test rectangle, built in one call.
+    # Columns: x, y, width, height, r, g, b, a
     border_width = 10.0
-    
-    # Top border (yellow)
-    border_top = ui.Rectangle(600.0, border_width)
-    border_top.set_position(0.0, 0.0)
-    border_top.set_color(1.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_top)
-    
-    # Bottom border (green)
-    border_bottom = ui.Rectangle(600.0, border_width)
-    border_bottom.set_position(0.0, 500.0 - border_width)
-    border_bottom.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_bottom)
-    
-    # Left border (cyan)
-    border_left = ui.Rectangle(border_width, 500.0)
-    border_left.set_position(0.0, 0.0)
-    border_left.set_color(0.0, 1.0, 1.0, 1.0)
-    clip_panel.add_child(border_left)
-    
-    # Right border (magenta)
-    border_right = ui.Rectangle(border_width, 500.0)
-    border_right.set_position(600.0 - border_width, 0.0)
-    border_right.set_color(1.0, 0.0, 1.0, 1.0)
-    clip_panel.add_child(border_right)
-    
-    # Test rectangle that extends beyond boundaries
-    test_rect = ui.Rectangle(400.0, 300.0)
-    test_rect.set_position(100.0, 100.0)
-    test_rect.set_color(1.0, 0.0, 0.0, 1.0)
-    clip_panel.add_child(test_rect)
+    clip_panel.add_rectangles(np.array([
+        [0.0, 0.0, 600.0, 500.0, 0.1, 0.1, 0.15, 1.0],                          # Background
+        # Borders - these should ALWAYS be visible
+        [0.0, 0.0, 600.0, border_width, 1.0, 1.0, 0.0, 1.0],                    # Top (yellow)
+        [0.0, 500.0 - border_width, 600.0, border_width, 0.0, 1.0, 0.0, 1.0],   # Bottom (green)
+        [0.0, 0.0, border_width, 500.0, 0.0, 1.0, 1.0, 1.0],                    # Left (cyan)
+        [600.0 - border_width, 0.0, border_width, 500.0, 1.0, 0.0, 1.0, 1.0],   # Right (magenta)
+        # Test rectangle that extends beyond boundaries
+        [100.0, 100.0, 400.0, 300.0, 1.0, 0.0, 0.0, 1.0],
+    ], dtype=np.float32))
     
     frame3d.add_child(clip_panel)
     
@@ -92,8 +65,13 @@ def main():
     print("- ALL 4 borders should be visible")
     print("- Borders should stay at Frame2D edges regardless of window size")
     print("- Red rectangle should be clipped at border edges")
-    print("\nResize the window and verify borders remain visible!")
-    print("Press ESC to exit\n")
+    
+    # The capture only needs frame 5; keep the window open for manual resizing
+    # only when asked to
+    interactive = bool(os.environ.get("CYBER_UI_INTERACTIVE"))
+    if interactive:
+        print("\nResize the window and verify borders remain visible!")
+        print("Press ESC to exit\n")
     
     # Render loop
     frame_count = 0
@@ -101,7 +79,14 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     
     while not renderer.should_close():
-        renderer.poll_events()
+        if frame_count < 5:
+            renderer.poll_events()
+        elif interactive:
+            # The scene is static: sleep until input (e.g. a resize) instead of
+            # redrawing identical frames at vsync rate
+            renderer.wait_events(0.1)
+        else:
+            break
         
         if renderer.begin_frame():
             renderer.render_scene(scene)
@@ -8,6 +8,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 import cyber_ui_core as ui
 import time
 
+# V-Sync locks the rate, so one second is enough to tell ~60 FPS apart from
+# unlimited; CYBER_UI_LONG_TEST=1 restores the 5 second run for release checks
+LONG_TEST = bool(os.environ.get("CYBER_UI_LONG_TEST"))
+DURATION_NS = (5 if LONG_TEST else 1) * 1_000_000_000
+INTERVAL_NS = 250_000_000
+
 def test_fps_limit(backend_name):
     """Test FPS limiting for a specific backend."""
     print(f"\n{'='*60}")
@@ -44,36 +50,46 @@ def test_fps_limit(backend_name):
     
     scene.add_frame3d(frame)
     
-    # Run for 5 seconds and measure FPS
-    start_time = time.time()
+    # The scene is static: record its draw list once and replay it every frame
+    compiled = renderer.compile_scene(scene)
+    
+    # Measure FPS over DURATION_NS (monotonic integer nanoseconds)
+    start_time = time.perf_counter_ns()
     frame_count = 0
+    total_frames = 0
     last_fps_time = start_time
     fps_samples = []
     
-    print("Running for 5 seconds to measure FPS...")
+    print(f"Running for {DURATION_NS // 1_000_000_000} seconds to measure FPS...")
     print("Expected: ~60 FPS with V-Sync enabled\n")
     
-    while time.time() - start_time < 5.0 and not renderer.should_close():
+    current_time = start_time
+    while current_time - start_time < DURATION_NS and not renderer.should_close():
         renderer.begin_frame()
-        renderer.render_scene(scene)
+        renderer.render_compiled(compiled)
         renderer.end_frame()
         renderer.poll_events()
         
         frame_count += 1
+        total_frames += 1
         
-        # Calculate FPS every 0.5 seconds
-        current_time = time.time()
-        if current_time - last_fps_time >= 0.5:
-            elapsed = current_time - last_fps_time
-            fps = frame_count / elapsed
-            fps_samples.append(fps)
-            print(f"Current FPS: {fps:.2f}")
+        # Sample FPS every 0.25 seconds; samples are printed after the loop so
+        # no I/O happens inside the measurement window
+        current_time = time.perf_counter_ns()
+        if current_time - last_fps_time >= INTERVAL_NS:
+            elapsed = (current_time - last_fps_time) * 1e-9
+            fps_samples.append((current_time, frame_count / elapsed))
             frame_count = 0
             last_fps_time = current_time
     
+    for sample_time, fps in fps_samples:
+        print(f"  {(sample_time - start_time) * 1e-9:5.2f}s  FPS: {fps:.2f}")
+    fps_samples = [fps for _, fps in fps_samples]
+    
     # Calculate statistics
-    total_time = time.time() - start_time
-    avg_fps = sum(fps_samples) / len(fps_samples) if fps_samples else 0
+    total_time = (time.perf_counter_ns() - start_time) * 1e-9
+    # Average over the whole run; short windows quantize to whole frames
+    avg_fps = total_frames / total_time if total_time > 0 else 0
     min_fps = min(fps_samples) if fps_samples else 0
     max_fps = max(fps_samples) if fps_samples else 0
     
@@ -5,40 +5,53 @@ import sys
 sys.path.insert(0, 'build')
 
 import cyber_ui_core as ui
-import time
 
-def test_fps_opengl():
-    """Test FPS measurement with OpenGL renderer."""
-    print("Testing FPS measurement with OpenGL renderer...")
-    
-    renderer = ui.create_opengl_renderer()
-    renderer.initialize(800, 600, "FPS Test - OpenGL")
-    
-    # Create simple scene
-    rect = ui.Rectangle(100, 100)
-    rect.set_position(350, 250)
-    rect.set_color(1.0, 0.5, 0.0, 1.0)
+# One initialized renderer per backend, shared by every test in this run
+_renderers = {}
+
+def get_renderer(backend):
+    """Return the shared renderer for a backend, creating it on first use."""
+    renderer = _renderers.get(backend)
+    if renderer is None:
+        if backend == "metal":
+            renderer = ui.create_metal_renderer()
+        else:
+            renderer = ui.create_opengl_renderer()
+        renderer.initialize(800, 600, f"FPS Test - {backend}")
+        _renderers[backend] = renderer
+    return renderer
+
+def run_frames(renderer, obj, max_frames=120):
+    """Render obj for up to max_frames frames (~2 seconds at 60 FPS)."""
+    # Start from zero so earlier tests on this renderer don't skew the numbers
+    renderer.reset_fps_counters()
     
-    # Run for a short time
     frame_count = 0
-    max_frames = 120  # Run for ~2 seconds at 60 FPS
-    
     while not renderer.should_close() and frame_count < max_frames:
         renderer.begin_frame()
-        renderer.render_object(root)
+        renderer.render_object(obj)
         renderer.end_frame()
         renderer.poll_events()
         frame_count += 1
     
-    # Get FPS before shutdown
     fps = renderer.get_fps()
     total_frames = renderer.get_frame_count()
     
     print(f"Current FPS: {fps:.2f}")
     print(f"Total frames rendered: {total_frames}")
+
+def test_fps_opengl():
+    """Test FPS measurement with OpenGL renderer."""
+    print("Testing FPS measurement with OpenGL renderer...")
     
-    # Shutdown will print final statistics
-    renderer.shutdown()
+    renderer = get_renderer("opengl")
+    
+    # Create simple scene
+    rect = ui.Rectangle(100, 100)
+    rect.set_position(350, 250)
+    rect.set_color(1.0, 0.5, 0.0, 1.0)
+    
+    run_frames(renderer, rect)
     
     print("✓ OpenGL FPS test completed\n")
 
@@ -46,41 +59,29 @@ def test_fps_metal():
     """Test FPS measurement with Metal renderer."""
     print("Testing FPS measurement with Metal renderer...")
     
-    renderer = ui.create_metal_renderer()
-    renderer.initialize(800, 600, "FPS Test - Metal")
+    renderer = get_renderer("metal")
     
     # Create simple scene
     rect = ui.Rectangle(100, 100)
     rect.set_position(350, 250)
     rect.set_color(0.0, 0.5, 1.0, 1.0)
     
-    # Run for a short time
-    frame_count = 0
-    max_frames = 120  # Run for ~2 seconds at 60 FPS
-    
-    while not renderer.should_close() and frame_count < max_frames:
-        renderer.begin_frame()
-        renderer.render_object(rect)
-        renderer.end_frame()
-        renderer.poll_events()
-        frame_count += 1
-    
-    # Get FPS before shutdown
-    fps = renderer.get_fps()
-    total_frames = renderer.get_frame_count()
-    
-    print(f"Current FPS: {fps:.2f}")
-    print(f"Total frames rendered: {total_frames}")
-    
-    # Shutdown will print final statistics
-    renderer.shutdown()
+    run_frames(renderer, rect)
     
     print("✓ Metal FPS test completed\n")
 
 if __name__ == "__main__":
     print("=== FPS Measurement Test ===\n")
     
-    # Test Metal renderer (OpenGL not available on this build)
-    test_fps_metal()
+    # Only one backend is compiled into a build; test whichever is usable
+    backends = ui.available_backends()
+    if "metal" in backends:
+        test_fps_metal()
+    if "opengl" in backends:
+        test_fps_opengl()
+    
+    # Shutdown prints final statistics
+    for renderer in _renderers.values():
+        renderer.shutdown()
     
     print("=== All FPS tests completed ===")
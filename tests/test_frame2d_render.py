@@ -8,12 +8,16 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from pixel_masks import bgra_words, count_rgb_range
 
 
 def main():
     print("Testing Frame2D rendering...")
     
     renderer = ui.create_metal_renderer()
+    # Pixel counts don't need Retina resolution; CYBER_UI_VISUAL_TEST=1 keeps it
+    if not os.environ.get("CYBER_UI_VISUAL_TEST"):
+        renderer.set_content_scale(1.0)
     if not renderer.initialize(800, 600, "Frame2D Test"):
         print("Failed to initialize renderer")
         return 1
@@ -27,9 +31,7 @@ def main():
     frame3d.set_position(0, 0, 0)
     
     # Create Frame2D with a simple white rectangle
-    frame2d = ui.Frame2D(400, 400)
-    frame2d.set_position(0, 0)  # Center
-    frame2d
+    frame2d = ui.Frame2D(400, 400, position=(0, 0))  # Center
     
     rect = ui.Rectangle(200, 200)
     rect.set_position(200, 200)  # Center in Frame2D
@@ -45,14 +47,11 @@ def main():
     print("  White rectangle at (200, 200) size (200x200)")
     print()
     
-    # Render
-    for i in range(5):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
+    # Render a single frame; the scene is static and capture_frame() waits for the GPU
+    renderer.poll_events()
+    renderer.begin_frame()
+    renderer.render_scene(scene)
+    renderer.end_frame()
     
     # Capture
     data, width, height = renderer.capture_frame()
@@ -65,23 +64,13 @@ def main():
     renderer.save_capture("tests/output/frame2d_test.png")
     print(f"Saved: tests/output/frame2d_test.png ({width}x{height})")
     
-    # Analyze
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
+    # Analyze (BGRA, one uint32 word per pixel)
+    words = bgra_words(data, width, height)
     
     # Count white pixels
-    white_count = 0
-    bg_count = 0
-    other_count = 0
-    
-    for i in range(0, len(pixels), 4):
-        r, g, b, a = pixels[i+2], pixels[i+1], pixels[i], pixels[i+3]
-        if r > 250 and g > 250 and b > 250:
-            white_count += 1
-        elif r < 30 and g < 30 and b < 30:
-            bg_count += 1
-        else:
-            other_count += 1
+    white_count = count_rgb_range(words, min_rgb=(251, 251, 251))
+    bg_count = count_rgb_range(words, max_rgb=(29, 29, 29))
+    other_count = width * height - white_count - bg_count
     
     total = width * height
     print()
@@ -91,11 +80,13 @@ def main():
     print(f"  Other:        {other_count:,} ({other_count/total*100:.2f}%)")
     print()
     
-    # Expected: 200x200 rectangle at 2x scale = 400x400 pixels = 160,000 pixels
-    # In 1600x1200 image = 13.3%
-    expected_pct = 160000 / total * 100
+    # Expected: 200x200 rectangle scaled by the drawable's pixels per point
+    # (1x: 40,000 pixels, 2x Retina: 160,000 pixels) = 13.3% of the image
+    scale = width / 800
+    expected_count = 200 * 200 * scale * scale
+    expected_pct = expected_count / total * 100
     
-    if white_count > 100000:
+    if white_count > expected_count * 0.625:
         print(f"✓ Frame2D is rendering! ({white_count:,} white pixels)")
         print(f"  Expected ~{expected_pct:.1f}%, got {white_count/total*100:.1f}%")
         success = True
@@ -8,6 +8,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from pixel_masks import bgra_words, count_rgb_range
 
 
 def main():
@@ -15,6 +16,9 @@ def main():
     print("=" * 70)
     
     renderer = ui.create_metal_renderer()
+    # Pixel counts don't need Retina resolution; CYBER_UI_VISUAL_TEST=1 keeps it
+    if not os.environ.get("CYBER_UI_VISUAL_TEST"):
+        renderer.set_content_scale(1.0)
     if not renderer.initialize(800, 600, "Frame2D Simple Test"):
         print("Failed to initialize renderer")
         return 1
@@ -35,9 +39,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D
-    frame2d = ui.Frame2D(400, 400)
-    frame2d.set_position(0, 0)  # Center of screen
-    frame2d
+    frame2d = ui.Frame2D(400, 400, position=(0, 0))  # Center of screen
     
     # Add a bright red rectangle
     rect = ui.Rectangle(200, 200)
@@ -53,14 +55,11 @@ def main():
     print("     └─ Red Rectangle at (200, 200) size (200x200)")
     print()
     
-    # Render
-    for i in range(10):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
+    # Render a single frame; the scene is static and capture_frame() waits for the GPU
+    renderer.poll_events()
+    renderer.begin_frame()
+    renderer.render_scene(scene)
+    renderer.end_frame()
     
     # Capture
     os.makedirs("tests/output", exist_ok=True)
@@ -69,15 +68,10 @@ def main():
     data, width, height = renderer.capture_frame()
     print(f"Captured: {width}x{height}")
     
-    # Analyze
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
+    # Analyze (BGRA, one uint32 word per pixel)
+    words = bgra_words(data, width, height)
     
-    red_count = 0
-    for i in range(0, len(pixels), 4):
-        r, g, b = pixels[i+2], pixels[i+1], pixels[i]
-        if r > 200 and g < 50 and b < 50:
-            red_count += 1
+    red_count = count_rgb_range(words, min_rgb=(201, 0, 0), max_rgb=(255, 49, 49))
     
     total = width * height
     print(f"Red pixels: {red_count:,} ({red_count/total*100:.2f}%)")
@@ -8,6 +8,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from pixel_masks import bgra_words, count_rgb_range
 
 
 def main():
@@ -15,6 +16,9 @@ def main():
     print("=" * 70)
     
     renderer = ui.create_metal_renderer()
+    # Pixel counts don't need Retina resolution; CYBER_UI_VISUAL_TEST=1 keeps it
+    if not os.environ.get("CYBER_UI_VISUAL_TEST"):
+        renderer.set_content_scale(1.0)
     if not renderer.initialize(800, 600, "Frame3D Test"):
         print("Failed to initialize renderer")
         return 1
@@ -40,14 +44,11 @@ def main():
     print("  └─ Green Rectangle at (0, 0) size (200x200)")
     print()
     
-    # Render
-    for i in range(10):
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-        renderer.begin_frame()
-        renderer.render_scene(scene)
-        renderer.end_frame()
+    # Render a single frame; the scene is static and capture_frame() waits for the GPU
+    renderer.poll_events()
+    renderer.begin_frame()
+    renderer.render_scene(scene)
+    renderer.end_frame()
     
     # Capture
     os.makedirs("tests/output", exist_ok=True)
@@ -56,15 +57,10 @@ def main():
     data, width, height = renderer.capture_frame()
     print(f"Captured: {width}x{height}")
     
-    # Analyze
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
+    # Analyze (BGRA, one uint32 word per pixel)
+    words = bgra_words(data, width, height)
     
-    green_count = 0
-    for i in range(0, len(pixels), 4):
-        r, g, b = pixels[i+2], pixels[i+1], pixels[i]
-        if g > 200 and r < 50 and b < 50:
-            green_count += 1
+    green_count = count_rgb_range(words, min_rgb=(0, 201, 0), max_rgb=(49, 255, 49))
     
     total = width * height
     print(f"Green pixels: {green_count:,} ({green_count/total*100:.2f}%)")
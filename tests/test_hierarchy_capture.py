@@ -6,13 +6,14 @@ Capture a single frame from hierarchy demo to verify Frame2D works there.
 import sys
 import os
 
-# Run hierarchy demo for 1 frame and capture
-sys.path.insert(0, '../build')
-os.chdir('../samples/basic')
+# Paths are built from this file's location, so the working directory is never changed
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..', 'build'))
 
-# Import after changing directory
+# Run hierarchy demo for 1 frame and capture
 import cyber_ui_core as ui
-from PIL import Image as PILImage
+import numpy as np
 
 # Just run the first part of hierarchy demo
 renderer = ui.create_metal_renderer()
@@ -30,10 +31,7 @@ frame3d.set_position(0.0, 0.0, 0.0)
 scene.add_frame3d(frame3d)
 
 # Create a simple Frame2D like in hierarchy demo
-left_panel = ui.Frame2D(250.0, 650.0)
-left_panel.set_position(50.0, 50.0)
-left_panel
-left_panel.set_clipping_enabled(True)
+left_panel = ui.Frame2D(250.0, 650.0, position=(50.0, 50.0), clipping_enabled=True)
 
 # Background
 left_bg = ui.Rectangle(250.0, 650.0)
@@ -54,23 +52,23 @@ if renderer.begin_frame():
     renderer.render_scene(scene)
     renderer.end_frame()
 
-# Capture
-os.chdir('../../tests')
-output_file = "output/hierarchy_test_capture.png"
-os.makedirs("output", exist_ok=True)
+# Capture straight into an array; the PNG is only written on request
+pixels = renderer.capture_to_numpy()
 
-if renderer.save_capture(output_file):
-    print(f"Saved to: {output_file}")
-    
-    img = PILImage.open(output_file)
-    pixels = list(img.getdata())
-    
-    bg_color = (26, 26, 26, 255)
-    non_bg = sum(1 for p in pixels if abs(p[0] - bg_color[0]) > 30 or 
-                  abs(p[1] - bg_color[1]) > 30 or 
-                  abs(p[2] - bg_color[2]) > 30)
+if os.environ.get("CYBER_UI_SAVE_CAPTURES"):
+    output_file = os.path.join(OUTPUT_DIR, "hierarchy_test_capture.png")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if renderer.save_capture(output_file):
+        print(f"Saved to: {output_file}")
+
+if pixels is not None:
+    # Background is 26 ± 30 per channel (L-infinity distance). The lower bound
+    # clamps to 0, so a pixel is off-background exactly when its largest
+    # channel exceeds 26 + 30: one max reduction and one compare
+    non_bg = int(np.count_nonzero(pixels[:, :, :3].max(axis=2) > 26 + 30))
+    total = pixels.shape[0] * pixels.shape[1]
     
-    print(f"Non-background: {non_bg} ({non_bg/len(pixels)*100:.2f}%)")
+    print(f"Non-background: {non_bg} ({non_bg/total*100:.2f}%)")
     
     if non_bg > 0:
         print("✓ Frame2D content is visible!")
@@ -47,28 +47,23 @@ rect = ui.Rectangle(400, 400)
 rect.set_position(200, 100)  # Center-ish
 rect.set_color(1.0, 0.0, 0.0, 1.0)  # Bright red
 frame.add_child(rect)
-print(f"   Rectangle size: {rect.get_size()}")
-print(f"   Rectangle position: {rect.get_position()}")
-print(f"   Rectangle color: {rect.get_color()}")
+state = rect.snapshot()
+print(f"   Rectangle size: {state['size']}")
+print(f"   Rectangle position: {state['position']}")
+print(f"   Rectangle color: {state['color']}")
 print("   ✓ Rectangle created\n")
 
 # Render loop
 print("6. Starting render loop...")
 print("   Press ESC or close window to exit\n")
 
-frame_count = 0
 max_frames = 300  # Run for ~5 seconds at 60fps
 
-while not renderer.should_close() and frame_count < max_frames:
-    if renderer.begin_frame():
-        renderer.render_scene(scene)
-        renderer.end_frame()
-    
-    renderer.poll_events()
-    frame_count += 1
-    
-    if frame_count % 60 == 0:
-        print(f"   Rendered {frame_count} frames...")
+def report_progress(frames, frame_ms):
+    print(f"   Rendered {frames} frames... (last frame {frame_ms:.2f} ms)")
+
+# The scene is static, so the whole loop runs native-side
+frame_count = renderer.run_static(scene, max_frames, report_every=60, progress=report_progress)
 
 print(f"\n7. Rendered {frame_count} frames total")
 print("   Shutting down...\n")
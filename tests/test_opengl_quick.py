@@ -21,6 +21,9 @@ if not renderer.initialize(600, 600, "OpenGL Quick Test"):
     print("ERROR: Failed to initialize renderer!")
     sys.exit(1)
 
+# Only one frame is rendered; don't wait for the display refresh on it
+renderer.set_vsync_enabled(False)
+
 # Create red rectangle
 rect = ui.Rectangle(400, 400)
 rect.set_position(100, 100)
@@ -30,7 +33,7 @@ print("Rendering single frame...")
 
 # Render one frame
 if renderer.begin_frame():
-    renderer.render_object(rect)
+    renderer.render_object_batch([rect])
     renderer.end_frame()
     print("Frame rendered successfully")
 else:
@@ -43,12 +46,15 @@ print("\nWindow will stay open for 5 seconds...")
 print("You should see a RED 400x400 rectangle at position (100, 100)")
 print("Press ESC to close early\n")
 
-for i in range(50):
-    renderer.poll_events()
-    if renderer.should_close():
-        print("Window closed by user")
+# Sleep in wait_events() until the deadline; any event (mouse, ESC) wakes it early
+deadline = time.monotonic() + 5.0
+while not renderer.should_close():
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
         break
-    time.sleep(0.1)
+    renderer.wait_events(remaining)
+else:
+    print("Window closed by user")
 
 renderer.shutdown()
 print("Test complete!")
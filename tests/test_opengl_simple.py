@@ -10,19 +10,21 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
 
 import cyber_ui_core as ui
+from debug_session import get_renderer, new_scene
 
-print("Testing OpenGL backend...")
 
-# Create renderer
-renderer = ui.create_opengl_renderer()
-print("✓ OpenGL renderer created")
-
-# Initialize
-if renderer.initialize(800, 600, "OpenGL Test"):
+def main():
+    print("Testing OpenGL backend...")
+    
+    # Shared OpenGL renderer (see debug_session.py)
+    renderer = get_renderer(800, 600, "OpenGL Test", backend="opengl")
+    if renderer is None:
+        print("✗ Failed to initialize OpenGL renderer")
+        return 1
     print("✓ OpenGL renderer initialized")
     
     # Create simple scene
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0, 0, 500)
     
@@ -39,21 +41,12 @@ if renderer.initialize(800, 600, "OpenGL Test"):
     print("✓ Scene created")
     
     # Render a few frames
-    for i in range(3):
-        if renderer.begin_frame():
-            renderer.render_scene(scene)
-            renderer.end_frame()
-        renderer.poll_events()
-        if renderer.should_close():
-            break
-    
-    print("✓ Rendered 3 frames successfully")
-    
-    # Shutdown
-    renderer.shutdown()
-    print("✓ OpenGL renderer shutdown")
+    frame_count = renderer.run_static(scene, 3)
     
+    print(f"✓ Rendered {frame_count} frames successfully")
     print("\n✅ OpenGL backend test PASSED!")
-else:
-    print("✗ Failed to initialize OpenGL renderer")
-    sys.exit(1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,7 +43,7 @@ print("Rendering... (window should be visible now)")
 frame_count = 0
 while not renderer.should_close():
     if renderer.begin_frame():
-        renderer.render_object(rect)
+        renderer.render_object_batch([rect])
         renderer.end_frame()
     
     renderer.poll_events()
@@ -10,6 +10,8 @@ sys.path.insert(0, '../build')
 import cyber_ui_core as ui
 import os
 
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+
 def main():
     print("=== Simple Clipping Border Test ===\n")
     
@@ -34,10 +36,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D - CENTERED, NO OFFSET
-    clip_panel = ui.Frame2D(400.0, 400.0)
-    clip_panel.set_position(0.0, 0.0)  # At origin
-    clip_panel  # Smaller, centered
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(400.0, 400.0, position=(0.0, 0.0), clipping_enabled=True)  # At origin
     
     # Background - should fill entire Frame2D
     bg = ui.Rectangle(400.0, 400.0)
@@ -92,20 +91,26 @@ def main():
     print("\nPress ESC to exit\n")
     
     # Render a few frames and capture
-    output_dir = os.path.join(os.path.dirname(__file__), "output")
-    os.makedirs(output_dir, exist_ok=True)
+    # Compiled, the background, borders and test rectangle are one draw call
+    compiled = renderer.compile_scene(scene)
+    draw_count = compiled.get_rectangle_draw_count()
+    if draw_count == 1:
+        print("✓ Compiled: 6 Frame2D children merged into 1 draw call")
+    else:
+        print(f"✗ Compiled: expected 1 merged draw call, got {draw_count}")
     
     frame_count = 0
     while not renderer.should_close() and frame_count < 10:
         renderer.poll_events()
         
         if renderer.begin_frame():
-            renderer.render_scene(scene)
+            renderer.render_compiled(compiled)
             renderer.end_frame()
             frame_count += 1
             
             if frame_count == 5:
-                filename = os.path.join(output_dir, "simple_clipping_test.png")
+                filename = os.path.join(OUTPUT_DIR, "simple_clipping_test.png")
+                os.makedirs(OUTPUT_DIR, exist_ok=True)
                 if renderer.save_capture(filename):
                     print(f"✓ Captured: {filename}")
                     break
@@ -7,9 +7,11 @@ import sys
 sys.path.insert(0, '../build')
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
+import numpy as np
 import os
 
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+
 def main():
     print("=== Simple Rectangle Test ===\n")
     
@@ -61,25 +63,23 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, "output")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "simple_rect_test.png")
+    # Capture straight into an array; the PNG is only written on request
+    pixels = renderer.capture_to_numpy()
     
-    if renderer.save_capture(output_file):
-        print(f"✓ Saved to: {output_file}\n")
-        
-        # Analyze
-        img = PILImage.open(output_file)
-        pixels = list(img.getdata())
-        
-        bg_color = (26, 26, 26, 255)
-        non_bg_count = sum(1 for p in pixels if abs(p[0] - bg_color[0]) > 30 or 
-                          abs(p[1] - bg_color[1]) > 30 or 
-                          abs(p[2] - bg_color[2]) > 30)
+    if os.environ.get("CYBER_UI_SAVE_CAPTURES"):
+        output_file = os.path.join(OUTPUT_DIR, "simple_rect_test.png")
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        if renderer.save_capture(output_file):
+            print(f"✓ Saved to: {output_file}\n")
+    
+    if pixels is not None:
+        # Background is 26 ± 30 per channel (L-infinity distance). The lower bound
+        # clamps to 0, so a pixel is off-background exactly when its largest
+        # channel exceeds 26 + 30: one max reduction and one compare
+        non_bg_count = int(np.count_nonzero(pixels[:, :, :3].max(axis=2) > 26 + 30))
+        total = pixels.shape[0] * pixels.shape[1]
         
-        print(f"Non-background pixels: {non_bg_count} ({non_bg_count/len(pixels)*100:.2f}%)")
+        print(f"Non-background pixels: {non_bg_count} ({non_bg_count/total*100:.2f}%)")
         
         if non_bg_count > 0:
             print("✓ Rectangles are visible!")
@@ -5,9 +5,22 @@ Test if text renders in Frame2D.
 
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'build'))
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..', 'build'))
 
 import cyber_ui_core as ui
+import numpy as np
+
+
+# Per-channel lookup tables for "yellow" (r > 200, g > 200, b < 50), built once at
+# import: a pixel matches when all three table lookups are 1
+YELLOW_R = np.zeros(256, dtype=np.uint8)
+YELLOW_R[201:] = 1
+YELLOW_G = YELLOW_R.copy()
+YELLOW_B = np.zeros(256, dtype=np.uint8)
+YELLOW_B[:50] = 1
 
 
 def main():
@@ -19,6 +32,9 @@ def main():
         print("Failed to initialize renderer")
         return 1
     
+    # Both captures below read the staging copy made at the end of the last frame
+    renderer.set_async_capture_enabled(True)
+    
     scene = ui.SceneRoot()
     camera = scene.get_camera()
     camera.set_position(0, 0, 800)
@@ -36,9 +52,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D
-    frame2d = ui.Frame2D(600, 400)
-    frame2d.set_position(0, 0)
-    frame2d
+    frame2d = ui.Frame2D(600, 400, position=(0, 0))
     
     # Add text
     text = ui.Text("HELLO WORLD")
@@ -65,22 +79,18 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
     
-    # Capture
-    os.makedirs("tests/output", exist_ok=True)
-    renderer.save_capture("tests/output/text_test.png")
+    # Capture; the PNG is only written on request
+    if os.environ.get("CYBER_UI_SAVE_CAPTURES"):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        renderer.save_capture(os.path.join(OUTPUT_DIR, "text_test.png"))
     
-    data, width, height = renderer.capture_frame()
+    # (height, width, 4) BGRA array
+    pixels = renderer.capture_to_numpy()
+    height, width = pixels.shape[:2]
     print(f"Captured: {width}x{height}")
     
-    # Analyze
-    import struct
-    pixels = struct.unpack(f'{len(data)}B', data)
-    
-    yellow_count = 0
-    for i in range(0, len(pixels), 4):
-        r, g, b = pixels[i+2], pixels[i+1], pixels[i]
-        if r > 200 and g > 200 and b < 50:
-            yellow_count += 1
+    matches = YELLOW_R[pixels[:, :, 2]] & YELLOW_G[pixels[:, :, 1]] & YELLOW_B[pixels[:, :, 0]]
+    yellow_count = int(np.count_nonzero(matches))
     
     total = width * height
     print(f"Yellow pixels: {yellow_count:,} ({yellow_count/total*100:.2f}%)")
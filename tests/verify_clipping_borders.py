@@ -4,30 +4,49 @@ Verify that all 4 borders are visible in clipping demo captures.
 This checks that the scissor rect fix is working correctly.
 """
 
-from PIL import Image
+import numpy as np
 import sys
 import os
 
 def check_border_visibility(image_path):
-    """Check if all 4 colored borders are visible in the image"""
-    img = Image.open(image_path)
-    pixels = img.load()
-    width, height = img.size
+    """Check if all 4 colored borders are visible in a saved capture"""
+    # PIL is only needed to decode files; live captures go to check_border_pixels()
+    from PIL import Image
+    with Image.open(image_path) as img:
+        pixels = np.asarray(img.convert('RGB'))
+    return check_border_pixels(pixels, os.path.basename(image_path))
+
+def check_border_pixels(pixels, label):
+    """Check if all 4 colored borders are visible in an (height, width, 3+) RGB array"""
+    height, width = pixels.shape[:2]
     
     # Expected border colors (approximate, allowing for some variation)
     # Top: Yellow (1.0, 1.0, 0.0)
     # Bottom: Green (0.0, 1.0, 0.0)
     # Left: Cyan (0.0, 1.0, 1.0)
     # Right: Magenta (1.0, 0.0, 1.0) - but demo shows green
+    # Each predicate takes an (N, 3) array of sampled RGB pixels
+    
+    def is_yellow(px):
+        return (px[:, 0] > 200) & (px[:, 1] > 200) & (px[:, 2] < 100)
     
-    def is_yellow(r, g, b):
-        return r > 200 and g > 200 and b < 100
+    def is_green(px):
+        return (px[:, 0] < 100) & (px[:, 1] > 200) & (px[:, 2] < 100)
     
-    def is_green(r, g, b):
-        return r < 100 and g > 200 and b < 100
+    def is_cyan(px):
+        return (px[:, 0] < 100) & (px[:, 1] > 200) & (px[:, 2] > 200)
     
-    def is_cyan(r, g, b):
-        return r < 100 and g > 200 and b > 200
+    def sample_row(y, x_start, x_stop):
+        """Every 20th pixel of row y in [x_start, x_stop), skipping out-of-image samples."""
+        xs = np.arange(x_start, x_stop, 20)
+        xs = xs[(xs >= 0) & (xs < width)]
+        return pixels[y, xs] if 0 <= y < height else pixels[:0, 0]
+    
+    def sample_column(x, y_start, y_stop):
+        """Every 20th pixel of column x in [y_start, y_stop), skipping out-of-image samples."""
+        ys = np.arange(y_start, y_stop, 20)
+        ys = ys[(ys >= 0) & (ys < height)]
+        return pixels[ys, x] if 0 <= x < width else pixels[:0, 0]
     
     # Sample pixels from each border region
     # Borders are at Frame2D position (150, 50) with size (500, 600)
@@ -42,42 +61,22 @@ def check_border_visibility(image_path):
     border_thickness = 8 * scale
     
     # Check top border (yellow)
-    top_yellow_count = 0
-    for x in range(frame_x + 50, frame_x + frame_w - 50, 20):
-        y = frame_y + border_thickness // 2
-        if 0 <= x < width and 0 <= y < height:
-            r, g, b = pixels[x, y][:3]
-            if is_yellow(r, g, b):
-                top_yellow_count += 1
+    top = sample_row(frame_y + border_thickness // 2, frame_x + 50, frame_x + frame_w - 50)
+    top_yellow_count = int(np.count_nonzero(is_yellow(top)))
     
     # Check bottom border (green)
-    bottom_green_count = 0
-    for x in range(frame_x + 50, frame_x + frame_w - 50, 20):
-        y = frame_y + frame_h - border_thickness // 2
-        if 0 <= x < width and 0 <= y < height:
-            r, g, b = pixels[x, y][:3]
-            if is_green(r, g, b):
-                bottom_green_count += 1
+    bottom = sample_row(frame_y + frame_h - border_thickness // 2, frame_x + 50, frame_x + frame_w - 50)
+    bottom_green_count = int(np.count_nonzero(is_green(bottom)))
     
     # Check left border (cyan)
-    left_cyan_count = 0
-    for y in range(frame_y + 50, frame_y + frame_h - 50, 20):
-        x = frame_x + border_thickness // 2
-        if 0 <= x < width and 0 <= y < height:
-            r, g, b = pixels[x, y][:3]
-            if is_cyan(r, g, b):
-                left_cyan_count += 1
+    left = sample_column(frame_x + border_thickness // 2, frame_y + 50, frame_y + frame_h - 50)
+    left_cyan_count = int(np.count_nonzero(is_cyan(left)))
     
     # Check right border (green)
-    right_green_count = 0
-    for y in range(frame_y + 50, frame_y + frame_h - 50, 20):
-        x = frame_x + frame_w - border_thickness // 2
-        if 0 <= x < width and 0 <= y < height:
-            r, g, b = pixels[x, y][:3]
-            if is_green(r, g, b):
-                right_green_count += 1
-    
-    print(f"\nBorder visibility check for: {os.path.basename(image_path)}")
+    right = sample_column(frame_x + frame_w - border_thickness // 2, frame_y + 50, frame_y + frame_h - 50)
+    right_green_count = int(np.count_nonzero(is_green(right)))
+    
+    print(f"\nBorder visibility check for: {label}")
     print(f"  Top border (yellow):    {top_yellow_count} pixels")
     print(f"  Bottom border (green):  {bottom_green_count} pixels")
     print(f"  Left border (cyan):     {left_cyan_count} pixels")
@@ -8,41 +8,23 @@ import sys
 sys.path.insert(0, '../build')
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage, ImageDraw, ImageFont
+from PIL import Image as PILImage
+import numpy as np
 import os
-
-def load_image_with_pillow(filepath):
-    """Load an image using Pillow and return a cyber_ui Image object"""
-    if not os.path.exists(filepath):
-        return None
-    
-    try:
-        pil_img = PILImage.open(filepath)
-        if pil_img.mode != 'RGBA':
-            pil_img = pil_img.convert('RGBA')
-        
-        img_bytes = pil_img.tobytes()
-        ui_img = ui.Image()
-        width, height = pil_img.size
-        channels = 4
-        
-        if ui_img.load_from_data(img_bytes, width, height, channels):
-            return ui_img
-        return None
-    except:
-        return None
+from image_cache import load_image_with_pillow
+from debug_session import get_renderer, new_scene
 
 def main():
     print("=== Visual Clipping Verification ===\n")
     
-    # Initialize renderer
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Clipping Visual Test"):
+    # Shared renderer (see debug_session.py)
+    renderer = get_renderer(800, 700, "Clipping Visual Test")
+    if renderer is None:
         print("Failed to initialize renderer")
-        return
+        return 1
     
     # Create scene
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0.0, 0.0, 800.0)
     camera.set_perspective(1.0472, 800.0/700.0, 0.1, 2000.0)
@@ -58,84 +40,26 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D with clipping at center of screen
-    clip_panel = ui.Frame2D(500.0, 600.0)
-    clip_panel.set_position(150.0, 50.0)
-    clip_panel
-    clip_panel.set_clipping_enabled(True)
+    clip_panel = ui.Frame2D(500.0, 600.0, position=(150.0, 50.0), clipping_enabled=True)
     
-    # Dark background
-    panel_bg = ui.Rectangle(500.0, 600.0)
+    # Dark background with a green border to show the clipping boundary,
+    # drawn as one mesh (fill + border ring)
+    border_width = 4.0
+    panel_bg = ui.BorderedRectangle(500.0, 600.0, border_width,
+                                    fill_color=(0.15, 0.15, 0.2, 1.0),
+                                    border_color=(0.0, 1.0, 0.0, 1.0))
     panel_bg.set_position(0.0, 0.0)
-    panel_bg.set_color(0.15, 0.15, 0.2, 1.0)
     clip_panel.add_child(panel_bg)
     
-    # Green border to show clipping boundary
-    border_width = 4.0
-    
-    # Top border
-    border_top = ui.Rectangle(500.0, border_width)
-    border_top.set_position(0.0, 0.0)
-    border_top.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_top)
-    
-    # Bottom border
-    border_bottom = ui.Rectangle(500.0, border_width)
-    border_bottom.set_position(0.0, 600.0 - border_width)
-    border_bottom.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_bottom)
-    
-    # Left border
-    border_left = ui.Rectangle(border_width, 600.0)
-    border_left.set_position(0.0, 0.0)
-    border_left.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_left)
-    
-    # Right border
-    border_right = ui.Rectangle(border_width, 600.0)
-    border_right.set_position(500.0 - border_width, 0.0)
-    border_right.set_color(0.0, 1.0, 0.0, 1.0)
-    clip_panel.add_child(border_right)
-    
-    # Add large rectangles that extend beyond clipping region
-    # Red rectangle extending top
-    rect_top = ui.Rectangle(200.0, 200.0)
-    rect_top.set_position(150.0, -80.0)  # Extends above clipping region
-    rect_top.set_color(1.0, 0.2, 0.2, 1.0)
-    if gradient_img:
-        rect_top.set_image(gradient_img)
-    clip_panel.add_child(rect_top)
-    
-    # Blue rectangle extending bottom
-    rect_bottom = ui.Rectangle(200.0, 200.0)
-    rect_bottom.set_position(150.0, 480.0)  # Extends below clipping region
-    rect_bottom.set_color(0.2, 0.2, 1.0, 1.0)
-    if gradient_img:
-        rect_bottom.set_image(gradient_img)
-    clip_panel.add_child(rect_bottom)
-    
-    # Yellow rectangle extending left
-    rect_left = ui.Rectangle(200.0, 150.0)
-    rect_left.set_position(-80.0, 225.0)  # Extends left of clipping region
-    rect_left.set_color(1.0, 1.0, 0.2, 1.0)
-    if gradient_img:
-        rect_left.set_image(gradient_img)
-    clip_panel.add_child(rect_left)
-    
-    # Magenta rectangle extending right
-    rect_right = ui.Rectangle(200.0, 150.0)
-    rect_right.set_position(380.0, 225.0)  # Extends right of clipping region
-    rect_right.set_color(1.0, 0.2, 1.0, 1.0)
-    if gradient_img:
-        rect_right.set_image(gradient_img)
-    clip_panel.add_child(rect_right)
-    
-    # Center rectangle (fully inside)
-    rect_center = ui.Rectangle(150.0, 150.0)
-    rect_center.set_position(175.0, 225.0)
-    rect_center.set_color(0.2, 1.0, 0.2, 1.0)
-    if gradient_img:
-        rect_center.set_image(gradient_img)
-    clip_panel.add_child(rect_center)
+    # Large rectangles that extend beyond the clipping region, all sharing the
+    # gradient texture; rows are x, y, width, height, r, g, b, a
+    clip_panel.add_rectangles(np.array([
+        [150.0, -80.0, 200.0, 200.0, 1.0, 0.2, 0.2, 1.0],   # Red, extends above
+        [150.0, 480.0, 200.0, 200.0, 0.2, 0.2, 1.0, 1.0],   # Blue, extends below
+        [-80.0, 225.0, 200.0, 150.0, 1.0, 1.0, 0.2, 1.0],   # Yellow, extends left
+        [380.0, 225.0, 200.0, 150.0, 1.0, 0.2, 1.0, 1.0],   # Magenta, extends right
+        [175.0, 225.0, 150.0, 150.0, 0.2, 1.0, 0.2, 1.0],   # Green, fully inside
+    ], dtype=np.float32), image=gradient_img)
     
     frame3d.add_child(clip_panel)
     
@@ -155,32 +79,35 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     output_file = os.path.join(output_dir, "clipping_visual_test.png")
     
-    if renderer.save_capture(output_file):
+    pixels = renderer.capture_to_numpy()
+    if pixels is not None:
+        # Capture lands in a (height, width, 4) array; swap BGRA to RGBA in place
+        # and annotate that same buffer, so no PNG is ever decoded
+        pixels[..., :3] = pixels[..., 2::-1].copy()
+        # Fast deflate: these are inspection artifacts, size doesn't matter
+        PILImage.fromarray(pixels).save(output_file, optimize=False, compress_level=1)
         print(f"✓ Saved capture to: {output_file}")
         
-        # Load and annotate the image
-        img = PILImage.open(output_file)
-        draw = ImageDraw.Draw(img)
-        
         # Calculate clipping region in screen space (accounting for retina)
-        scale = img.width / 800
+        scale = pixels.shape[1] / 800
         clip_x = int(150 * scale)
         clip_y = int(50 * scale)
         clip_w = int(500 * scale)
         clip_h = int(600 * scale)
         
-        # Draw annotation box (yellow dashed line)
-        for i in range(0, clip_w, 20):
-            draw.line([(clip_x + i, clip_y), (clip_x + i + 10, clip_y)], fill=(255, 255, 0), width=3)
-            draw.line([(clip_x + i, clip_y + clip_h), (clip_x + i + 10, clip_y + clip_h)], fill=(255, 255, 0), width=3)
-        
-        for i in range(0, clip_h, 20):
-            draw.line([(clip_x, clip_y + i), (clip_x, clip_y + i + 10)], fill=(255, 255, 0), width=3)
-            draw.line([(clip_x + clip_w, clip_y + i), (clip_x + clip_w, clip_y + i + 10)], fill=(255, 255, 0), width=3)
+        # Draw annotation box (yellow dashed line, 3px wide): each edge is one
+        # masked store, 10px dashes every 20px
+        yellow = (255, 255, 0, 255)
+        dash_h = (np.arange(clip_w + 1) % 20) <= 10
+        dash_v = (np.arange(clip_h + 1) % 20) <= 10
+        for y in (clip_y, clip_y + clip_h):
+            pixels[y - 1:y + 2, clip_x:clip_x + clip_w + 1][:, dash_h] = yellow
+        for x in (clip_x, clip_x + clip_w):
+            pixels[clip_y:clip_y + clip_h + 1, x - 1:x + 2][dash_v] = yellow
         
         # Save annotated version
         annotated_file = os.path.join(output_dir, "clipping_visual_test_annotated.png")
-        img.save(annotated_file)
+        PILImage.fromarray(pixels).save(annotated_file, optimize=False, compress_level=1)
         print(f"✓ Saved annotated version to: {annotated_file}")
         
         print("\nExpected result:")
@@ -189,8 +116,8 @@ def main():
         print("  - NO colored content should appear outside the green borders")
         print("  - Background outside clipping region should be dark gray")
     
-    renderer.shutdown()
     print("\n✓ Test complete")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -6,17 +6,17 @@ sys.path.insert(0, 'build')
 
 import cyber_ui_core as ui
 import os
-from PIL import Image
-import numpy as np
+from pixel_masks import bgra_words, rgb_range_mask
+from debug_session import get_renderer, new_scene
 
 def main():
     print("=== Verify Frame2D Fix ===\n")
     
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Verify Fix"):
-        return
+    renderer = get_renderer(800, 700, "Verify Fix")
+    if renderer is None:
+        return 1
     
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0.0, 0.0, 800.0)
     camera.set_perspective(1.0472, 800.0/700.0, 0.1, 2000.0)
@@ -27,10 +27,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Simple test: Frame2D at (0, 0) with a single rectangle
-    clip_panel = ui.Frame2D(200.0, 200.0)
-    clip_panel.set_position(0.0, 0.0)  # Center of window
-    clip_panel  # Small size
-    clip_panel.set_clipping_enabled(False)
+    clip_panel = ui.Frame2D(200.0, 200.0, position=(0.0, 0.0), clipping_enabled=False)  # Center of window
     
     # Red rectangle filling the Frame2D
     panel_bg = ui.Rectangle(200.0, 200.0)
@@ -50,30 +47,37 @@ def main():
         renderer.render_scene(scene)
         renderer.end_frame()
         
-        output_dir = "tests/output"
-        os.makedirs(output_dir, exist_ok=True)
-        capture_file = os.path.join(output_dir, "verify_fix.png")
-        if renderer.save_capture(capture_file):
-            print(f"✓ Saved: {capture_file}\n")
-            
-            # Analyze the image
-            img = Image.open(capture_file)
-            pixels = np.array(img)
+        # Capture straight into an array (BGRA); the PNG is only written on request
+        pixels = renderer.capture_to_numpy()
+        
+        if os.environ.get("CYBER_UI_SAVE_CAPTURES"):
+            output_dir = "tests/output"
+            os.makedirs(output_dir, exist_ok=True)
+            capture_file = os.path.join(output_dir, "verify_fix.png")
+            if renderer.save_capture(capture_file):
+                print(f"✓ Saved: {capture_file}\n")
+        
+        if pixels is not None:
+            # Find red pixels (one pass over the BGRA words, see pixel_masks.py)
+            height, width = pixels.shape[:2]
+            red_mask = rgb_range_mask(bgra_words(pixels, width, height),
+                                      min_rgb=(201, 0, 0), max_rgb=(255, 49, 49))
             
-            # Find red pixels
-            red_mask = (pixels[:,:,0] > 200) & (pixels[:,:,1] < 50) & (pixels[:,:,2] < 50)
-            red_coords = np.where(red_mask)
+            # Bounding box from the rows/columns that contain red, found from
+            # both ends with argmax instead of materializing every coordinate
+            rows = red_mask.any(axis=1)
+            cols = red_mask.any(axis=0)
             
-            if len(red_coords[0]) > 0:
-                red_top = red_coords[0].min()
-                red_bottom = red_coords[0].max()
-                red_left = red_coords[1].min()
-                red_right = red_coords[1].max()
+            if rows.any():
+                red_top = int(rows.argmax())
+                red_bottom = len(rows) - 1 - int(rows[::-1].argmax())
+                red_left = int(cols.argmax())
+                red_right = len(cols) - 1 - int(cols[::-1].argmax())
                 red_center_x = (red_left + red_right) / 2
                 red_center_y = (red_top + red_bottom) / 2
                 
-                window_center_x = img.size[0] / 2
-                window_center_y = img.size[1] / 2
+                window_center_x = pixels.shape[1] / 2
+                window_center_y = pixels.shape[0] / 2
                 
                 print(f"Red rectangle:")
                 print(f"  Bounds: ({red_left}, {red_top}) to ({red_right}, {red_bottom})")
@@ -100,7 +104,7 @@ def main():
             else:
                 print("❌ No red pixels found - rectangle not rendering")
     
-    renderer.shutdown()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -21,22 +21,24 @@ import sys
 sys.path.insert(0, '../../build')
 
 import cyber_ui_core as ui
+import numpy as np
 import os
+from debug_session import get_renderer, new_scene
 
 def main():
     print("=== Frame2D Position Verification ===\n")
     
-    # Initialize renderer
-    renderer = ui.create_metal_renderer()
-    if not renderer.initialize(800, 700, "Frame2D Position Test"):
+    # Shared renderer (see debug_session.py)
+    renderer = get_renderer(800, 700, "Frame2D Position Test")
+    if renderer is None:
         print("Failed to initialize renderer")
-        return
+        return 1
     
     print("Window: 800x700")
     print("Window center: (400, 350)\n")
     
     # Create scene
-    scene = ui.SceneRoot()
+    scene = new_scene()
     camera = scene.get_camera()
     camera.set_position(0.0, 0.0, 800.0)
     camera.set_perspective(1.0472, 800.0/700.0, 0.1, 2000.0)
@@ -48,10 +50,7 @@ def main():
     scene.add_frame3d(frame3d)
     
     # Create Frame2D with specific positioning
-    frame2d = ui.Frame2D(500.0, 600.0)
-    frame2d.set_position(150.0, 50.0)  # Top-left at (150, 50)
-    frame2d
-    frame2d.set_clipping_enabled(True)
+    frame2d = ui.Frame2D(500.0, 600.0, position=(150.0, 50.0), clipping_enabled=True)  # Top-left at (150, 50)
     
     print("Frame2D:")
     print("  Position: (150, 50) - top-left corner")
@@ -59,52 +58,22 @@ def main():
     print("  Expected center: (150 + 250, 50 + 300) = (400, 350)")
     print("  Expected bottom-right: (150 + 500, 50 + 600) = (650, 650)\n")
     
-    # Dark background
-    bg = ui.Rectangle(500.0, 600.0)
+    # Dark background with a green border to show Frame2D bounds,
+    # drawn as one mesh (fill + border ring)
+    border_width = 4.0
+    bg = ui.BorderedRectangle(500.0, 600.0, border_width,
+                              fill_color=(0.1, 0.1, 0.15, 1.0),
+                              border_color=(0.0, 1.0, 0.0, 1.0))
     bg.set_position(0.0, 0.0)
-    bg.set_color(0.1, 0.1, 0.15, 1.0)
     frame2d.add_child(bg)
     
-    # Green border to show Frame2D bounds
-    border_width = 4.0
-    
-    border_top = ui.Rectangle(500.0, border_width)
-    border_top.set_position(0.0, 0.0)
-    border_top.set_color(0.0, 1.0, 0.0, 1.0)
-    frame2d.add_child(border_top)
-    
-    border_bottom = ui.Rectangle(500.0, border_width)
-    border_bottom.set_position(0.0, 600.0 - border_width)
-    border_bottom.set_color(0.0, 1.0, 0.0, 1.0)
-    frame2d.add_child(border_bottom)
-    
-    border_left = ui.Rectangle(border_width, 600.0)
-    border_left.set_position(0.0, 0.0)
-    border_left.set_color(0.0, 1.0, 0.0, 1.0)
-    frame2d.add_child(border_left)
-    
-    border_right = ui.Rectangle(border_width, 600.0)
-    border_right.set_position(500.0 - border_width, 0.0)
-    border_right.set_color(0.0, 1.0, 0.0, 1.0)
-    frame2d.add_child(border_right)
-    
-    # Red marker at Frame2D's top-left (0, 0)
-    marker_tl = ui.Rectangle(20.0, 20.0)
-    marker_tl.set_position(0.0, 0.0)
-    marker_tl.set_color(1.0, 0.0, 0.0, 1.0)
-    frame2d.add_child(marker_tl)
-    
-    # Blue marker at Frame2D's center (250, 300)
-    marker_center = ui.Rectangle(20.0, 20.0)
-    marker_center.set_position(240.0, 290.0)  # Centered around (250, 300)
-    marker_center.set_color(0.0, 0.5, 1.0, 1.0)
-    frame2d.add_child(marker_center)
-    
-    # Yellow marker at Frame2D's bottom-right (500, 600)
-    marker_br = ui.Rectangle(20.0, 20.0)
-    marker_br.set_position(480.0, 580.0)
-    marker_br.set_color(1.0, 1.0, 0.0, 1.0)
-    frame2d.add_child(marker_br)
+    # Corner and center markers, built in one call.
+    # Columns: x, y, width, height, r, g, b, a
+    frame2d.add_rectangles(np.array([
+        [0.0, 0.0, 20.0, 20.0, 1.0, 0.0, 0.0, 1.0],      # Red at top-left (0, 0)
+        [240.0, 290.0, 20.0, 20.0, 0.0, 0.5, 1.0, 1.0],  # Blue centered around (250, 300)
+        [480.0, 580.0, 20.0, 20.0, 1.0, 1.0, 0.0, 1.0],  # Yellow at bottom-right (500, 600)
+    ], dtype=np.float32))
     
     frame3d.add_child(frame2d)
     
@@ -119,12 +88,18 @@ def main():
     print("  ✓ Yellow marker should be at bottom-right of green border")
     print("\nPress ESC or close window to exit\n")
     
+    # The capture only needs frame 5; keep the window open only when asked to,
+    # so the script can run alongside others on the shared renderer
+    interactive = bool(os.environ.get("CYBER_UI_INTERACTIVE"))
+    
     # Render loop
     frame_count = 0
     output_dir = os.path.join(os.path.dirname(__file__), "output")
     os.makedirs(output_dir, exist_ok=True)
     
     while not renderer.should_close():
+        if frame_count >= 5 and not interactive:
+            break
         renderer.poll_events()
         
         if renderer.begin_frame():
@@ -139,8 +114,8 @@ def main():
                     print(f"✓ Captured: {output_file}")
                     print("  Check if green border is centered in the image!")
     
-    renderer.shutdown()
     print("\nTest complete")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
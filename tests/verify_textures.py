@@ -8,31 +8,8 @@ import sys
 sys.path.insert(0, '../../build')
 
 import cyber_ui_core as ui
-from PIL import Image as PILImage
 import os
-
-def load_image_with_pillow(filepath):
-    """Load an image using Pillow and return a cyber_ui Image object"""
-    if not os.path.exists(filepath):
-        print(f"Error: Image file not found: {filepath}")
-        return None
-    
-    try:
-        pil_img = PILImage.open(filepath)
-        if pil_img.mode != 'RGBA':
-            pil_img = pil_img.convert('RGBA')
-        
-        img_bytes = pil_img.tobytes()
-        ui_img = ui.Image()
-        width, height = pil_img.size
-        
-        if ui_img.load_from_data(img_bytes, width, height, 4):
-            return ui_img
-        return None
-            
-    except Exception as e:
-        print(f"Error loading image {filepath}: {e}")
-        return None
+from image_cache import load_image_with_pillow
 
 def main():
     print("=== Texture Rendering Verification ===\n")
@@ -136,8 +113,7 @@ def main():
         renderer.poll_events()
         
         if renderer.begin_frame():
-            for rect in rectangles:
-                renderer.render_object(rect)
+            renderer.render_object_batch(rectangles)
             renderer.end_frame()
             frame_count += 1
     